@@ -16,7 +16,9 @@ COMPLEX_SEARCH_CAPABILITY = "complex_search"
 CHECKSUM_DEPLOY = "checksum_deploy"  # Only when v2
 REVISIONS = "revisions"  # Only when enabled in config, not by default look at server_launcher.py
 ONLY_V2 = "only_v2"  # Remotes and virtuals from Artifactory returns this capability
-SERVER_CAPABILITIES = [COMPLEX_SEARCH_CAPABILITY, REVISIONS]  # Server is always with revisions
+PACKAGES_INFO = "packages_info"  # Only when v2, info of many packages with a single request
+SERVER_CAPABILITIES = [COMPLEX_SEARCH_CAPABILITY, REVISIONS,
+                       PACKAGES_INFO]  # Server is always with revisions
 DEFAULT_REVISION_V1 = "0"
 
 __version__ = '1.17.0-dev'
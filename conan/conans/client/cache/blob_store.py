@@ -0,0 +1,89 @@
+import os
+import stat
+
+from conans.model.manifest import FileTreeManifest
+from conans.util.files import md5sum, mkdir, walk
+from conans.util.log import logger
+
+_replace = getattr(os, "replace", os.rename)
+
+
+def hardlinks_supported():
+    return hasattr(os, "link")
+
+
+class BlobStore(object):
+    """ Content addressable storage of the files of the packages in the cache. The files of the
+    package folders are hardlinks to blobs named by their md5 in the package manifest, so a
+    file contained in several packages takes the disk space once. The content, permissions and
+    timestamps of the blobs are shared by all the packages linking them, they cannot be modified
+    """
+
+    def __init__(self, folder):
+        self._folder = folder
+
+    def _blob_path(self, md5, mode):
+        name = md5 + "x" if mode & stat.S_IXUSR else md5
+        return os.path.join(self._folder, md5[:2], name)
+
+    def link_source(self, package_folder):
+        """ Returns the function that, for a member of a package tgz, returns the blob with its
+        contents if it is already in the store, so it can be linked instead of extracted. The
+        manifest of the package_folder is loaded with the first member, it is downloaded before
+        """
+        manifests = []
+
+        def _link_source(member):
+            if not manifests:
+                manifests.append(FileTreeManifest.load(package_folder))
+            md5 = manifests[0].file_sums.get(member.name)
+            if md5:
+                blob = self._blob_path(md5, member.mode)
+                if os.path.isfile(blob):
+                    return blob
+        return _link_source
+
+    def link_package(self, package_folder):
+        """ Replaces the files of the package folder with links to the blobs with the same
+        contents, and adds the ones not stored yet. Files are kept as they are if they cannot
+        be linked, i.e. in a different filesystem, or with a content not matching the manifest
+        """
+        manifest = FileTreeManifest.load(package_folder)
+        for name, md5 in manifest.file_sums.items():
+            path = os.path.join(package_folder, name)
+            try:
+                if os.path.islink(path):
+                    continue
+                file_stat = os.stat(path)
+                blob = self._blob_path(md5, file_stat.st_mode)
+                try:
+                    blob_stat = os.stat(blob)
+                except OSError:
+                    if md5sum(path) == md5:
+                        mkdir(os.path.dirname(blob))
+                        os.link(path, blob)
+                    continue
+                if (os.path.samestat(file_stat, blob_stat) or
+                        blob_stat.st_size != file_stat.st_size):
+                    continue
+                tmp = path + ".conan_link"
+                os.link(blob, tmp)
+                try:
+                    _replace(tmp, path)
+                except OSError:
+                    os.remove(tmp)
+                    raise
+            except (IOError, OSError) as e:
+                logger.debug("BLOBS: Cannot link %s: %s" % (path, str(e)))
+
+    def clean(self):
+        """ Removes the blobs that are not linked by any package
+        """
+        for root, _, files in walk(self._folder):
+            for f in files:
+                path = os.path.join(root, f)
+                try:
+                    if os.stat(path).st_nlink == 1:
+                        os.remove(path)
+                except OSError:
+                    pass
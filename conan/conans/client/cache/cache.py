@@ -1,11 +1,17 @@
 import os
 import platform
+import re
 import shutil
+import sqlite3
+import threading
 from collections import OrderedDict
 from os.path import join
 
+from conans.client.cache.blob_store import BlobStore, hardlinks_supported
+from conans.client.cache.cache_index import CacheIndex
 from conans.client.cache.editable import EditablePackages
 from conans.client.cache.remote_registry import RemoteRegistry
+from conans.client.cache.remote_search_cache import RemoteSearchCache
 from conans.client.conf import ConanClientConfigParser, default_client_conf, default_settings_yml
 from conans.client.conf.detect import detect_defaults_settings
 from conans.client.output import Color
@@ -18,17 +24,52 @@ from conans.paths import PUT_HEADERS
 from conans.paths.package_layouts.package_cache_layout import PackageCacheLayout
 from conans.paths.package_layouts.package_editable_layout import PackageEditableLayout
 from conans.unicode import get_cwd
-from conans.util.files import list_folder_subdirs, load, normalize, save
-from conans.util.locks import Lock
+from conans.util.files import list_folder_subdirs, load, mkdir, normalize, save
+from conans.util.fork import fork_lock
+from conans.util.locks import Lock, os_locks_supported
+from conans.util.log import logger
 
 
 CONAN_CONF = 'conan.conf'
 CONAN_SETTINGS = "settings.yml"
 LOCALDB = ".conan.db"
+CACHE_INDEX = ".conan_index.db"
+BLOBS_FOLDER = ".conan_blobs"
 REMOTES = "remotes.json"
 PROFILES_FOLDER = "profiles"
 HOOKS_FOLDER = "hooks"
 
+_cache_index_lock = fork_lock(threading.Lock())
+
+
+def _store_refs(store_folder, prefix=None, ignorecase=True):
+    """ The references of the storage starting with the given prefix if any. Only the folders
+    that can match the prefix are listed, i.e. a single name folder for 'zlib/1.2'
+    """
+    tokens = re.split("[/@]", prefix)[:4] if prefix else []
+    paths = [""]
+    for level in range(4):
+        token = tokens[level] if level < len(tokens) else None
+        if token is not None and ignorecase:
+            token = token.lower()
+        partial = level == len(tokens) - 1  # The last token can be the start of a folder name
+        found = []
+        for path in paths:
+            folder = join(store_folder, path)
+            try:
+                names = os.listdir(folder)
+            except OSError:
+                continue
+            for name in names:
+                if token is not None:
+                    name_token = name.lower() if ignorecase else name
+                    if not (name_token.startswith(token) if partial else name_token == token):
+                        continue
+                if os.path.isdir(join(folder, name)):
+                    found.append(path + "/" + name if path else name)
+        paths = found
+    return [ConanFileReference(*path.split("/")) for path in paths]
+
 
 def is_case_insensitive_os():
     system = platform.system()
@@ -68,19 +109,80 @@ class ClientCache(object):
 
         # Caching
         self._no_lock = None
+        self._os_locks = None
+        self._lower_stores = None
         self._config = None
+        self._cache_index = None
         self.editable_packages = EditablePackages(self.cache_folder)
         # paths
         self._store_folder = self.config.storage_path or self.cache_folder
 
     def all_refs(self):
+        if self.cache_index:
+            return self.cache_index.refs()
         subdirs = list_folder_subdirs(basedir=self._store_folder, level=4)
         return [ConanFileReference(*folder.split("/")) for folder in subdirs]
 
+    def lower_refs(self, prefix=None, ignorecase=True):
+        """ The references of the lower storages starting with the given prefix if any. The index
+        of a lower storage is used if it has one
+        """
+        result = []
+        for store in self.lower_stores:
+            dbfile = join(store, CACHE_INDEX)
+            if os.path.isfile(dbfile):
+                try:
+                    result.extend(CacheIndex(dbfile).refs(prefix, ignorecase))
+                    continue
+                except sqlite3.Error as e:
+                    logger.debug("CACHE: Cannot read the index of %s: %s" % (store, str(e)))
+            result.extend(_store_refs(store, prefix, ignorecase))
+        return result
+
+    @property
+    def cache_index(self):
+        """ The CacheIndex of the references in the storage, or None if it is not enabled. It is
+        built the first time it is used, and removed while it is disabled, as it is not updated
+        """
+        if self._cache_index is None:
+            with _cache_index_lock:
+                if self._cache_index is None:
+                    self._cache_index = self._load_cache_index()
+        return self._cache_index or None
+
+    def _load_cache_index(self):
+        dbfile = join(self._store_folder, CACHE_INDEX)
+        if not self.config.cache_index:
+            try:
+                os.remove(dbfile)
+            except OSError:
+                pass
+            return False
+        mkdir(self._store_folder)
+        cache_index, exists = CacheIndex.create(dbfile)
+        if not exists:
+            cache_index.rebuild(self._store_folder)
+        return cache_index
+
+    @property
+    def blob_store(self):
+        """ The BlobStore deduplicating the files of the packages, or None if it is not enabled
+        """
+        if self.config.cache_dedup and hardlinks_supported():
+            return BlobStore(join(self._store_folder, BLOBS_FOLDER))
+
     @property
     def store(self):
         return self._store_folder
 
+    @property
+    def lower_stores(self):
+        """ The read-only storage folders where the references not in this one are looked up
+        """
+        if self._lower_stores is None:
+            self._lower_stores = self.config.storage_lower_paths
+        return self._lower_stores
+
     def package(self, pref, short_paths=False):
         # TODO: This is deprecated, only used in testing
         return self.package_layout(pref.ref, short_paths).package(pref)
@@ -102,8 +204,14 @@ class ClientCache(object):
         else:
             check_ref_case(ref, self.store)
             base_folder = os.path.normpath(os.path.join(self.store, ref.dir_repr()))
+            lower_folders = [os.path.normpath(os.path.join(store, ref.dir_repr()))
+                             for store in self.lower_stores]
+            os_locks = self._use_os_locks()
+            lock_timeout = self.config.cache_lock_timeout if os_locks else None
             return PackageCacheLayout(base_folder=base_folder, ref=ref,
-                                      short_paths=short_paths, no_lock=self._no_locks())
+                                      short_paths=short_paths, no_lock=self._no_locks(),
+                                      cache_index=self.cache_index, os_locks=os_locks,
+                                      lower_folders=lower_folders, lock_timeout=lock_timeout)
 
     @property
     def registry_path(self):
@@ -113,11 +221,20 @@ class ClientCache(object):
     def registry(self):
         return RemoteRegistry(self, self._output)
 
+    @property
+    def remote_search_cache(self):
+        return RemoteSearchCache(self.cache_folder, self.config.remote_search_ttl)
+
     def _no_locks(self):
         if self._no_lock is None:
             self._no_lock = self.config.cache_no_locks
         return self._no_lock
 
+    def _use_os_locks(self):
+        if self._os_locks is None:
+            self._os_locks = self.config.cache_os_locks and os_locks_supported()
+        return self._os_locks
+
     @property
     def put_headers_path(self):
         return join(self.cache_folder, PUT_HEADERS)
@@ -255,6 +372,9 @@ class ClientCache(object):
     def invalidate(self):
         self._config = None
         self._no_lock = None
+        self._os_locks = None
+        self._lower_stores = None
+        self._cache_index = None
 
 
 def _mix_settings_with_env(settings):
@@ -0,0 +1,160 @@
+import os
+import sqlite3
+from contextlib import contextmanager
+
+from conans import DEFAULT_REVISION_V1
+from conans.errors import ConanException
+from conans.model.package_metadata import PackageMetadata
+from conans.model.ref import ConanFileReference
+from conans.paths import PACKAGE_METADATA
+from conans.util.files import list_folder_subdirs, load
+
+REFERENCES_TABLE = "refs"
+PACKAGES_TABLE = "packages"
+
+
+def _metadata_rows(metadata):
+    """ The revision and remote of the recipe, and the [(package_id, revision, recipe_revision,
+    remote)] of its packages, as they are loaded from the metadata file
+    """
+    packages = []
+    for package_id, package in sorted(metadata.packages.items()):
+        revision = package.revision if package.revision is not None else DEFAULT_REVISION_V1
+        recipe_revision = package.recipe_revision
+        if recipe_revision is None:
+            recipe_revision = DEFAULT_REVISION_V1
+        packages.append((package_id, revision, recipe_revision, package.remote))
+    return (metadata.recipe.revision, metadata.recipe.remote), packages
+
+
+def _like_escape(text):
+    return text.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+class CacheIndex(object):
+    """ Index of the references in the local cache, with the revisions, package ids and remotes
+    of their metadata. It is updated every time a metadata file is saved and when a reference is
+    removed, so the references can be listed and matched without walking the storage folder.
+    The metadata files are the source of truth, the index can be always rebuilt from them
+    """
+
+    def __init__(self, dbfile):
+        self.dbfile = dbfile
+
+    @staticmethod
+    def create(dbfile):
+        exists = os.path.exists(dbfile)
+        index = CacheIndex(dbfile)
+        try:
+            with index._connect() as connection:
+                connection.execute("create table if not exists %s (path TEXT PRIMARY KEY, "
+                                   "reference TEXT, revision TEXT, remote TEXT)"
+                                   % REFERENCES_TABLE)
+                connection.execute("create table if not exists %s (path TEXT, package_id TEXT, "
+                                   "revision TEXT, recipe_revision TEXT, remote TEXT, "
+                                   "PRIMARY KEY (path, package_id))" % PACKAGES_TABLE)
+        except Exception as e:
+            raise ConanException("Could not initialize the cache index: %s" % str(e))
+        return index, exists
+
+    @contextmanager
+    def _connect(self):
+        """ Commits if there is no error. The index can be always rebuilt, it is not necessary to
+        wait for the data to be written to disk
+        """
+        connection = sqlite3.connect(self.dbfile, timeout=60)
+        connection.text_factory = str
+        try:
+            connection.execute("PRAGMA synchronous = OFF")
+            with connection:
+                yield connection
+        finally:
+            connection.close()
+
+    @staticmethod
+    def _insert(connection, path, reference, recipe_row, packages_rows):
+        connection.execute("INSERT OR REPLACE INTO %s (path, reference, revision, remote) "
+                           "VALUES (?, ?, ?, ?)" % REFERENCES_TABLE,
+                           (path, reference) + recipe_row)
+        connection.execute("DELETE FROM %s WHERE path=?" % PACKAGES_TABLE, (path, ))
+        connection.executemany("INSERT INTO %s (path, package_id, revision, recipe_revision, "
+                               "remote) VALUES (?, ?, ?, ?, ?)" % PACKAGES_TABLE,
+                               [(path, ) + row for row in packages_rows])
+
+    def update(self, ref, metadata):
+        recipe_row, packages_rows = _metadata_rows(metadata)
+        with self._connect() as connection:
+            self._insert(connection, ref.dir_repr(), str(ref), recipe_row, packages_rows)
+
+    def remove(self, ref):
+        with self._connect() as connection:
+            connection.execute("DELETE FROM %s WHERE path=?" % REFERENCES_TABLE,
+                               (ref.dir_repr(), ))
+            connection.execute("DELETE FROM %s WHERE path=?" % PACKAGES_TABLE,
+                               (ref.dir_repr(), ))
+
+    def refs(self, prefix=None, ignorecase=True):
+        """ The references of the cache, only the ones starting with the given prefix if any
+        """
+        query = "SELECT path FROM %s" % REFERENCES_TABLE
+        params = ()
+        if prefix:
+            if ignorecase:  # LIKE is case insensitive
+                query += " WHERE reference LIKE ? ESCAPE '\\'"
+                params = (_like_escape(prefix) + "%", )
+            else:
+                query += " WHERE substr(reference, 1, ?)=?"
+                params = (len(prefix), prefix)
+        with self._connect() as connection:
+            rows = connection.execute(query, params).fetchall()
+        return [ConanFileReference(*path.split("/")) for path, in rows]
+
+    @staticmethod
+    def _read_store(store_folder):
+        """ {path: (reference, recipe_row, packages_rows)} of the references in the storage
+        """
+        result = {}
+        for path in list_folder_subdirs(basedir=store_folder, level=4):
+            ref = ConanFileReference(*path.split("/"))
+            try:
+                text = load(os.path.join(store_folder, path, PACKAGE_METADATA))
+            except IOError:  # Not exported yet or interrupted
+                recipe_row, packages_rows = (None, None), []
+            else:
+                recipe_row, packages_rows = _metadata_rows(PackageMetadata.loads(text))
+            result[path] = str(ref), recipe_row, packages_rows
+        return result
+
+    def rebuild(self, store_folder):
+        store = self._read_store(store_folder)
+        with self._connect() as connection:
+            connection.execute("DELETE FROM %s" % REFERENCES_TABLE)
+            connection.execute("DELETE FROM %s" % PACKAGES_TABLE)
+            for path, (reference, recipe_row, packages_rows) in store.items():
+                self._insert(connection, path, reference, recipe_row, packages_rows)
+
+    def check(self, store_folder):
+        """ Returns the list of differences between the index and the storage folder
+        """
+        store = self._read_store(store_folder)
+        with self._connect() as connection:
+            refs = connection.execute("SELECT path, reference, revision, remote FROM %s"
+                                      % REFERENCES_TABLE).fetchall()
+            packages = connection.execute("SELECT path, package_id, revision, recipe_revision, "
+                                          "remote FROM %s ORDER BY package_id"
+                                          % PACKAGES_TABLE).fetchall()
+        index = {path: (reference, (revision, remote), [])
+                 for path, reference, revision, remote in refs}
+        for row in packages:
+            if row[0] in index:
+                index[row[0]][2].append(row[1:])
+
+        errors = []
+        for path in sorted(set(store) | set(index)):
+            if path not in index:
+                errors.append("%s: Not in the index" % store[path][0])
+            elif path not in store:
+                errors.append("%s: Not in the cache" % index[path][0])
+            elif store[path] != index[path]:
+                errors.append("%s: Outdated metadata in the index" % store[path][0])
+        return errors
@@ -253,6 +253,11 @@ class RemoteRegistry(object):
         self._output = output
         self._filename = cache.registry_path
 
+    def _save(self, remotes):
+        remotes.save(self._filename)
+        # The stored remote search results might not be valid for the new remotes definition
+        self._cache.remote_search_cache.invalidate()
+
     def load_remotes(self):
         if not os.path.exists(self._filename):
             self._output.warn("Remotes registry file missing, "
@@ -267,7 +272,7 @@ class RemoteRegistry(object):
     def add(self, remote_name, url, verify_ssl=True, insert=None, force=None):
         remotes = self.load_remotes()
         renamed = remotes.add(remote_name, url, verify_ssl, insert, force)
-        remotes.save(self._filename)
+        self._save(remotes)
         if renamed:
             for ref in self._cache.all_refs():
                 with self._cache.package_layout(ref).update_metadata() as metadata:
@@ -280,7 +285,7 @@ class RemoteRegistry(object):
     def update(self, remote_name, url, verify_ssl=True, insert=None):
         remotes = self.load_remotes()
         remotes.update(remote_name, url, verify_ssl, insert)
-        remotes.save(self._filename)
+        self._save(remotes)
 
     def clear(self):
         remotes = self.load_remotes()
@@ -290,7 +295,7 @@ class RemoteRegistry(object):
                 metadata.recipe.remote = None
                 for pkg_metadata in metadata.packages.values():
                     pkg_metadata.remote = None
-        remotes.save(self._filename)
+        self._save(remotes)
 
     def remove(self, remote_name):
         remotes = self.load_remotes()
@@ -304,7 +309,7 @@ class RemoteRegistry(object):
                     if pkg_metadata.remote == remote_name:
                         pkg_metadata.remote = None
 
-        remotes.save(self._filename)
+        self._save(remotes)
 
     def define(self, remotes):
         # For definition from conan config install
@@ -316,7 +321,7 @@ class RemoteRegistry(object):
                     if pkg_metadata.remote not in remotes:
                         pkg_metadata.remote = None
 
-        remotes.save(self._filename)
+        self._save(remotes)
 
     def rename(self, remote_name, new_remote_name):
         remotes = self.load_remotes()
@@ -330,7 +335,7 @@ class RemoteRegistry(object):
                     if pkg_metadata.remote == remote_name:
                         pkg_metadata.remote = new_remote_name
 
-        remotes.save(self._filename)
+        self._save(remotes)
 
     @property
     def refs_list(self):
@@ -0,0 +1,82 @@
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from os.path import join, normpath
+
+import fasteners
+
+from conans.model.ref import ConanFileReference
+from conans.util.files import load, save
+from conans.util.fork import fork_lock
+from conans.util.log import logger
+
+
+REMOTE_SEARCH_CACHE_FILE = "remote_search_cache.json"
+
+_replace = getattr(os, "replace", os.rename)
+# The InterProcessLock doesn't lock between threads of the same process
+_search_cache_thread_lock = fork_lock(threading.Lock())
+
+
+class RemoteSearchCache(object):
+    """ Persists the results of the recipe searches done in the remotes to resolve version ranges,
+    so consecutive commands do not repeat them while they are younger than the configured TTL.
+    The results are stored by remote url and search pattern:
+
+        {remote_url: {pattern: {"time": timestamp, "refs": [ref, ...]}}}
+    """
+
+    def __init__(self, cache_folder, ttl):
+        self._filename = normpath(join(cache_folder, REMOTE_SEARCH_CACHE_FILE))
+        self._ttl = ttl
+
+    @property
+    def enabled(self):
+        return bool(self._ttl)
+
+    def _load(self):
+        if not os.path.exists(self._filename):
+            return {}
+        try:
+            return json.loads(load(self._filename))
+        except Exception as e:  # A corrupted cache is equivalent to an empty one
+            logger.error("Invalid remote search cache '%s': %s" % (self._filename, str(e)))
+            return {}
+
+    def get(self, remote, pattern):
+        """ returns the list of ConanFileReference found for the pattern in the remote or None if
+        there isn't a valid stored result
+        """
+        if not self.enabled:
+            return None
+        entry = self._load().get(remote.url, {}).get(pattern)
+        if entry is None or time.time() - entry["time"] > self._ttl:
+            return None
+        return [ConanFileReference.loads(r) for r in entry["refs"]]
+
+    def set(self, remote, pattern, refs):
+        if not self.enabled:
+            return
+        entry = {"time": time.time(), "refs": [r.full_repr() for r in refs or []]}
+        with self._lock():
+            contents = self._load()
+            contents.setdefault(remote.url, {})[pattern] = entry
+            # Written to a temporary file and renamed, it is never read half written
+            tmp_filename = self._filename + ".tmp"
+            save(tmp_filename, json.dumps(contents))
+            _replace(tmp_filename, self._filename)
+
+    def invalidate(self):
+        with self._lock():
+            if os.path.exists(self._filename):
+                os.remove(self._filename)
+
+    @contextmanager
+    def _lock(self):
+        """ Locks the updates of the file, done by other threads or processes
+        """
+        with _search_cache_thread_lock:
+            with fasteners.InterProcessLock(self._filename + ".lock", logger=logger):
+                yield
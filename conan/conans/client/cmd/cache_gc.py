@@ -0,0 +1,143 @@
+import os
+import re
+import time
+
+from conans.client.remover import DiskRemover
+from conans.client.tools.files import UNIT_SIZE, human_size
+from conans.errors import ConanException
+from conans.model.ref import PackageReference
+from conans.util.files import walk
+
+_SIZE_UNITS = {"": 1, "B": 1, "K": UNIT_SIZE, "M": UNIT_SIZE ** 2, "G": UNIT_SIZE ** 3,
+               "T": UNIT_SIZE ** 4}
+_AGE_UNITS = {"": 1, "s": 1, "m": 60, "h": 3600, "d": 24 * 3600, "w": 7 * 24 * 3600}
+
+PACKAGE, BUILD, SOURCE = "package", "build", "source"
+
+
+def parse_size(text):
+    """ Size in bytes of a text like 500, 300MB or 10G """
+    match = re.match(r"^\s*(\d+(?:\.\d+)?)\s*([BKMGT]?)B?\s*$", text, re.IGNORECASE)
+    if not match:
+        raise ConanException("Invalid size '%s', use a number of bytes or K, M, G, T units, "
+                             "e.g. 10G" % text)
+    return float(match.group(1)) * _SIZE_UNITS[match.group(2).upper()]
+
+
+def parse_age(text):
+    """ Age in seconds of a text like 3600, 12h or 30d """
+    match = re.match(r"^\s*(\d+(?:\.\d+)?)\s*([smhdw]?)\s*$", text)
+    if not match:
+        raise ConanException("Invalid age '%s', use a number of seconds or s, m, h, d, w units, "
+                             "e.g. 30d" % text)
+    return float(match.group(1)) * _AGE_UNITS[match.group(2)]
+
+
+def _folder_size(folder, inodes=None):
+    """ Size in bytes of the files of the folder
+    @param inodes: set of the (device, inode) already counted, to count the files linked to the
+    same blob, or to other packages, only once. It is updated with the ones of the folder
+    """
+    size = 0
+    for root, _, files in walk(folder):
+        for f in files:
+            try:
+                file_stat = os.lstat(os.path.join(root, f))
+            except OSError:
+                continue
+            if inodes is not None and file_stat.st_nlink > 1:
+                inode = (file_stat.st_dev, file_stat.st_ino)
+                if inode in inodes:
+                    continue
+                inodes.add(inode)
+            size += file_stat.st_size
+    return size
+
+
+def _cache_folders(cache):
+    """ [(last_use, ref, kind, id, folder)] of the packages, builds and sources of the cache.
+    The last use of a folder is its modification time, the installer touches the package folders
+    when they are used and the source folders when they are used to build
+    """
+    result = []
+    for ref in cache.all_refs():
+        # Follows the existing short paths, the lower caches are never modified
+        layout = cache.package_layout(ref, short_paths=None).local()
+        folders = [(SOURCE, None, layout.source())]
+        folders.extend((BUILD, build_id, layout.build(PackageReference(ref, build_id)))
+                       for build_id in layout.conan_builds())
+        folders.extend((PACKAGE, package_id, layout.package(PackageReference(ref, package_id)))
+                       for package_id in layout.conan_packages())
+        for kind, id_, folder in folders:
+            try:
+                last_use = os.path.getmtime(folder)
+            except OSError:
+                continue
+            result.append((last_use, ref, kind, id_, folder))
+    return result
+
+
+def cache_gc(cache, output, max_size=None, max_age=None, keep=None):
+    """ Removes the least recently used package, build and source folders of the cache, the ones
+    not used in max_age seconds and the ones exceeding the max_size bytes of all of them
+    @param keep: [(ref, package_id)] of packages that must not be removed, i.e. just installed
+    """
+    keep = set((ref.copy_clear_rev(), package_id) for ref, package_id in keep or [])
+    folders = sorted(_cache_folders(cache), key=lambda item: item[0])
+    # Deduplicated files are linked from several packages, but they use the disk only once, and
+    # are not freed until the most recently used of them is removed, it is the one counting them
+    inodes = set() if cache.blob_store else None
+    # Walking all the files of the cache is only needed to limit its size, otherwise only the
+    # removed folders are measured
+    sizes = {}
+    if max_size is not None:
+        sizes = {item[-1]: _folder_size(item[-1], inodes) for item in reversed(folders)}
+    total = sum(sizes.values())
+    limit = time.time() - max_age if max_age is not None else None
+
+    evicted = []
+    for last_use, ref, kind, id_, folder in folders:
+        if kind == PACKAGE and (ref, id_) in keep:
+            continue
+        if (limit is not None and last_use < limit) or (max_size is not None and total > max_size):
+            size = sizes[folder] if folder in sizes else _folder_size(folder, inodes)
+            evicted.append((ref, kind, id_, size))
+            total -= size
+
+    remover = DiskRemover()
+    freed = 0
+    for ref in sorted(set(item[0] for item in evicted)):
+        # rm_conandir removes the links
+        layout = cache.package_layout(ref, short_paths=False).local()
+        removed_packages = []
+        with layout.conanfile_write_lock(output):
+            for _, kind, id_, size in (item for item in evicted if item[0] == ref):
+                name = "%s %s" % (kind, id_) if id_ else kind
+                try:
+                    if kind == SOURCE:
+                        remover.remove_src(layout)
+                    elif kind == BUILD:
+                        remover.remove_builds(layout, [id_])
+                    else:
+                        with layout.package_lock(PackageReference(ref, id_)):
+                            remover.remove_packages(layout, [id_])
+                        removed_packages.append(id_)
+                except ConanException as e:
+                    output.warn("%s: Cannot remove %s: %s" % (str(ref), name, str(e)))
+                    total += size
+                    continue
+                output.info("%s: Removed %s (%s)" % (str(ref), name, human_size(size)))
+                freed += size
+            if removed_packages:  # Saved once for all the packages of the reference
+                with layout.update_metadata() as metadata:
+                    for package_id in removed_packages:
+                        metadata.clear_package(package_id)
+
+    if evicted:
+        if max_size is not None:
+            output.info("Freed %s of the cache, %s in use" % (human_size(freed),
+                                                              human_size(total)))
+        else:
+            output.info("Freed %s of the cache" % human_size(freed))
+        if cache.blob_store:
+            cache.blob_store.clean()
@@ -18,11 +18,7 @@ def _get_package_ids(cache, ref, package_ids):
     if not package_ids:
         return []
     if package_ids is True:
-        packages = cache.package_layout(ref).packages()
-        if os.path.exists(packages):
-            package_ids = os.listdir(packages)
-        else:
-            package_ids = []
+        package_ids = cache.package_layout(ref).conan_packages()
     return package_ids
 
 
@@ -48,7 +44,7 @@ def package_copy(src_ref, user_channel, package_ids, cache, user_io, short_paths
     # Generate metadata
     src_layout = cache.package_layout(src_ref, short_paths)
     src_metadata = src_layout.load_metadata()
-    dst_layout = cache.package_layout(dest_ref, short_paths)
+    dst_layout = cache.package_layout(dest_ref, short_paths).local()
 
     # Copy export
     export_origin = src_layout.export()
@@ -90,6 +86,9 @@ def package_copy(src_ref, user_channel, package_ids, cache, user_io, short_paths
     # Generate the metadata
     with dst_layout.update_metadata() as metadata:
         metadata.recipe.revision = src_metadata.recipe.revision
+        # The copied archives are reused by the upload, as they were created from the same files
+        metadata.recipe.archives = src_metadata.recipe.archives
         for package_id, (revision, recipe_revision) in package_revisions.items():
             metadata.packages[package_id].revision = revision
             metadata.packages[package_id].recipe_revision = recipe_revision
+            metadata.packages[package_id].archives = src_metadata.packages[package_id].archives
@@ -12,8 +12,6 @@ def download(ref, package_ids, remote, recipe, remote_manager,
     hook_manager.execute("pre_download", reference=ref, remote=remote)
 
     ref = remote_manager.get_recipe(ref, remote)
-    with cache.package_layout(ref).update_metadata() as metadata:
-        metadata.recipe.remote = remote.name
 
     conan_file_path = cache.package_layout(ref).conanfile()
     conanfile = loader.load_class(conan_file_path)
@@ -41,6 +39,7 @@ def _download_binaries(conanfile, ref, package_ids, cache, remote_manager, remot
 
     for package_id in package_ids:
         pref = PackageReference(ref, package_id)
-        package_folder = cache.package_layout(pref.ref, short_paths=short_paths).package(pref)
+        layout = cache.package_layout(pref.ref, short_paths=short_paths)
+        package_folder = layout.local().package(pref)
         output.info("Downloading %s" % str(pref))
         remote_manager.get_package(pref, package_folder, remote, output, recorder)
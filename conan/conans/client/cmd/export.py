@@ -80,7 +80,8 @@ def cmd_export(conanfile_path, name, version, user, channel, keep_source, revisi
     except IOError:
         previous_digest = None
     finally:
-        _recreate_folders(package_layout.export(), package_layout.export_sources())
+        local_layout = package_layout.local()  # Never modify the recipes of the lower caches
+        _recreate_folders(local_layout.export(), local_layout.export_sources())
 
     # Copy sources to target folders
     with package_layout.conanfile_write_lock(output=output):
@@ -98,7 +99,8 @@ def cmd_export(conanfile_path, name, version, user, channel, keep_source, revisi
                              conanfile_path=package_layout.conanfile())
 
         # Compute the new digest
-        digest = FileTreeManifest.create(package_layout.export(), package_layout.export_sources())
+        digest = FileTreeManifest.create(package_layout.export(), package_layout.export_sources(),
+                                         stat_cache=package_layout.manifest_stat_cache())
         modified_recipe = not previous_digest or previous_digest != digest
         if modified_recipe:
             output.success('A new %s version was exported' % CONANFILE)
@@ -143,7 +145,7 @@ def cmd_export(conanfile_path, name, version, user, channel, keep_source, revisi
         if to_remove:
             output.info("Removing the local binary packages from different recipe revisions")
             remover = DiskRemover()
-            remover.remove_packages(package_layout, ids_filter=to_remove)
+            remover.remove_packages(package_layout.local(), ids_filter=to_remove)
 
     ref = ref.copy_with_rev(revision)
     return ref
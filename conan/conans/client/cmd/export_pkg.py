@@ -4,6 +4,7 @@ from conans.client import packager
 from conans.client.graph.graph_manager import load_deps_info
 from conans.errors import ConanException
 from conans.model.conan_file import get_env_context_manager
+from conans.model.info import ConanInfo
 from conans.model.manifest import FileTreeManifest
 from conans.model.ref import PackageReference
 from conans.util.files import rmdir
@@ -34,7 +35,7 @@ def export_pkg(cache, graph_manager, hook_manager, recorder, output,
     output.info("Packaging to %s" % package_id)
     pref = PackageReference(ref, package_id)
     layout = cache.package_layout(ref, short_paths=conanfile.short_paths)
-    dest_package_folder = layout.package(pref)
+    dest_package_folder = layout.local().package(pref)
 
     if os.path.exists(dest_package_folder):
         if force:
@@ -58,8 +59,12 @@ def export_pkg(cache, graph_manager, hook_manager, recorder, output,
     readed_manifest = FileTreeManifest.load(dest_package_folder)
     pref = PackageReference(pref.ref, pref.id, readed_manifest.summary_hash)
     output.info("Package revision %s" % pref.revision)
+    info = ConanInfo.load_from_package(dest_package_folder)
     with layout.update_metadata() as metadata:
         metadata.packages[package_id].revision = pref.revision
         metadata.packages[package_id].recipe_revision = metadata.recipe.revision
+        metadata.packages[package_id].set_info(info)
+    if cache.blob_store:
+        cache.blob_store.link_package(dest_package_folder)
 
     recorder.package_exported(pref)
@@ -3,9 +3,13 @@ import stat
 import tarfile
 import time
 from collections import defaultdict
+from multiprocessing.pool import ThreadPool
 
+from conans.client.output import BufferedOutput
+from conans.client.recorder.action_recorder import ActionRecorderBuffer
 from conans.client.remote_manager import is_package_snapshot_complete
 from conans.client.source import complete_recipe_sources
+from conans.client.tools.oss import cpu_count
 from conans.errors import ConanException, NotFoundException
 from conans.model.manifest import gather_files, FileTreeManifest
 from conans.model.ref import ConanFileReference, PackageReference, check_valid_ref
@@ -13,7 +17,7 @@ from conans.paths import (CONAN_MANIFEST, CONANFILE, EXPORT_SOURCES_TGZ_NAME,
                           EXPORT_TGZ_NAME, PACKAGE_TGZ_NAME, CONANINFO)
 from conans.search.search import search_packages, search_recipes
 from conans.util.files import (load, clean_dirty, is_dirty,
-                               gzopen_without_timestamps, set_dirty)
+                               gzopen_without_timestamps, mkdir_tmp, rmdir, set_dirty)
 from conans.util.log import logger
 from conans.util.tracer import (log_recipe_upload, log_compressed_files,
                                 log_package_upload)
@@ -55,6 +59,8 @@ class CmdUpload(object):
             - Decide which files to upload and delete from server:
               "_package_files_to_upload". Can raise if policy is NOT overwrite
             - Do the actual upload
+    - With parallel_upload, the recipes of all the refs are uploaded concurrently, and then all
+      their binaries, "_upload_refs_parallel", keeping the order of the output
 
     All the REVISIONS are local defined, not retrieved from servers
 
@@ -74,7 +80,7 @@ class CmdUpload(object):
 
     def upload(self, reference_or_pattern, remotes, upload_recorder, package_id=None,
                all_packages=None, confirm=False, retry=None, retry_wait=None, integrity_check=False,
-               policy=None, query=None):
+               policy=None, query=None, parallel_upload=False):
         t1 = time.time()
         refs, confirm = self._collects_refs_to_upload(package_id, reference_or_pattern, confirm)
         refs_by_remote = self._collect_packages_to_upload(refs, confirm, remotes, all_packages,
@@ -82,6 +88,10 @@ class CmdUpload(object):
         # Do the job
         for remote, refs in refs_by_remote.items():
             self._user_io.out.info("Uploading to remote '{}':".format(remote.name))
+            if parallel_upload:
+                self._upload_refs_parallel(refs, retry, retry_wait, integrity_check, policy,
+                                           remote, upload_recorder, remotes)
+                continue
             for (ref, conanfile, prefs) in refs:
                 self._upload_ref(conanfile, ref, prefs, retry, retry_wait,
                                  integrity_check, policy, remote, upload_recorder, remotes)
@@ -177,68 +187,138 @@ class CmdUpload(object):
                     recipe_remote, upload_recorder, remotes):
         """ Uploads the recipes and binaries identified by ref
         """
+        self._upload_ref_recipe(conanfile, ref, retry, retry_wait, policy, recipe_remote, remotes,
+                                self._user_io.out, upload_recorder)
+
+        # Now the binaries
+        total = len(prefs)
+        for index, pref in enumerate(prefs):
+            msg = ("Uploading package %d/%d: %s to '%s'" % (index+1, total, str(pref.id),
+                                                            recipe_remote.name))
+            self._upload_ref_package(pref, msg, retry, retry_wait, integrity_check, policy,
+                                     recipe_remote, self._user_io.out, upload_recorder)
+
+        self._post_upload_ref(ref, recipe_remote)
+
+    def _upload_refs_parallel(self, refs, retry, retry_wait, integrity_check, policy, remote,
+                              upload_recorder, remotes):
+        """ Uploads the recipes of all the refs and then, as the server needs the recipe before
+        any of its packages, the binaries of all of them, in a pool of threads
+        """
+        self._run_parallel([(self._upload_ref_recipe,
+                             (conanfile, ref, retry, retry_wait, policy, remote, remotes))
+                            for ref, conanfile, _ in refs], upload_recorder)
+        prefs = [pref for _, _, ref_prefs in refs for pref in ref_prefs]
+        total = len(prefs)
+        # The output of the packages of different refs is mixed, so it shows the full reference
+        self._run_parallel([(self._upload_ref_package,
+                             (pref, "Uploading package %d/%d: %s to '%s'"
+                              % (index+1, total, str(pref), remote.name),
+                              retry, retry_wait, integrity_check, policy, remote))
+                            for index, pref in enumerate(prefs)], upload_recorder)
+        for ref, _, _ in refs:
+            self._post_upload_ref(ref, remote)
+
+    def _run_parallel(self, jobs, upload_recorder):
+        """ executes func(*args, output, recorder) for every (func, args) job. The first one is
+        executed in this thread, so the user can be asked for the credentials of the remote if
+        needed, and the rest of them concurrently, in up to cpu_count() threads. Their output and
+        recorded uploads are buffered and replayed in the order of the jobs, raising the first
+        error, if any, once all of them have finished
+        """
+        if not jobs:
+            return
+        func, args = jobs[0]
+        func(*(args + (self._user_io.out, upload_recorder)))
+        jobs = jobs[1:]
+        if not jobs:
+            return
+
+        pending = []
+        pool = ThreadPool(min(cpu_count(output=self._user_io.out), len(jobs)))
+        try:
+            for func, args in jobs:
+                output = BufferedOutput(self._user_io.out)
+                recorder = ActionRecorderBuffer()
+                async_result = pool.apply_async(func, args + (output, recorder))
+                pending.append((async_result, output, recorder))
+        finally:
+            pool.close()
+            pool.join()
+
+        error = None
+        for async_result, output, recorder in pending:
+            output.replay()
+            recorder.replay(upload_recorder)
+            try:
+                async_result.get()
+            except Exception as exc:
+                error = error or exc
+        if error:
+            raise error
+
+    def _upload_ref_recipe(self, conanfile, ref, retry, retry_wait, policy, recipe_remote,
+                           remotes, output, upload_recorder):
         assert (ref.revision is not None), "Cannot upload a recipe without RREV"
         conanfile_path = self._cache.package_layout(ref).conanfile()
         # FIXME: I think it makes no sense to specify a remote to "pre_upload"
         # FIXME: because the recipe can have one and the package a different one
-        self._hook_manager.execute("pre_upload", conanfile_path=conanfile_path,
+        self._hook_manager.execute("pre_upload", output=output, conanfile_path=conanfile_path,
                                    reference=ref, remote=recipe_remote)
 
-        self._user_io.out.info("Uploading %s to remote '%s'" % (str(ref), recipe_remote.name))
-        self._upload_recipe(ref, conanfile, retry, retry_wait, policy, recipe_remote, remotes)
+        output.info("Uploading %s to remote '%s'" % (str(ref), recipe_remote.name))
+        self._upload_recipe(ref, conanfile, retry, retry_wait, policy, recipe_remote, remotes,
+                            output)
         upload_recorder.add_recipe(ref, recipe_remote.name, recipe_remote.url)
 
-        # Now the binaries
-        if prefs:
-            total = len(prefs)
-            for index, pref in enumerate(prefs):
-                p_remote = recipe_remote
-                msg = ("Uploading package %d/%d: %s to '%s'" % (index+1, total, str(pref.id),
-                                                                p_remote.name))
-                self._user_io.out.info(msg)
-                self._upload_package(pref, retry, retry_wait,
-                                     integrity_check, policy, p_remote)
-                upload_recorder.add_package(pref, p_remote.name, p_remote.url)
+    def _upload_ref_package(self, pref, msg, retry, retry_wait, integrity_check, policy,
+                            p_remote, output, upload_recorder):
+        output.info(msg)
+        self._upload_package(pref, retry, retry_wait,
+                             integrity_check, policy, p_remote, output)
+        upload_recorder.add_package(pref, p_remote.name, p_remote.url)
 
+    def _post_upload_ref(self, ref, recipe_remote):
+        conanfile_path = self._cache.package_layout(ref).conanfile()
         # FIXME: I think it makes no sense to specify a remote to "post_upload"
         # FIXME: because the recipe can have one and the package a different one
         self._hook_manager.execute("post_upload", conanfile_path=conanfile_path, reference=ref,
                                    remote=recipe_remote)
 
-    def _upload_recipe(self, ref, conanfile, retry, retry_wait, policy, remote, remotes):
+    def _upload_recipe(self, ref, conanfile, retry, retry_wait, policy, remote, remotes, output):
         current_remote_name = self._cache.package_layout(ref).load_metadata().recipe.remote
 
         if remote.name != current_remote_name:
             complete_recipe_sources(self._remote_manager, self._cache, conanfile, ref, remotes)
 
         conanfile_path = self._cache.package_layout(ref).conanfile()
-        self._hook_manager.execute("pre_upload_recipe", conanfile_path=conanfile_path,
-                                   reference=ref, remote=remote)
+        self._hook_manager.execute("pre_upload_recipe", output=output,
+                                   conanfile_path=conanfile_path, reference=ref, remote=remote)
 
         t1 = time.time()
-        the_files = self._compress_recipe_files(ref)
+        the_files = self._compress_recipe_files(ref, output)
         local_manifest = FileTreeManifest.loads(load(the_files["conanmanifest.txt"]))
 
         remote_manifest = None
         if policy != UPLOAD_POLICY_FORCE:
-            remote_manifest = self._check_recipe_date(ref, remote, local_manifest)
+            remote_manifest = self._check_recipe_date(ref, remote, local_manifest, output)
         if policy == UPLOAD_POLICY_SKIP:
             return ref
 
         files_to_upload, deleted = self._recipe_files_to_upload(ref, policy, the_files,
                                                                 remote, remote_manifest,
-                                                                local_manifest)
+                                                                local_manifest, output)
 
         if files_to_upload or deleted:
             self._remote_manager.upload_recipe(ref, files_to_upload, deleted,
-                                               remote, retry, retry_wait)
-            self._upload_recipe_end_msg(ref, remote)
+                                               remote, retry, retry_wait, output)
+            self._upload_recipe_end_msg(ref, remote, output)
         else:
-            self._user_io.out.info("Recipe is up to date, upload skipped")
+            output.info("Recipe is up to date, upload skipped")
         duration = time.time() - t1
         log_recipe_upload(ref, duration, the_files, remote.name)
-        self._hook_manager.execute("post_upload_recipe", conanfile_path=conanfile_path,
-                                   reference=ref, remote=remote)
+        self._hook_manager.execute("post_upload_recipe", output=output,
+                                   conanfile_path=conanfile_path, reference=ref, remote=remote)
 
         # The recipe wasn't in the registry or it has changed the revision field only
         if not current_remote_name:
@@ -248,34 +328,43 @@ class CmdUpload(object):
         return ref
 
     def _upload_package(self, pref, retry=None, retry_wait=None, integrity_check=False,
-                        policy=None, p_remote=None):
+                        policy=None, p_remote=None, output=None):
+        output = output or self._user_io.out
 
         assert (pref.revision is not None), "Cannot upload a package without PREV"
         assert (pref.ref.revision is not None), "Cannot upload a package without RREV"
 
         conanfile_path = self._cache.package_layout(pref.ref).conanfile()
-        self._hook_manager.execute("pre_upload_package", conanfile_path=conanfile_path,
+        self._hook_manager.execute("pre_upload_package", output=output,
+                                   conanfile_path=conanfile_path,
                                    reference=pref.ref,
                                    package_id=pref.id,
                                    remote=p_remote)
 
         t1 = time.time()
-        the_files = self._compress_package_files(pref, integrity_check)
-        if policy == UPLOAD_POLICY_SKIP:
-            return None
-        files_to_upload, deleted = self._package_files_to_upload(pref, policy, the_files, p_remote)
-
-        if files_to_upload or deleted:
-            self._remote_manager.upload_package(pref, files_to_upload, deleted, p_remote, retry,
-                                                retry_wait)
-            logger.debug("UPLOAD: Time upload package: %f" % (time.time() - t1))
-        else:
-            self._user_io.out.info("Package is up to date, upload skipped")
+        # The packages of the lower caches are compressed in a temporary folder
+        tmp_folder = mkdir_tmp()
+        try:
+            the_files = self._compress_package_files(pref, integrity_check, tmp_folder, output)
+            if policy == UPLOAD_POLICY_SKIP:
+                return None
+            files_to_upload, deleted = self._package_files_to_upload(pref, policy, the_files,
+                                                                     p_remote)
+
+            if files_to_upload or deleted:
+                self._remote_manager.upload_package(pref, files_to_upload, deleted, p_remote,
+                                                    retry, retry_wait, output)
+                logger.debug("UPLOAD: Time upload package: %f" % (time.time() - t1))
+            else:
+                output.info("Package is up to date, upload skipped")
+        finally:
+            rmdir(tmp_folder)
 
         duration = time.time() - t1
         log_package_upload(pref, duration, the_files, p_remote)
-        self._hook_manager.execute("post_upload_package", conanfile_path=conanfile_path,
-                                   reference=pref.ref, package_id=pref.id, remote=p_remote)
+        self._hook_manager.execute("post_upload_package", output=output,
+                                   conanfile_path=conanfile_path, reference=pref.ref,
+                                   package_id=pref.id, remote=p_remote)
 
         logger.debug("UPLOAD: Time uploader upload_package: %f" % (time.time() - t1))
 
@@ -287,43 +376,57 @@ class CmdUpload(object):
 
         return pref
 
-    def _compress_recipe_files(self, ref):
+    def _compress_recipe_files(self, ref, output):
+        # The archives are stored next to the recipe, that has to be in the local cache
+        self._cache.package_layout(ref).copy_up()
         export_folder = self._cache.package_layout(ref).export()
 
         for f in (EXPORT_TGZ_NAME, EXPORT_SOURCES_TGZ_NAME):
             tgz_path = os.path.join(export_folder, f)
             if is_dirty(tgz_path):
-                self._user_io.out.warn("%s: Removing %s, marked as dirty" % (str(ref), f))
+                output.warn("%s: Removing %s, marked as dirty" % (str(ref), f))
                 os.remove(tgz_path)
                 clean_dirty(tgz_path)
 
         files, symlinks = gather_files(export_folder)
         if CONANFILE not in files or CONAN_MANIFEST not in files:
             raise ConanException("Cannot upload corrupted recipe '%s'" % str(ref))
-        export_src_folder = self._cache.package_layout(ref).export_sources()
+        package_layout = self._cache.package_layout(ref)
+        summary_hash = FileTreeManifest.loads(load(files[CONAN_MANIFEST])).summary_hash
+        archives = package_layout.load_metadata().recipe.archives
+        _remove_outdated_archives(files, (EXPORT_TGZ_NAME, EXPORT_SOURCES_TGZ_NAME), archives,
+                                  summary_hash)
+        export_src_folder = package_layout.export_sources()
         src_files, src_symlinks = gather_files(export_src_folder)
         the_files = _compress_recipe_files(files, symlinks, src_files, src_symlinks, export_folder,
-                                           self._user_io.out)
+                                           output)
+        with package_layout.update_metadata() as metadata:
+            metadata.recipe.archives = {name: summary_hash for name in the_files
+                                        if name in (EXPORT_TGZ_NAME, EXPORT_SOURCES_TGZ_NAME)}
         return the_files
 
-    def _compress_package_files(self, pref, integrity_check):
+    def _compress_package_files(self, pref, integrity_check, tmp_folder, output):
 
         t1 = time.time()
         # existing package, will use short paths if defined
-        package_folder = self._cache.package_layout(pref.ref, short_paths=None).package(pref)
+        layout = self._cache.package_layout(pref.ref, short_paths=None)
+        package_folder = layout.package(pref)
+        # The packages of the lower caches are compressed out of them, they are never modified
+        lower_package = package_folder != layout.local().package(pref)
 
         if is_dirty(package_folder):
             raise ConanException("Package %s is corrupted, aborting upload.\n"
                                  "Remove it with 'conan remove %s -p=%s'"
                                  % (pref, pref.ref, pref.id))
         tgz_path = os.path.join(package_folder, PACKAGE_TGZ_NAME)
-        if is_dirty(tgz_path):
-            self._user_io.out.warn("%s: Removing %s, marked as dirty"
-                                   % (str(pref), PACKAGE_TGZ_NAME))
+        if is_dirty(tgz_path) and not lower_package:
+            output.warn("%s: Removing %s, marked as dirty" % (str(pref), PACKAGE_TGZ_NAME))
             os.remove(tgz_path)
             clean_dirty(tgz_path)
         # Get all the files in that directory
         files, symlinks = gather_files(package_folder)
+        if lower_package:
+            files.pop(PACKAGE_TGZ_NAME, None)
 
         if CONANINFO not in files or CONAN_MANIFEST not in files:
             logger.error("Missing info or manifest in uploading files: %s" % (str(files)))
@@ -331,15 +434,22 @@ class CmdUpload(object):
 
         logger.debug("UPLOAD: Time remote_manager build_files_set : %f" % (time.time() - t1))
         if integrity_check:
-            self._package_integrity_check(pref, files, package_folder)
+            self._package_integrity_check(pref, files, package_folder, output)
             logger.debug("UPLOAD: Time remote_manager check package integrity : %f"
                          % (time.time() - t1))
 
-        the_files = _compress_package_files(files, symlinks, package_folder, self._user_io.out)
+        package_layout = self._cache.package_layout(pref.ref)
+        summary_hash = FileTreeManifest.loads(load(files[CONAN_MANIFEST])).summary_hash
+        archives = package_layout.load_metadata().packages[pref.id].archives
+        _remove_outdated_archives(files, (PACKAGE_TGZ_NAME, ), archives, summary_hash)
+        dest_folder = tmp_folder if lower_package else package_folder
+        the_files = _compress_package_files(files, symlinks, dest_folder, output)
+        with package_layout.update_metadata() as metadata:
+            metadata.packages[pref.id].archives = {PACKAGE_TGZ_NAME: summary_hash}
         return the_files
 
     def _recipe_files_to_upload(self, ref, policy, the_files, remote, remote_manifest,
-                                local_manifest):
+                                local_manifest, output):
         self._remote_manager.check_credentials(remote)
         remote_snapshot = self._remote_manager.get_recipe_snapshot(ref, remote)
         files_to_upload = {filename.replace("\\", "/"): path
@@ -356,8 +466,8 @@ class CmdUpload(object):
                     remote_manifest, _ = self._remote_manager.get_recipe_manifest(ref, remote)
                 except NotFoundException:
                     # This is weird, the manifest still not there, better upload everything
-                    self._user_io.out.warn("The remote recipe doesn't have the 'conanmanifest.txt' "
-                                           "file and will be uploaded: '{}'".format(ref))
+                    output.warn("The remote recipe doesn't have the 'conanmanifest.txt' "
+                                "file and will be uploaded: '{}'".format(ref))
                     return files_to_upload, deleted
 
             if remote_manifest == local_manifest:
@@ -386,26 +496,26 @@ class CmdUpload(object):
         deleted = set(remote_snapshot).difference(the_files)
         return the_files, deleted
 
-    def _upload_recipe_end_msg(self, ref, remote):
+    def _upload_recipe_end_msg(self, ref, remote, output):
         msg = "Uploaded conan recipe '%s' to '%s'" % (str(ref), remote.name)
         url = remote.url.replace("https://api.bintray.com/conan", "https://bintray.com")
         msg += ": %s" % url
-        self._user_io.out.info(msg)
+        output.info(msg)
 
-    def _package_integrity_check(self, pref, files, package_folder):
+    def _package_integrity_check(self, pref, files, package_folder, output):
         # If package has been modified remove tgz to regenerate it
-        self._user_io.out.rewrite_line("Checking package integrity...")
+        output.rewrite_line("Checking package integrity...")
 
         # short_paths = None is enough if there exist short_paths
         layout = self._cache.package_layout(pref.ref, short_paths=None)
         read_manifest, expected_manifest = layout.package_manifests(pref)
 
         if read_manifest != expected_manifest:
-            self._user_io.out.writeln("")
+            output.writeln("")
             diff = read_manifest.difference(expected_manifest)
             for fname, (h1, h2) in diff.items():
-                self._user_io.out.warn("Mismatched checksum '%s' (manifest: %s, file: %s)"
-                                       % (fname, h1, h2))
+                output.warn("Mismatched checksum '%s' (manifest: %s, file: %s)"
+                            % (fname, h1, h2))
 
             if PACKAGE_TGZ_NAME in files:
                 try:
@@ -418,10 +528,10 @@ class CmdUpload(object):
             logger.error("Manifests doesn't match!\n%s" % error_msg)
             raise ConanException("Cannot upload corrupted package '%s'" % str(pref))
         else:
-            self._user_io.out.rewrite_line("Package integrity OK!")
-        self._user_io.out.writeln("")
+            output.rewrite_line("Package integrity OK!")
+        output.writeln("")
 
-    def _check_recipe_date(self, ref, remote, local_manifest):
+    def _check_recipe_date(self, ref, remote, local_manifest, output):
         try:
             remote_recipe_manifest, ref = self._remote_manager.get_recipe_manifest(ref, remote)
         except NotFoundException:
@@ -429,32 +539,45 @@ class CmdUpload(object):
 
         if (remote_recipe_manifest != local_manifest and
                 remote_recipe_manifest.time > local_manifest.time):
-            self._print_manifest_information(remote_recipe_manifest, local_manifest, ref, remote)
+            self._print_manifest_information(remote_recipe_manifest, local_manifest, ref, remote,
+                                             output)
             raise ConanException("Remote recipe is newer than local recipe: "
                                  "\n Remote date: %s\n Local date: %s" %
                                  (remote_recipe_manifest.time, local_manifest.time))
 
         return remote_recipe_manifest
 
-    def _print_manifest_information(self, remote_recipe_manifest, local_manifest, ref, remote):
+    def _print_manifest_information(self, remote_recipe_manifest, local_manifest, ref, remote,
+                                    output):
         try:
-            self._user_io.out.info("\n%s" % ("-"*40))
-            self._user_io.out.info("Remote manifest:")
-            self._user_io.out.info(remote_recipe_manifest)
-            self._user_io.out.info("Local manifest:")
-            self._user_io.out.info(local_manifest)
+            output.info("\n%s" % ("-"*40))
+            output.info("Remote manifest:")
+            output.info(remote_recipe_manifest)
+            output.info("Local manifest:")
+            output.info(local_manifest)
             difference = remote_recipe_manifest.difference(local_manifest)
             if "conanfile.py" in difference:
                 contents = load(self._cache.package_layout(ref).conanfile())
                 endlines = "\\r\\n" if "\r\n" in contents else "\\n"
-                self._user_io.out.info("Local 'conanfile.py' using '%s' line-ends" % endlines)
+                output.info("Local 'conanfile.py' using '%s' line-ends" % endlines)
                 remote_contents = self._remote_manager.get_recipe_path(ref, path="conanfile.py",
                                                                        remote=remote)
                 endlines = "\\r\\n" if "\r\n" in remote_contents else "\\n"
-                self._user_io.out.info("Remote 'conanfile.py' using '%s' line-ends" % endlines)
-            self._user_io.out.info("\n%s" % ("-"*40))
+                output.info("Remote 'conanfile.py' using '%s' line-ends" % endlines)
+            output.info("\n%s" % ("-"*40))
         except Exception as e:
-            self._user_io.out.info("Error printing information about the diff: %s" % str(e))
+            output.info("Error printing information about the diff: %s" % str(e))
+
+
+def _remove_outdated_archives(files, tgz_names, archives, summary_hash):
+    """ The archives kept from a previous upload or download are reused only if they were created
+    from the same files, as described by the summary hash of the manifest stored in the metadata
+    """
+    for tgz_name in tgz_names:
+        tgz_path = files.get(tgz_name)
+        if tgz_path and archives.get(tgz_name) != summary_hash:
+            logger.debug("UPLOAD: Removing outdated %s" % tgz_path)
+            os.remove(files.pop(tgz_name))
 
 
 def _compress_recipe_files(files, symlinks, src_files, src_symlinks, dest_folder, output):
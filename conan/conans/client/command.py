@@ -465,7 +465,8 @@ class Command(object):
         """
         Manages Conan configuration.
 
-        Used to edit conan.conf, or install config files.
+        Used to edit conan.conf, install config files, or maintain the index of the
+        local cache.
         """
         parser = argparse.ArgumentParser(description=self.config.__doc__,
                                          prog="conan config",
@@ -479,6 +480,8 @@ class Command(object):
         get_subparser = subparsers.add_parser('get', help='Get the value of configuration item')
         install_subparser = subparsers.add_parser('install', help='install a full configuration '
                                                                   'from a local or remote zip file')
+        index_subparser = subparsers.add_parser('index', help='Rebuild or check the index of '
+                                                              'the references in the local cache')
         rm_subparser.add_argument("item", help="Item to remove")
         get_subparser.add_argument("item", nargs="?", help="Item to print")
         set_subparser.add_argument("item", help="'item=value' to set")
@@ -497,6 +500,11 @@ class Command(object):
                                        'specified origin')
         install_subparser.add_argument("-tf", "--target-folder",
                                        help='Install to that path in the conan cache')
+        index_group = index_subparser.add_mutually_exclusive_group(required=True)
+        index_group.add_argument("--rebuild", action="store_true", default=False,
+                                 help='Rebuild the index from the metadata of the references')
+        index_group.add_argument("--check", action="store_true", default=False,
+                                 help='Check that the index is consistent with the cache')
 
         args = parser.parse_args(*args)
 
@@ -518,6 +526,8 @@ class Command(object):
             return self._conan.config_install(args.item, verify_ssl, args.type, args.args,
                                               source_folder=args.source_folder,
                                               target_folder=args.target_folder)
+        elif args.subcommand == "index":
+            return self._conan.config_index(check=args.check)
 
     def info(self, *args):
         """
@@ -976,6 +986,34 @@ class Command(object):
                                   packages=args.packages, builds=args.builds, src=args.src,
                                   force=args.force, remote_name=args.remote, outdated=args.outdated)
 
+    def cache(self, *args):
+        """
+        Manages the local cache.
+
+        The garbage collector removes the package, build and source folders of the
+        cache that were not used recently, or the least recently used ones until the
+        cache fits in a size.
+        """
+        parser = argparse.ArgumentParser(description=self.cache.__doc__,
+                                         prog="conan cache",
+                                         formatter_class=SmartFormatter)
+        subparsers = parser.add_subparsers(dest='subcommand', help='sub-command help')
+        subparsers.required = True
+
+        gc_subparser = subparsers.add_parser('gc', help='Remove the least recently used folders '
+                                                        'of the cache')
+        gc_subparser.add_argument("--max-size", action=OnceArgument,
+                                  help='Remove the least recently used folders until the cache '
+                                  'fits in this size, e.g. 500M, 20G')
+        gc_subparser.add_argument("--max-age", action=OnceArgument,
+                                  help='Remove the folders not used in this time, e.g. 12h, 30d')
+        args = parser.parse_args(*args)
+
+        if args.subcommand == "gc":
+            if not args.max_size and not args.max_age:
+                raise ConanException("Specify --max-size and/or --max-age")
+            return self._conan.cache_gc(max_size=args.max_size, max_age=args.max_age)
+
     def copy(self, *args):
         """
         Copies conan recipes and packages to another user/channel.
@@ -1219,6 +1257,9 @@ class Command(object):
                             help="Uploads package only if recipe is the same as the remote one")
         parser.add_argument("-j", "--json", default=None, action=OnceArgument,
                             help='json file path where the upload information will be written to')
+        parser.add_argument("--parallel", action='store_true', default=False,
+                            help='Upload the recipes, and then the binary packages, concurrently '
+                                 'in as many threads as the cpu_count (CONAN_CPU_COUNT)')
 
         args = parser.parse_args(*args)
 
@@ -1271,7 +1312,8 @@ class Command(object):
                                       query=args.query, remote_name=args.remote,
                                       all_packages=args.all, policy=policy,
                                       confirm=args.confirm, retry=args.retry,
-                                      retry_wait=args.retry_wait, integrity_check=args.check)
+                                      retry_wait=args.retry_wait, integrity_check=args.check,
+                                      parallel_upload=args.parallel)
         except ConanException as exc:
             info = exc.info
             raise
@@ -1620,7 +1662,7 @@ class Command(object):
                 ("Package development commands", ("source", "build", "package", "editable",
                                                   "workspace")),
                 ("Misc commands", ("profile", "remote", "user", "imports", "copy", "remove",
-                                   "alias", "download", "inspect", "help"))]
+                                   "alias", "download", "inspect", "cache", "help"))]
 
         def check_all_commands_listed():
             """Keep updated the main directory, raise if don't"""
@@ -7,6 +7,7 @@ from conans import __version__ as client_version
 from conans.client import packager, tools
 from conans.client.cache.cache import ClientCache
 from conans.client.cmd.build import build
+from conans.client.cmd.cache_gc import cache_gc, parse_age, parse_size
 from conans.client.cmd.create import create
 from conans.client.cmd.download import download
 from conans.client.cmd.export import cmd_export, export_alias
@@ -82,6 +83,7 @@ def api_method(f):
                 pass
             raise
         finally:
+            api._remote_manager.close()
             os.chdir(curdir)
     return wrapper
 
@@ -166,7 +168,8 @@ class ConanAPIV1(object):
         put_headers = cache.read_put_headers()
         rest_api_client = RestApiClient(user_io.out, requester,
                                         revisions_enabled=config.revisions_enabled,
-                                        put_headers=put_headers)
+                                        put_headers=put_headers,
+                                        parallel_download=config.parallel_download)
         # To store user and token
         localdb = LocalDB.create(cache.localdb)
         # Wraps RestApiClient to add authentication support (same interface)
@@ -582,6 +585,24 @@ class ConanAPIV1(object):
         config_parser.rm_item(item)
         self._cache.invalidate()
 
+    @api_method
+    def config_index(self, check=False):
+        cache_index = self._cache.cache_index
+        if not cache_index:
+            raise ConanException("The cache index is not enabled. Enable it with "
+                                 "'conan config set general.cache_index=True'")
+        if check:
+            errors = cache_index.check(self._cache.store)
+            for error in errors:
+                self._user_io.out.error(error)
+            if errors:
+                raise ConanException("The cache index is not consistent with the cache. "
+                                     "Rebuild it with 'conan config index --rebuild'")
+            self._user_io.out.success("The cache index is consistent with the cache")
+        else:
+            cache_index.rebuild(self._cache.store)
+            self._user_io.out.success("The cache index has been rebuilt")
+
     @api_method
     def config_install(self, path_or_url, verify_ssl, config_type=None, args=None,
                        source_folder=None, target_folder=None):
@@ -851,7 +872,8 @@ class ConanAPIV1(object):
 
     @api_method
     def upload(self, pattern, package=None, remote_name=None, all_packages=False, confirm=False,
-               retry=None, retry_wait=None, integrity_check=False, policy=None, query=None):
+               retry=None, retry_wait=None, integrity_check=False, policy=None, query=None,
+               parallel_upload=False):
         """ Uploads a package recipe and the generated binary packages to a specified remote
         """
         upload_recorder = UploadRecorder()
@@ -862,7 +884,8 @@ class ConanAPIV1(object):
         self._python_requires.enable_remotes(remotes=remotes)
         try:
             uploader.upload(pattern, remotes, upload_recorder, package, all_packages, confirm, retry,
-                            retry_wait, integrity_check, policy, query=query)
+                            retry_wait, integrity_check, policy, query=query,
+                            parallel_upload=parallel_upload)
             return upload_recorder.get_info()
         except ConanException as exc:
             upload_recorder.error = True
@@ -974,6 +997,16 @@ class ConanAPIV1(object):
     def remove_locks(self):
         self._cache.remove_locks()
 
+    @api_method
+    def cache_gc(self, max_size=None, max_age=None):
+        """ Removes the least recently used folders of the cache
+        @param max_size: text like "20G", the size of the cache to keep
+        @param max_age: text like "30d", the folders not used in this time are removed
+        """
+        cache_gc(self._cache, self._user_io.out,
+                 max_size=parse_size(max_size) if max_size else None,
+                 max_age=parse_age(max_age) if max_age else None)
+
     @api_method
     def profile_list(self):
         return cmd_profile_list(self._cache.profiles_path, self._user_io.out)
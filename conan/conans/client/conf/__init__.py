@@ -105,11 +105,22 @@ print_run_commands = False  # environment CONAN_PRINT_RUN_COMMANDS
 [general]
 default_profile = %s
 compression_level = 9                 # environment CONAN_COMPRESSION_LEVEL
+# compression_threads = 4              # environment CONAN_COMPRESSION_THREADS
+# manifest_threads = 4                 # environment CONAN_MANIFEST_THREADS (default: cpus, max 8)
+# manifest_stat_cache = True           # environment CONAN_MANIFEST_STAT_CACHE
 sysrequires_sudo = True               # environment CONAN_SYSREQUIRES_SUDO
 request_timeout = 60                  # environment CONAN_REQUEST_TIMEOUT (seconds)
 default_package_id_mode = semver_direct_mode # environment CONAN_DEFAULT_PACKAGE_ID_MODE
 # retry = 2                             # environment CONAN_RETRY
 # retry_wait = 5                        # environment CONAN_RETRY_WAIT (seconds)
+# parallel_download = 8               # environment CONAN_PARALLEL_DOWNLOAD
+# remote_search_ttl = 300             # environment CONAN_REMOTE_SEARCH_TTL (seconds)
+# parallel_builds = 4                 # environment CONAN_PARALLEL_BUILDS
+# keep_downloaded_archives = False    # environment CONAN_KEEP_DOWNLOADED_ARCHIVES
+# cache_index = False                 # environment CONAN_CACHE_INDEX
+# cache_dedup = False                 # environment CONAN_CACHE_DEDUP
+# cache_max_size = 20G                # environment CONAN_CACHE_MAX_SIZE (GC after install)
+# cache_max_age = 30d                 # environment CONAN_CACHE_MAX_AGE (GC after install)
 # sysrequires_mode = enabled          # environment CONAN_SYSREQUIRES_MODE (allowed modes enabled/verify/disabled)
 # vs_installation_preference = Enterprise, Professional, Community, BuildTools # environment CONAN_VS_INSTALLATION_PREFERENCE
 # verbose_traceback = False           # environment CONAN_VERBOSE_TRACEBACK
@@ -119,6 +130,8 @@ default_package_id_mode = semver_direct_mode # environment CONAN_DEFAULT_PACKAGE
 # read_only_cache = True              # environment CONAN_READ_ONLY_CACHE
 # pylintrc = path/to/pylintrc_file    # environment CONAN_PYLINTRC
 # cache_no_locks = True               # environment CONAN_CACHE_NO_LOCKS
+# cache_os_locks = False              # environment CONAN_CACHE_OS_LOCKS (not in Windows)
+# cache_lock_timeout = 600            # environment CONAN_CACHE_LOCK_TIMEOUT (seconds, with cache_os_locks)
 # user_home_short = your_path         # environment CONAN_USER_HOME_SHORT
 # use_always_short_paths = False      # environment CONAN_USE_ALWAYS_SHORT_PATHS
 # skip_vs_projects_upgrade = False    # environment CONAN_SKIP_VS_PROJECTS_UPGRADE
@@ -155,6 +168,10 @@ default_package_id_mode = semver_direct_mode # environment CONAN_DEFAULT_PACKAGE
 # path beginning with "~" (if the environment var CONAN_USER_HOME is specified, this directory, even
 # with "~/", will be relative to the conan user home, not to the system user home)
 path = ./data
+# Read-only caches looked up, in order, for the recipes and packages not in this one. They must be
+# absolute paths of storage folders, i.e. in a shared network filesystem, that are not modified
+# while in use. Everything created or modified is always stored in the path above
+# lower_paths = /mnt/shared/.conan/data   # environment CONAN_STORAGE_LOWER_PATHS (comma separated)
 
 [proxies]
 # Empty section will try to use system proxies.
@@ -197,16 +214,29 @@ class ConanClientConfigParser(ConfigParser, object):
                "CONAN_TRACE_FILE": self._env_c("log.trace_file", "CONAN_TRACE_FILE", None),
                "CONAN_PRINT_RUN_COMMANDS": self._env_c("log.print_run_commands", "CONAN_PRINT_RUN_COMMANDS", "False"),
                "CONAN_COMPRESSION_LEVEL": self._env_c("general.compression_level", "CONAN_COMPRESSION_LEVEL", "9"),
+               "CONAN_COMPRESSION_THREADS": self._env_c("general.compression_threads", "CONAN_COMPRESSION_THREADS", None),
+               "CONAN_MANIFEST_THREADS": self._env_c("general.manifest_threads", "CONAN_MANIFEST_THREADS", None),
+               "CONAN_MANIFEST_STAT_CACHE": self._env_c("general.manifest_stat_cache", "CONAN_MANIFEST_STAT_CACHE", "False"),
                "CONAN_NON_INTERACTIVE": self._env_c("general.non_interactive", "CONAN_NON_INTERACTIVE", "False"),
                "CONAN_SKIP_BROKEN_SYMLINKS_CHECK": self._env_c("general.skip_broken_symlinks_check", "CONAN_SKIP_BROKEN_SYMLINKS_CHECK", "False"),
                "CONAN_PYLINTRC": self._env_c("general.pylintrc", "CONAN_PYLINTRC", None),
                "CONAN_CACHE_NO_LOCKS": self._env_c("general.cache_no_locks", "CONAN_CACHE_NO_LOCKS", "False"),
+               "CONAN_CACHE_OS_LOCKS": self._env_c("general.cache_os_locks", "CONAN_CACHE_OS_LOCKS", "False"),
+               "CONAN_CACHE_LOCK_TIMEOUT": self._env_c("general.cache_lock_timeout", "CONAN_CACHE_LOCK_TIMEOUT", None),
                "CONAN_PYLINT_WERR": self._env_c("general.pylint_werr", "CONAN_PYLINT_WERR", None),
                "CONAN_SYSREQUIRES_SUDO": self._env_c("general.sysrequires_sudo", "CONAN_SYSREQUIRES_SUDO", "False"),
                "CONAN_SYSREQUIRES_MODE": self._env_c("general.sysrequires_mode", "CONAN_SYSREQUIRES_MODE", "enabled"),
                "CONAN_REQUEST_TIMEOUT": self._env_c("general.request_timeout", "CONAN_REQUEST_TIMEOUT", None),
                "CONAN_RETRY": self._env_c("general.retry", "CONAN_RETRY", None),
                "CONAN_RETRY_WAIT": self._env_c("general.retry_wait", "CONAN_RETRY_WAIT", None),
+               "CONAN_PARALLEL_DOWNLOAD": self._env_c("general.parallel_download", "CONAN_PARALLEL_DOWNLOAD", None),
+               "CONAN_REMOTE_SEARCH_TTL": self._env_c("general.remote_search_ttl", "CONAN_REMOTE_SEARCH_TTL", None),
+               "CONAN_PARALLEL_BUILDS": self._env_c("general.parallel_builds", "CONAN_PARALLEL_BUILDS", None),
+               "CONAN_KEEP_DOWNLOADED_ARCHIVES": self._env_c("general.keep_downloaded_archives", "CONAN_KEEP_DOWNLOADED_ARCHIVES", "False"),
+               "CONAN_CACHE_INDEX": self._env_c("general.cache_index", "CONAN_CACHE_INDEX", "False"),
+               "CONAN_CACHE_DEDUP": self._env_c("general.cache_dedup", "CONAN_CACHE_DEDUP", "False"),
+               "CONAN_CACHE_MAX_SIZE": self._env_c("general.cache_max_size", "CONAN_CACHE_MAX_SIZE", None),
+               "CONAN_CACHE_MAX_AGE": self._env_c("general.cache_max_age", "CONAN_CACHE_MAX_AGE", None),
                "CONAN_VS_INSTALLATION_PREFERENCE": self._env_c("general.vs_installation_preference", "CONAN_VS_INSTALLATION_PREFERENCE", None),
                "CONAN_RECIPE_LINTER": self._env_c("general.recipe_linter", "CONAN_RECIPE_LINTER", "True"),
                "CONAN_CPU_COUNT": self._env_c("general.cpu_count", "CONAN_CPU_COUNT", None),
@@ -363,6 +393,27 @@ class ConanClientConfigParser(ConfigParser, object):
         except ConanException:
             return False
 
+    @property
+    def cache_os_locks(self):
+        try:
+            return get_env("CONAN_CACHE_OS_LOCKS", False)
+        except ConanException:
+            return False
+
+    @property
+    def cache_lock_timeout(self):
+        timeout = os.getenv("CONAN_CACHE_LOCK_TIMEOUT")
+        if not timeout:
+            try:
+                timeout = self.get_item("general.cache_lock_timeout")
+            except ConanException:
+                return None
+
+        try:
+            return float(timeout)
+        except ValueError:
+            raise ConanException("Specify a numeric parameter for 'cache_lock_timeout'")
+
     @property
     def storage(self):
         return dict(self.get_conf("storage"))
@@ -381,6 +432,46 @@ class ConanClientConfigParser(ConfigParser, object):
         except ValueError:
             raise ConanException("Specify a numeric parameter for 'request_timeout'")
 
+    @property
+    def cache_index(self):
+        try:
+            cache_index = get_env("CONAN_CACHE_INDEX")
+            if cache_index is None:
+                try:
+                    cache_index = self.get_item("general.cache_index")
+                except ConanException:
+                    return False
+            return cache_index.lower() in ("1", "true")
+        except ConanException:
+            return False
+
+    @property
+    def cache_dedup(self):
+        try:
+            cache_dedup = get_env("CONAN_CACHE_DEDUP")
+            if cache_dedup is None:
+                try:
+                    cache_dedup = self.get_item("general.cache_dedup")
+                except ConanException:
+                    return False
+            return cache_dedup.lower() in ("1", "true")
+        except ConanException:
+            return False
+
+    @property
+    def cache_max_size(self):
+        try:
+            return get_env("CONAN_CACHE_MAX_SIZE") or self.get_item("general.cache_max_size")
+        except ConanException:
+            return None
+
+    @property
+    def cache_max_age(self):
+        try:
+            return get_env("CONAN_CACHE_MAX_AGE") or self.get_item("general.cache_max_age")
+        except ConanException:
+            return None
+
     @property
     def revisions_enabled(self):
         try:
@@ -431,6 +522,23 @@ class ConanClientConfigParser(ConfigParser, object):
                 raise ConanException("Conan storage path has to be an absolute path")
         return result
 
+    @property
+    def storage_lower_paths(self):
+        result = get_env("CONAN_STORAGE_LOWER_PATHS", None)
+        if result is None:
+            try:
+                result = self.storage.get("lower_paths")
+            except ConanException:
+                result = None
+        if not result:
+            return []
+        paths = [conan_expand_user(path.strip()) for path in result.split(",") if path.strip()]
+        for path in paths:
+            if not os.path.isabs(path):
+                raise ConanException("Conan storage lower path '%s' has to be an absolute path"
+                                     % path)
+        return [os.path.normpath(path) for path in paths]
+
     @property
     def proxies(self):
         try:  # optional field, might not exist
@@ -559,6 +667,48 @@ class ConanClientConfigParser(ConfigParser, object):
         except ValueError:
             raise ConanException("Specify a numeric parameter for 'retry_wait'")
 
+    @property
+    def parallel_download(self):
+        parallel_download = os.getenv("CONAN_PARALLEL_DOWNLOAD")
+        if not parallel_download:
+            try:
+                parallel_download = self.get_item("general.parallel_download")
+            except ConanException:
+                return None
+
+        try:
+            return int(parallel_download) if parallel_download is not None else None
+        except ValueError:
+            raise ConanException("Specify a numeric parameter for 'parallel_download'")
+
+    @property
+    def remote_search_ttl(self):
+        remote_search_ttl = os.getenv("CONAN_REMOTE_SEARCH_TTL")
+        if not remote_search_ttl:
+            try:
+                remote_search_ttl = self.get_item("general.remote_search_ttl")
+            except ConanException:
+                return None
+
+        try:
+            return int(remote_search_ttl) if remote_search_ttl is not None else None
+        except ValueError:
+            raise ConanException("Specify a numeric parameter for 'remote_search_ttl'")
+
+    @property
+    def parallel_builds(self):
+        parallel_builds = os.getenv("CONAN_PARALLEL_BUILDS")
+        if not parallel_builds:
+            try:
+                parallel_builds = self.get_item("general.parallel_builds")
+            except ConanException:
+                return None
+
+        try:
+            return int(parallel_builds) if parallel_builds is not None else None
+        except ValueError:
+            raise ConanException("Specify a numeric parameter for 'parallel_builds'")
+
     @property
     def generate_run_log_file(self):
         try:
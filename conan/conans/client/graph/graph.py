@@ -173,16 +173,27 @@ class DepsGraph(object):
         # These are the nodes with pref (not including PREV) that have been evaluated
         self.evaluated = {}  # {pref: [nodes]}
 
+    @property
+    def nodes(self):
+        return self._nodes
+
+    @nodes.setter
+    def nodes(self, nodes):
+        self._nodes = nodes
+        self._levels = {}  # {direct: [[node1, node34], [node3], ...]}, computed on demand
+
     def add_node(self, node):
         if not self.nodes:
             self.root = node
         self.nodes.add(node)
+        self._levels = {}
 
     def add_edge(self, src, dst, private=False, build_require=False):
         assert src in self.nodes and dst in self.nodes
         edge = Edge(src, dst, private, build_require)
         src.add_edge(edge)
         dst.add_edge(edge)
+        self._levels = {}
 
     def ordered_iterate(self):
         ordered = self.by_levels()
@@ -271,22 +282,37 @@ class DepsGraph(object):
         dependencies. Second level will be with nodes that only have dependencies to
         first level nodes, and so on
         return [[node1, node34], [node3], [node23, node8],...]
+        The levels are cached until a node or edge is added, a copy is returned so callers
+        can modify it
         """
-        current_level = []
-        result = [current_level]
-        opened = self.nodes.copy()
-        while opened:
-            current = opened.copy()
-            for o in opened:
-                o_neighs = o.neighbors() if direct else o.inverse_neighbors()
-                if not any(n in opened for n in o_neighs):
-                    current_level.append(o)
-                    current.discard(o)
-            current_level.sort()
-            # now initialize new level
-            opened = current
-            if opened:
-                current_level = []
-                result.append(current_level)
+        levels = self._levels.get(direct)
+        if levels is None:
+            levels = self._compute_levels(direct)
+            self._levels[direct] = levels
+        return [list(level) for level in levels]
+
+    def _compute_levels(self, direct):
+        # Kahn's algorithm, counting for every node its neighbors not yet assigned to a level
+        pending = {}  # {node: number of neighbors not in a level yet}
+        inverse = {}  # {node: [nodes having it as neighbor]}
+        for node in self.nodes:
+            neighs = set(node.neighbors() if direct else node.inverse_neighbors())
+            neighs = [n for n in neighs if n in self.nodes]
+            pending[node] = len(neighs)
+            for n in neighs:
+                inverse.setdefault(n, []).append(node)
 
-        return result
+        current_level = [node for node, count in pending.items() if count == 0]
+        result = []
+        while current_level:
+            current_level.sort()
+            result.append(current_level)
+            next_level = []
+            for node in current_level:
+                for n in inverse.get(node, []):
+                    pending[n] -= 1
+                    if pending[n] == 0:
+                        next_level.append(n)
+            current_level = next_level
+
+        return result or [[]]
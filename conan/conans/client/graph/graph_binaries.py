@@ -1,10 +1,13 @@
 import os
+import threading
+from collections import OrderedDict
+from multiprocessing.pool import ThreadPool
 
 from conans.client.graph.graph import (BINARY_BUILD, BINARY_CACHE, BINARY_DOWNLOAD, BINARY_MISSING,
                                        BINARY_SKIP, BINARY_UPDATE,
                                        RECIPE_EDITABLE, BINARY_EDITABLE,
                                        RECIPE_CONSUMER, RECIPE_VIRTUAL)
-from conans.errors import NoRemoteAvailable, NotFoundException, \
+from conans.errors import NoRemoteAvailable, NotFoundException, PackageNotFoundException, \
     conanfile_exception_formatter
 from conans.model.info import ConanInfo
 from conans.model.manifest import FileTreeManifest
@@ -18,6 +21,10 @@ class GraphBinariesAnalyzer(object):
         self._cache = cache
         self._out = output
         self._remote_manager = remote_manager
+        # {(remote name, pref): (info, manifest or None, pref with revisions) or None if not in
+        # the remote}
+        self._remote_packages = {}
+        self._pool = None  # Looks for the binaries of a level concurrently if defined
 
     def _check_update(self, upstream_manifest, package_folder, output, node):
         read_manifest = FileTreeManifest.load(package_folder)
@@ -61,8 +68,8 @@ class GraphBinariesAnalyzer(object):
             node.prev = None
             return
 
-        package_folder = self._cache.package_layout(pref.ref,
-                                                    short_paths=conanfile.short_paths).package(pref)
+        package_layout = self._cache.package_layout(pref.ref, short_paths=conanfile.short_paths)
+        package_folder = package_layout.package(pref)  # The dirty ones are always local
 
         # Check if dirty, to remove it
         with self._cache.package_layout(pref.ref).package_lock(pref):
@@ -77,6 +84,7 @@ class GraphBinariesAnalyzer(object):
                 if rec_rev and rec_rev != node.ref.revision:
                     output.warn("The package {} doesn't belong "
                                 "to the installed recipe revision, removing folder".format(pref))
+                    package_folder = package_layout.local().package(pref)
                     rmdir(package_folder)
 
         remote = remotes.selected
@@ -92,7 +100,7 @@ class GraphBinariesAnalyzer(object):
             if update:
                 if remote:
                     try:
-                        tmp = self._remote_manager.get_package_manifest(pref, remote)
+                        tmp = self._get_package_manifest(pref, remote)
                         upstream_manifest, pref = tmp
                     except NotFoundException:
                         output.warn("Can't update, no package in remote")
@@ -103,7 +111,7 @@ class GraphBinariesAnalyzer(object):
                             node.binary = BINARY_UPDATE
                             node.prev = pref.revision  # With revision
                             if build_mode.outdated:
-                                info, pref = self._remote_manager.get_package_info(pref, remote)
+                                info, pref = self._get_package_info(pref, remote)
                                 package_hash = info.recipe_hash
                 elif remotes:
                     pass
@@ -120,7 +128,7 @@ class GraphBinariesAnalyzer(object):
             remote_info = None
             if remote:
                 try:
-                    remote_info, pref = self._remote_manager.get_package_info(pref, remote)
+                    remote_info, pref = self._get_package_info(pref, remote)
                 except NotFoundException:
                     pass
                 except Exception:
@@ -131,15 +139,9 @@ class GraphBinariesAnalyzer(object):
             # revisions iterate all remotes
 
             if not remote or (not remote_info and self._cache.config.revisions_enabled):
-                for r in remotes.values():
-                    try:
-                        remote_info, pref = self._remote_manager.get_package_info(pref, r)
-                    except NotFoundException:
-                        pass
-                    else:
-                        if remote_info:
-                            remote = r
-                            break
+                remote_info, pref, found_remote = self._find_package_info(pref, remotes)
+                if remote_info:
+                    remote = found_remote
 
             if remote_info:
                 node.binary = BINARY_DOWNLOAD
@@ -164,6 +166,180 @@ class GraphBinariesAnalyzer(object):
 
         node.binary_remote = remote
 
+    def _find_package_info(self, pref, remotes):
+        """ Looks for the package in the remotes following their order. Returns
+        (info, pref with revisions, remote) of the first one having it, or (None, pref, None).
+        If parallel_download is defined all the remotes are queried concurrently, but the result
+        is still the one of the first remote having it
+        """
+        remotes = list(remotes.values())
+        if (self._pool is not None and len(remotes) > 1 and
+                not self._looked_up(PackageReference(pref.ref, pref.id), remotes)):
+            found = self._first_package_info(remotes, self._lookup_remotes(pref, remotes))
+            return found or (None, pref, None)
+
+        for r in remotes:
+            try:
+                remote_info, remote_pref = self._get_package_info(pref, r)
+            except NotFoundException:
+                pass
+            else:
+                if remote_info:
+                    return remote_info, remote_pref, r
+        return None, pref, None
+
+    def _looked_up(self, pref, remotes):
+        """ True if what the remotes returned for the package is already stored, up to the first
+        one having it, so they don't have to be queried again
+        """
+        for remote in remotes:
+            key = (remote.name, pref)
+            if key not in self._remote_packages:
+                return False
+            if self._remote_packages[key] is not None:
+                return True
+        return True
+
+    def _lookup_remotes(self, pref, remotes):
+        """ Queries all the remotes for the package at the same time in the pool, storing what
+        each one returns. Returns their AsyncResults, in the order of the remotes. Once a remote
+        has the package or fails, the queries of the next remotes not started yet are skipped,
+        as their result won't be used
+        """
+        lock = threading.Lock()
+        decided = [len(remotes)]  # Index of the first remote known to have the package or fail
+
+        def decide(index):
+            with lock:
+                decided[0] = min(decided[0], index)
+
+        def query(index, remote):
+            with lock:
+                if index > decided[0]:
+                    return None
+            key = (remote.name, PackageReference(pref.ref, pref.id))
+            try:
+                remote_info, remote_pref = self._get_package_info(pref, remote)
+            except NotFoundException:
+                self._remote_packages[key] = None
+                return None
+            except Exception:
+                decide(index)
+                raise
+            if key not in self._remote_packages:
+                self._remote_packages[key] = (remote_info, None, remote_pref)
+            if remote_info:
+                decide(index)
+            return remote_info, remote_pref
+
+        return [self._pool.apply_async(query, (index, remote))
+                for index, remote in enumerate(remotes)]
+
+    @staticmethod
+    def _first_package_info(remotes, results):
+        """ (info, pref with revisions, remote) of the first remote having the package, or None,
+        raising the error of a remote if no previous one has it
+        """
+        for remote, result in zip(remotes, results):
+            package = result.get()
+            if package is not None and package[0]:
+                return package + (remote, )
+        return None
+
+    def _prefetch_remote_packages(self, nodes, build_mode, update, evaluated_nodes, remotes):
+        """ Retrieves, with a single request per remote, the binaries of a graph level that
+        _evaluate_node looks for in the remotes: the ones not built nor in the cache, or all if
+        updating. The packages of the remotes that cannot do it are looked for concurrently if
+        parallel_download is defined, otherwise the nodes ask them for every package
+        """
+        prefs_by_remote = OrderedDict()  # {remote name: (remote, [prefs])}
+        remotes_by_pref = OrderedDict()  # {pref: [remotes in the order they are looked up]}
+        for node in nodes:
+            if node.recipe in (RECIPE_CONSUMER, RECIPE_VIRTUAL, RECIPE_EDITABLE):
+                continue
+            pref = PackageReference(node.ref, node.package_id)
+            if pref in evaluated_nodes:
+                continue
+            # build_policy_always is checked first not to output its message twice
+            with_deps_to_build = any([dep.dst.binary == BINARY_BUILD
+                                      for dep in node.dependencies])
+            if (node.conanfile.build_policy_always or
+                    build_mode.forced(node.conanfile, node.ref, with_deps_to_build)):
+                continue
+            package_layout = self._cache.package_layout(pref.ref,
+                                                        short_paths=node.conanfile.short_paths)
+            in_cache = os.path.exists(package_layout.package(pref))
+            if in_cache and not update:
+                continue
+            remote = remotes.selected
+            if not remote:
+                metadata = package_layout.load_metadata()
+                remote_name = metadata.packages[pref.id].remote or metadata.recipe.remote
+                remote = remotes.get(remote_name)
+            node_remotes = [remote] if remote else []
+            if not in_cache and (not remote or self._cache.config.revisions_enabled):
+                node_remotes.extend(r for r in remotes.values() if r not in node_remotes)
+            if not in_cache:  # Updating needs the manifest, it is not looked up concurrently
+                remotes_by_pref.setdefault(pref, node_remotes)
+            for r in node_remotes:
+                if (r.name, pref) in self._remote_packages:
+                    continue
+                _, remote_prefs = prefs_by_remote.setdefault(r.name, (r, []))
+                if pref not in remote_prefs:
+                    remote_prefs.append(pref)
+
+        # The remotes only support it in v2
+        batch_remotes = prefs_by_remote.values() if self._cache.config.revisions_enabled else []
+        for remote, prefs in batch_remotes:
+            try:
+                packages = self._remote_manager.get_packages_info(prefs, remote)
+            except Exception:
+                # The nodes will ask for every package, reporting the errors as usual
+                continue
+            if packages is None:
+                continue
+            for pref in prefs:
+                self._remote_packages[(remote.name, pref)] = packages.get(pref)
+
+        if self._pool is not None:
+            # The packages of the level, and the remotes of every package, are looked up at the
+            # same time, all the results are known before evaluating the nodes
+            lookups = [(node_remotes, self._lookup_remotes(pref, node_remotes))
+                       for pref, node_remotes in remotes_by_pref.items()]
+            for node_remotes, results in lookups:
+                try:
+                    self._first_package_info(node_remotes, results)
+                except Exception:
+                    pass  # The node will ask the remote again to report the error
+
+    def _get_remote_package(self, pref, remote):
+        """ The package retrieved from the remote for the whole graph level, raising if it is not
+        in the remote, or None if it wasn't retrieved
+        """
+        key = (remote.name, PackageReference(pref.ref, pref.id))
+        if key not in self._remote_packages:
+            return None
+        package = self._remote_packages[key]
+        if package is None:
+            raise PackageNotFoundException(pref, remote=remote)
+        if pref.revision and package[2].revision != pref.revision:
+            return None
+        return package
+
+    def _get_package_info(self, pref, remote):
+        package = self._get_remote_package(pref, remote)
+        if package is None:
+            return self._remote_manager.get_package_info(pref, remote)
+        info, _, pref = package
+        return info, pref
+
+    def _get_package_manifest(self, pref, remote):
+        package = self._get_remote_package(pref, remote)
+        if package is None or package[1] is None:
+            return self._remote_manager.get_package_manifest(pref, remote)
+        _, manifest, pref = package
+        return manifest, pref
+
     @staticmethod
     def _compute_package_id(node, default_package_id_mode):
         conanfile = node.conanfile
@@ -214,9 +390,22 @@ class GraphBinariesAnalyzer(object):
     def evaluate_graph(self, deps_graph, build_mode, update, remotes):
         default_package_id_mode = self._cache.config.default_package_id_mode
         evaluated = deps_graph.evaluated
-        for node in deps_graph.ordered_iterate():
-            self._compute_package_id(node, default_package_id_mode)
-            if node.recipe in (RECIPE_CONSUMER, RECIPE_VIRTUAL):
-                continue
-            self._evaluate_node(node, build_mode, update, evaluated, remotes)
-            self._handle_private(node)
+        parallel_download = self._cache.config.parallel_download
+        if parallel_download and remotes:
+            self._pool = ThreadPool(parallel_download)
+        try:
+            for level in deps_graph.by_levels():
+                # The nodes of a level only depend on the previous levels
+                for node in level:
+                    self._compute_package_id(node, default_package_id_mode)
+                self._prefetch_remote_packages(level, build_mode, update, evaluated, remotes)
+                for node in level:
+                    if node.recipe in (RECIPE_CONSUMER, RECIPE_VIRTUAL):
+                        continue
+                    self._evaluate_node(node, build_mode, update, evaluated, remotes)
+                    self._handle_private(node)
+        finally:
+            if self._pool is not None:
+                self._pool.close()
+                self._pool.join()
+                self._pool = None
@@ -16,12 +16,13 @@ REFERENCE_CONFLICT, REVISION_CONFLICT = 1, 2
 class DepsGraphBuilder(object):
     """ Responsible for computing the dependencies graph DepsGraph
     """
-    def __init__(self, proxy, output, loader, resolver, recorder):
+    def __init__(self, proxy, output, loader, resolver, recorder, prefetcher=None):
         self._proxy = proxy
         self._output = output
         self._loader = loader
         self._resolver = resolver
         self._recorder = recorder
+        self._prefetcher = prefetcher
 
     def load_graph(self, root_node, check_updates, update, remotes, processed_profile):
         check_updates = check_updates or update
@@ -55,11 +56,13 @@ class DepsGraphBuilder(object):
         conanfile = node.conanfile
         scope = conanfile.display_name
         requires = [Requirement(ref) for ref in build_requires_refs]
+        for require in requires:
+            require.build_require = True
         self._resolve_ranges(graph, requires, scope, update, remotes)
+        self._prefetch(node, requires, check_updates, update, remotes)
 
         for require in requires:
             name = require.ref.name
-            require.build_require = True
             self._handle_require(name, node, require, graph, check_updates, update,
                                  remotes, processed_profile, new_reqs, new_options)
 
@@ -120,6 +123,7 @@ class DepsGraphBuilder(object):
 
         # if there are version-ranges, resolve them before expanding each of the requirements
         self._resolve_deps(dep_graph, node, update, remotes)
+        self._prefetch(node, node.conanfile.requires.values(), check_updates, update, remotes)
 
         # Expand each one of the current requirements
         for name, require in node.conanfile.requires.items():
@@ -128,6 +132,23 @@ class DepsGraphBuilder(object):
             self._handle_require(name, node, require, dep_graph, check_updates, update,
                                  remotes, processed_profile, new_reqs, new_options)
 
+    def _prefetch(self, node, requires, check_updates, update, remotes):
+        """ launches in background the retrieval of the recipes of the requirements that will
+        need a new node, so they are ready when the expansion reaches them
+        """
+        if not self._prefetcher:
+            return
+        refs = []
+        for require in requires:
+            if require.override:
+                continue
+            name = require.ref.name
+            previous = node.public_deps.get(name)
+            if not previous or ((require.build_require or require.private)
+                                and not node.public_closure.get(name)):
+                refs.append(require.ref)
+        self._prefetcher.prefetch(refs, check_updates, update, remotes)
+
     def _handle_require(self, name, node, require, dep_graph, check_updates, update,
                         remotes, processed_profile, new_reqs, new_options):
 
@@ -311,8 +332,12 @@ class DepsGraphBuilder(object):
         """
 
         try:
-            result = self._proxy.get_recipe(requirement.ref, check_updates, update,
-                                            remotes, self._recorder)
+            result = None
+            if self._prefetcher:
+                result = self._prefetcher.get_recipe(requirement.ref, self._recorder)
+            if result is None:
+                result = self._proxy.get_recipe(requirement.ref, check_updates, update,
+                                                remotes, self._recorder)
         except ConanException as e:
             if current_node.ref:
                 self._output.error("Failed requirement '%s' from '%s'"
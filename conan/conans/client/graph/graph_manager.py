@@ -8,6 +8,7 @@ from conans.client.graph.graph import BINARY_BUILD, Node,\
     RECIPE_CONSUMER, RECIPE_VIRTUAL, BINARY_EDITABLE
 from conans.client.graph.graph_binaries import GraphBinariesAnalyzer
 from conans.client.graph.graph_builder import DepsGraphBuilder
+from conans.client.graph.prefetcher import RecipePrefetcher
 from conans.client.loader import ProcessedProfile
 from conans.errors import ConanException, conanfile_exception_formatter
 from conans.model.conan_file import get_env_context_manager
@@ -214,7 +215,8 @@ class GraphManager(object):
                                              update, build_mode,
                                              remotes, profile_build_requires, recorder,
                                              processed_profile)
-                graph.nodes.update(subgraph.nodes)
+                for n in subgraph.nodes:
+                    graph.add_node(n)
 
             if new_profile_build_requires:
                 subgraph = builder.extend_build_requires(graph, node, new_profile_build_requires,
@@ -224,22 +226,33 @@ class GraphManager(object):
                                              update, build_mode,
                                              remotes, {}, recorder,
                                              processed_profile)
-                graph.nodes.update(subgraph.nodes)
+                for n in subgraph.nodes:
+                    graph.add_node(n)
 
     def _load_graph(self, root_node, check_updates, update, build_mode, remotes,
                     profile_build_requires, recorder, processed_profile, apply_build_requires):
 
         assert isinstance(build_mode, BuildMode)
+        parallel_download = self._cache.config.parallel_download
+        prefetcher = None
+        if parallel_download:
+            prefetcher = RecipePrefetcher(self._cache, self._output, self._remote_manager,
+                                          parallel_download)
         builder = DepsGraphBuilder(self._proxy, self._output, self._loader, self._resolver,
-                                   recorder)
-        graph = builder.load_graph(root_node, check_updates, update, remotes, processed_profile)
-        binaries_analyzer = GraphBinariesAnalyzer(self._cache, self._output,
-                                                  self._remote_manager)
-
-        self._recurse_build_requires(graph, builder, binaries_analyzer, check_updates, update,
-                                     build_mode, remotes,
-                                     profile_build_requires, recorder, processed_profile,
-                                     apply_build_requires=apply_build_requires)
+                                   recorder, prefetcher)
+        try:
+            graph = builder.load_graph(root_node, check_updates, update, remotes,
+                                       processed_profile)
+            binaries_analyzer = GraphBinariesAnalyzer(self._cache, self._output,
+                                                      self._remote_manager)
+
+            self._recurse_build_requires(graph, builder, binaries_analyzer, check_updates, update,
+                                         build_mode, remotes,
+                                         profile_build_requires, recorder, processed_profile,
+                                         apply_build_requires=apply_build_requires)
+        finally:
+            if prefetcher:
+                prefetcher.close()
 
         # Sort of closures, for linking order
         inverse_levels = {n: i for i, level in enumerate(graph.inverse_levels()) for n in level}
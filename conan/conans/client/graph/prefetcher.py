@@ -0,0 +1,61 @@
+import os
+from multiprocessing.pool import ThreadPool
+
+from conans.client.graph.proxy import ConanProxy
+from conans.client.output import BufferedOutput
+from conans.client.recorder.action_recorder import ActionRecorderBuffer
+from conans.util.log import logger
+
+
+class RecipePrefetcher(object):
+    """ Retrieves, through a bounded pool of threads, the recipes of the requirements that are
+    not yet in the local cache, while the DepsGraphBuilder keeps expanding the graph. The builder
+    consumes the results in the same order it would have requested them sequentially, and the
+    output and recorder actions of every retrieval are replayed at that moment, so the resulting
+    graph and output are the same as in the sequential expansion.
+    """
+    def __init__(self, cache, output, remote_manager, workers):
+        self._cache = cache
+        self._output = output
+        self._remote_manager = remote_manager
+        self._pool = ThreadPool(workers)
+        self._pending = {}  # {ConanFileReference: (AsyncResult, output buffer, recorder buffer)}
+
+    def _needs_retrieve(self, ref, check_updates):
+        if ref in self._pending or self._cache.installed_as_editable(ref):
+            return False
+        if check_updates:
+            return True
+        return not os.path.exists(self._cache.package_layout(ref).conanfile())
+
+    def prefetch(self, refs, check_updates, update, remotes):
+        for ref in refs:
+            if not self._needs_retrieve(ref, check_updates):
+                continue
+            logger.debug("GRAPH: prefetching recipe %s" % str(ref))
+            buffer_output = BufferedOutput(self._output)
+            buffer_recorder = ActionRecorderBuffer()
+            proxy = ConanProxy(self._cache, buffer_output, self._remote_manager)
+            async_result = self._pool.apply_async(proxy.get_recipe,
+                                                  (ref, check_updates, update, remotes,
+                                                   buffer_recorder))
+            self._pending[ref] = async_result, buffer_output, buffer_recorder
+
+    def get_recipe(self, ref, recorder):
+        """ returns the result of ConanProxy.get_recipe() for a prefetched reference, waiting for
+        it to finish if necessary, or None if the reference was not prefetched
+        """
+        pending = self._pending.pop(ref, None)
+        if pending is None:
+            return None
+        async_result, buffer_output, buffer_recorder = pending
+        async_result.wait()
+        buffer_output.replay()
+        buffer_recorder.replay(recorder)
+        return async_result.get()
+
+    def close(self):
+        # Not consumed results are discarded, the recipes will be already in the cache
+        self._pool.close()
+        self._pool.join()
+        self._pending.clear()
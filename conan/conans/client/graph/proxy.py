@@ -76,6 +76,8 @@ class ConanProxy(object):
         else:  # Requested different revision and with --update
             remote, new_ref = self._download_recipe(ref, output, remotes, selected_remote, recorder)
             status = RECIPE_DOWNLOADED
+            # Downloaded to the local cache, it could be in a lower cache before
+            conanfile_path = self._cache.package_layout(ref).conanfile()
             return conanfile_path, status, remote, new_ref
 
         try:  # get_recipe_manifest can fail, not in server
@@ -90,12 +92,12 @@ class ConanProxy(object):
         if upstream_manifest != read_manifest:
             if upstream_manifest.time > read_manifest.time:
                 if update:
-                    DiskRemover().remove_recipe(self._cache.package_layout(ref), output=output)
+                    DiskRemover().remove_recipe(self._cache.package_layout(ref).local(),
+                                                output=output)
                     output.info("Retrieving from remote '%s'..." % selected_remote.name)
                     self._download_recipe(ref, output, remotes, selected_remote, recorder)
-                    with self._cache.package_layout(ref).update_metadata() as metadata:
-                        metadata.recipe.remote = selected_remote.name
                     status = RECIPE_UPDATED
+                    conanfile_path = self._cache.package_layout(ref).conanfile()
                     return conanfile_path, status, selected_remote, ref
                 else:
                     status = RECIPE_UPDATEABLE
@@ -114,8 +116,6 @@ class ConanProxy(object):
             # If incomplete, resolve the latest in server
             _ref = self._remote_manager.get_recipe(ref, the_remote)
             output.info("Downloaded recipe revision %s" % _ref.revision)
-            with self._cache.package_layout(ref).update_metadata() as metadata:
-                metadata.recipe.remote = the_remote.name
             recorder.recipe_downloaded(ref, the_remote.url)
             return _ref
 
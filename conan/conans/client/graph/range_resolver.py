@@ -1,4 +1,5 @@
 import re
+from functools import cmp_to_key
 
 from conans.errors import ConanException
 from conans.model.ref import ConanFileReference
@@ -51,35 +52,115 @@ def _parse_versionexpr(versionexpr, result):
     return version_range, loose, include_prerelease
 
 
-def satisfying(list_versions, versionexpr, result):
-    """ returns the maximum version that satisfies the expression
-    if some version cannot be converted to loose SemVer, it is discarded with a msg
-    This provides some workaround for failing comparisons like "2.1" not matching "<=2.1"
-    """
-    from semver import SemVer, Range, max_satisfying
+# The caches are shared by all the resolutions of the process, and cleared when they are full
+_compiled_ranges = {}  # {versionexpr: (semver.Range, include_prerelease, parse messages)}
+_MAX_COMPILED_RANGES = 1024
+_parsed_versions = {}  # {(version, loose): semver.SemVer or None if it is not semver}
+_MAX_PARSED_VERSIONS = 100000
+_version_indexes = {}  # {(name, loose): (versions, _VersionIndex)}
+_MAX_VERSION_INDEXES = 256
 
-    version_range, loose, include_prerelease = _parse_versionexpr(versionexpr, result)
 
-    # Check version range expression
-    try:
-        act_range = Range(version_range, loose)
-    except ValueError:
-        raise ConanException("version range expression '%s' is not valid" % version_range)
+def _cache_set(cache, max_size, key, value):
+    if len(cache) >= max_size:
+        cache.clear()
+    cache[key] = value
+
+
+def _report(messages, result):
+    # result can be a list or an output object, both provide append()
+    for message in messages:
+        result.append(message)
 
-    # Validate all versions
-    candidates = {}
-    for v in list_versions:
+
+def _compile_range(versionexpr, result):
+    """ returns the semver.Range and the include_prerelease flag of a range expression, parsing
+    it only the first time it is used
+    """
+    compiled = _compiled_ranges.get(versionexpr)
+    if compiled is None:
+        from semver import Range
+        messages = []
+        version_range, loose, include_prerelease = _parse_versionexpr(versionexpr, messages)
+        # Check version range expression
+        try:
+            act_range = Range(version_range, loose)
+        except ValueError:
+            _report(messages, result)
+            raise ConanException("version range expression '%s' is not valid" % version_range)
+        compiled = act_range, include_prerelease, messages
+        _cache_set(_compiled_ranges, _MAX_COMPILED_RANGES, versionexpr, compiled)
+    act_range, include_prerelease, messages = compiled
+    _report(messages, result)
+    return act_range, include_prerelease
+
+
+def _parse_version(version, loose):
+    key = version, loose
+    try:
+        return _parsed_versions[key]
+    except KeyError:
+        from semver import SemVer
         try:
-            ver = SemVer(v, loose=loose)
-            candidates[ver] = v
+            ver = SemVer(version, loose=loose)
         except (ValueError, AttributeError):
-            result.append("WARN: Version '%s' is not semver, cannot be compared with a range"
-                          % str(v))
+            ver = None
+        _cache_set(_parsed_versions, _MAX_PARSED_VERSIONS, key, ver)
+        return ver
+
+
+class _VersionIndex(object):
+    """ The versions of a package, parsed once and sorted from the highest to the lowest one, so
+    the maximum version satisfying a range is the first one that satisfies it
+    """
+    def __init__(self, versions, loose):
+        self.invalid = []
+        parsed = []
+        for v in versions:
+            ver = _parse_version(v, loose)
+            if ver is None:
+                self.invalid.append(v)
+            else:
+                parsed.append((ver, v))
+        # Sorting is stable also in reverse, among equal versions the first one is preferred
+        parsed.sort(key=cmp_to_key(lambda a, b: a[0].compare(b[0])), reverse=True)
+        self._sorted = parsed
+
+    def max_satisfying(self, act_range, include_prerelease):
+        for ver, v in self._sorted:
+            if act_range.test(ver, include_prerelease=include_prerelease):
+                return v
+
+
+def _version_index(name, versions, loose):
+    """ The _VersionIndex of the versions, reused for the same name while they don't change
+    """
+    if name is None:
+        return _VersionIndex(versions, loose)
+    key = name, loose
+    entry = _version_indexes.get(key)
+    # The same versions object is not compared again, i.e. the ones found in a remote
+    if entry is None or (entry[0] is not versions and entry[0] != versions):
+        entry = versions, _VersionIndex(versions, loose)
+        _cache_set(_version_indexes, _MAX_VERSION_INDEXES, key, entry)
+    return entry[1]
+
+
+def satisfying(list_versions, versionexpr, result, name=None):
+    """ returns the maximum version that satisfies the expression
+    if some version cannot be converted to loose SemVer, it is discarded with a msg
+    This provides some workaround for failing comparisons like "2.1" not matching "<=2.1"
+    @param name: identifies the list_versions, to sort them only once while they don't change.
+    They must not be modified after the call, a different object has to be passed instead
+    """
+    act_range, include_prerelease = _compile_range(versionexpr, result)
+    index = _version_index(name, list_versions, act_range.loose)
+    for v in index.invalid:
+        result.append("WARN: Version '%s' is not semver, cannot be compared with a range"
+                      % str(v))
 
     # Search best matching version in range
-    result = max_satisfying(candidates, act_range, loose=loose,
-                            include_prerelease=include_prerelease)
-    return candidates.get(result)
+    return index.max_satisfying(act_range, include_prerelease)
 
 
 class RangeResolver(object):
@@ -103,7 +184,7 @@ class RangeResolver(object):
 
         if require.is_resolved:
             ref = require.ref
-            resolved_ref = self._resolve_version(version_range, [ref])
+            resolved_ref = self._resolve_version(version_range, self._versions([ref]))
             if not resolved_ref:
                 raise ConanException("Version range '%s' required by '%s' not valid for "
                                      "downstream requirement '%s'"
@@ -119,11 +200,11 @@ class RangeResolver(object):
         search_ref = str(ConanFileReference(ref.name, "*", ref.user, ref.channel))
 
         if update:
-            resolved_ref = (self._resolve_remote(search_ref, version_range, remotes) or
+            resolved_ref = (self._resolve_remote(search_ref, version_range, remotes, update) or
                             self._resolve_local(search_ref, version_range))
         else:
             resolved_ref = (self._resolve_local(search_ref, version_range) or
-                            self._resolve_remote(search_ref, version_range, remotes))
+                            self._resolve_remote(search_ref, version_range, remotes, update))
 
         if resolved_ref:
             self._result.append("Version range '%s' required by '%s' resolved to '%s'"
@@ -136,36 +217,54 @@ class RangeResolver(object):
     def _resolve_local(self, search_ref, version_range):
         local_found = search_recipes(self._cache, search_ref)
         if local_found:
-            return self._resolve_version(version_range, local_found)
+            return self._resolve_version(version_range, self._versions(local_found),
+                                         name=(search_ref, ))
+
+    def _search_remote(self, remote, pattern, update):
+        search_cache = self._cache.remote_search_cache
+        if not update:
+            search_result = search_cache.get(remote, pattern)
+            if search_result is not None:
+                return search_result
+        search_result = self._remote_manager.search_recipes(remote, pattern, ignorecase=False)
+        search_cache.set(remote, pattern, search_result)
+        return search_result
 
-    def search_remotes(self, pattern, remotes):
+    def search_remotes(self, pattern, remotes, update=False):
         remote = remotes.selected
         if remote:
-            search_result = self._remote_manager.search_recipes(remote, pattern, ignorecase=False)
+            search_result = self._search_remote(remote, pattern, update)
             return search_result
 
         for remote in remotes.values():
-            search_result = self._remote_manager.search_recipes(remote, pattern, ignorecase=False)
+            search_result = self._search_remote(remote, pattern, update)
             if search_result:
                 return search_result
 
-    def _resolve_remote(self, search_ref, version_range, remotes):
+    def _resolve_remote(self, search_ref, version_range, remotes, update):
         remote = remotes.selected
         remote_name = remote.name if remote else None
         remote_cache = self._cached_remote_found.setdefault(remote_name, {})
         # We should use ignorecase=False, we want the exact case!
         remote_found = remote_cache.get(search_ref)
         if remote_found is None:
-            remote_found = self.search_remotes(search_ref, remotes)
+            remote_found = self.search_remotes(search_ref, remotes, update)
             # We don't want here to resolve the revision that should be done in the proxy
             # as any other regular flow
-            remote_found = [ref.copy_clear_rev() for ref in remote_found or []]
-            # Empty list, just in case it returns None
+            remote_found = self._versions(ref.copy_clear_rev() for ref in remote_found or [])
+            # Empty dict, just in case it returns None
             remote_cache[search_ref] = remote_found
         if remote_found:
-            return self._resolve_version(version_range, remote_found)
-
-    def _resolve_version(self, version_range, refs_found):
-        versions = {ref.version: ref for ref in refs_found}
-        result = satisfying(versions, version_range, self._result)
+            return self._resolve_version(version_range, remote_found,
+                                         name=(search_ref, remote_name))
+
+    @staticmethod
+    def _versions(refs_found):
+        return {ref.version: ref for ref in refs_found}
+
+    def _resolve_version(self, version_range, versions, name=None):
+        """ The reference of the {version: ref} versions satisfying the range, the name
+        identifies them to reuse their index while they don't change
+        """
+        result = satisfying(versions, version_range, self._result, name)
         return versions.get(result)
@@ -44,7 +44,7 @@ class HookManager(object):
     def create_default_hooks(self):
         save(self._attribute_checker_path, attribute_checker_hook)
 
-    def execute(self, method_name, **kwargs):
+    def execute(self, method_name, output=None, **kwargs):
         if not os.path.exists(self._attribute_checker_path):
             self.create_default_hooks()
         if not self.hooks:
@@ -54,8 +54,9 @@ class HookManager(object):
             "Method '{}' not in valid hooks methods".format(method_name)
         for name, method in self.hooks[method_name]:
             try:
-                output = ScopedOutput("[HOOK - %s] %s()" % (name, method_name), self.output)
-                method(output=output, **kwargs)
+                scoped_output = ScopedOutput("[HOOK - %s] %s()" % (name, method_name),
+                                             output or self.output)
+                method(output=scoped_output, **kwargs)
             except Exception as e:
                 raise ConanException("[HOOK - %s] %s(): %s\n%s" % (name, method_name, str(e),
                                                                    traceback.format_exc()))
@@ -1,6 +1,13 @@
+import multiprocessing
 import os
+import pickle
 import shutil
+import sys
 import time
+from multiprocessing.pool import ThreadPool
+
+import six
+from six import StringIO
 
 from conans.client import tools
 from conans.client.file_copier import report_copied_files
@@ -8,9 +15,10 @@ from conans.client.generators import TXTGenerator, write_generators
 from conans.client.graph.graph import BINARY_BUILD, BINARY_CACHE, BINARY_DOWNLOAD, BINARY_MISSING, \
     BINARY_SKIP, BINARY_UPDATE, BINARY_EDITABLE
 from conans.client.importer import remove_imports, run_imports
+from conans.client.output import BufferedOutput, ScopedOutput
 from conans.client.packager import create_package
-from conans.client.recorder.action_recorder import INSTALL_ERROR_BUILDING, INSTALL_ERROR_MISSING, \
-    INSTALL_ERROR_MISSING_BUILD_FOLDER
+from conans.client.recorder.action_recorder import ActionRecorderBuffer, INSTALL_ERROR_BUILDING, \
+    INSTALL_ERROR_MISSING, INSTALL_ERROR_MISSING_BUILD_FOLDER
 from conans.client.source import complete_recipe_sources, config_source
 from conans.client.tools.env import pythonpath
 from conans.errors import (ConanException, ConanExceptionInUserConanfileMethod,
@@ -19,12 +27,15 @@ from conans.model.build_info import CppInfo
 from conans.model.conan_file import get_env_context_manager
 from conans.model.editable_layout import EditableLayout
 from conans.model.env_info import EnvInfo
+from conans.model.info import ConanInfo
 from conans.model.manifest import FileTreeManifest
 from conans.model.ref import PackageReference
 from conans.model.user_info import UserInfo
 from conans.paths import BUILD_INFO, CONANINFO, RUN_LOG_NAME
 from conans.util.env_reader import get_env
-from conans.util.files import (clean_dirty, is_dirty, make_read_only, mkdir, rmdir, save, set_dirty)
+from conans.util.files import (clean_dirty, is_dirty, make_read_only, mkdir, rmdir, save, set_dirty,
+                               touch)
+from conans.util.fork import acquire_fork_locks, release_fork_locks
 from conans.util.log import logger
 from conans.util.tracer import log_package_built, log_package_got_from_local_cache
 
@@ -159,10 +170,14 @@ class _PackageBuilder(object):
         # Update package metadata
         package_hash = package_layout.package_summary_hash(pref)
         self._output.info("Created package revision %s" % package_hash)
+        info = ConanInfo.load_from_package(package_folder)
         with package_layout.update_metadata() as metadata:
             metadata.packages[package_id].revision = package_hash
             metadata.packages[package_id].recipe_revision = pref.ref.revision
+            metadata.packages[package_id].set_info(info)
 
+        if self._cache.blob_store:
+            self._cache.blob_store.link_package(package_folder)
         if get_env("CONAN_READ_ONLY_CACHE", False):
             make_read_only(package_folder)
         # FIXME: Conan 2.0 Clear the registry entry (package ref)
@@ -177,16 +192,18 @@ class _PackageBuilder(object):
         package_layout = self._cache.package_layout(pref.ref, conanfile.short_paths)
         source_folder = package_layout.source()
         conanfile_path = package_layout.conanfile()
-        package_folder = package_layout.package(pref)
+        package_folder = package_layout.local().package(pref)
 
         build_folder, skip_build = self._get_build_folder(conanfile, package_layout,
                                                           pref, keep_build, recorder)
         # PREPARE SOURCES
         if not skip_build:
             with package_layout.conanfile_write_lock(self._output):
+                package_layout.copy_up()
                 set_dirty(build_folder)
                 self._prepare_sources(conanfile, pref, package_layout, conanfile_path, source_folder,
                                       build_folder, remotes)
+                _touch_folder(source_folder)  # Last use for the cache GC
 
         # BUILD & PACKAGE
         with package_layout.conanfile_read_lock(self._output):
@@ -224,6 +241,13 @@ class _PackageBuilder(object):
             return node.pref
 
 
+def _touch_folder(folder):
+    try:
+        touch(folder)
+    except OSError:
+        pass
+
+
 def _remove_folder_raising(folder):
     try:
         rmdir(folder)
@@ -287,6 +311,128 @@ Or read "http://docs.conan.io/en/latest/faq/troubleshooting.html#error-missing-p
 ''' % (ref, ref.name))
 
 
+def _fork_context():
+    # Python 2 multiprocessing always forks in posix systems
+    return multiprocessing.get_context("fork") if six.PY3 else multiprocessing
+
+
+class _BuildProcess(object):
+    """ Builds the package of a node in a forked process, so the node and the rest of the state
+    of the installation don't need to be serialized, only the result is sent back
+    """
+    def __init__(self, node):
+        self.node = node
+        self.result = None
+        self._process = None
+        self._connection = None
+
+    def start(self, build_function, keep_build, remotes):
+        context = _fork_context()
+        self._connection, child_connection = context.Pipe(duplex=False)
+
+        def _run():
+            release_fork_locks()
+            child_connection.send(build_function(self.node, keep_build, remotes))
+            child_connection.close()
+
+        self._process = context.Process(target=_run)
+        # The download threads keep running, they must not hold any lock while forking
+        acquire_fork_locks()
+        try:
+            self._process.start()
+        finally:
+            release_fork_locks()
+        child_connection.close()
+
+    def finished(self, timeout):
+        if self._connection.poll(timeout):
+            try:
+                self.result = self._connection.recv()
+            except EOFError:  # The process died without sending anything
+                msg = "The build process of '%s' terminated unexpectedly" % str(self.node.ref)
+                self.result = None, ConanException(msg), "", []
+            self._connection.close()
+            self._process.join()
+            return True
+        return False
+
+
+class _ParallelBuilds(object):
+    """ Builds the packages of the nodes in up to 'workers' concurrent processes. The builds are
+    started as the previous ones finish, every time schedule() is called, so the caller can keep
+    installing other nodes meanwhile
+    """
+    def __init__(self, nodes, workers, build_function, keep_build, remotes):
+        self._pending = list(nodes)
+        self._running = []
+        self._workers = workers
+        self._build_function = build_function
+        self._keep_build = keep_build
+        self._remotes = remotes
+        self.processes = []  # In the order of the nodes
+
+    def schedule(self, timeout=0):
+        self._running = [process for process in self._running
+                         if not process.finished(timeout=timeout)]
+        while self._pending and len(self._running) < self._workers:
+            process = _BuildProcess(self._pending.pop(0))
+            process.start(self._build_function, self._keep_build, self._remotes)
+            self._running.append(process)
+            self.processes.append(process)
+
+    def wait(self):
+        while self._pending or self._running:
+            self.schedule(timeout=0.1)
+
+
+class _PackageDownloader(object):
+    """ Retrieves, through a bounded pool of threads, the binaries of all the nodes that have to be
+    downloaded or updated, while the installer keeps processing the graph level by level, so the
+    downloads and the builds overlap. The output and recorder actions of every download are
+    replayed when the installer reaches its node, as in the sequential installation
+    """
+    def __init__(self, download_function, output, workers):
+        self._download_function = download_function
+        self._output = output
+        self._pool = ThreadPool(workers)
+        self._pending = {}  # {PackageReference: (AsyncResult, output buffer, recorder buffer)}
+
+    def download(self, nodes):
+        for node in nodes:
+            pref = node.pref
+            if pref in self._pending:
+                continue
+            logger.debug("INSTALLER: downloading package %s" % repr(pref))
+            buffer_output = BufferedOutput(self._output)
+            buffer_recorder = ActionRecorderBuffer()
+            async_result = self._pool.apply_async(self._download_function,
+                                                  (node,
+                                                   ScopedOutput(node.conanfile.output.scope,
+                                                                buffer_output),
+                                                   buffer_recorder))
+            self._pending[pref] = async_result, buffer_output, buffer_recorder
+
+    def get_package(self, pref, recorder):
+        """ waits for the download of the package to finish, if it was requested, replaying its
+        output and recorded actions. Returns False if the package was not requested
+        """
+        pending = self._pending.pop(pref, None)
+        if pending is None:
+            return False
+        async_result, buffer_output, buffer_recorder = pending
+        async_result.wait()
+        buffer_output.replay()
+        buffer_recorder.replay(recorder)
+        async_result.get()  # Raises the error of the download, if any
+        return True
+
+    def close(self):
+        # Not consumed downloads (due to a previous error) are discarded
+        self._pool.close()
+        self._pool.join()
+        self._pending.clear()
+
+
 class BinaryInstaller(object):
     """ main responsible of retrieving binary packages or building them from source
     locally in case they are not found in remotes
@@ -297,18 +443,35 @@ class BinaryInstaller(object):
         self._remote_manager = remote_manager
         self._recorder = recorder
         self._hook_manager = hook_manager
+        self._downloader = None
 
     def install(self, deps_graph, remotes, keep_build=False, graph_info=None):
         # order by levels and separate the root node (ref=None) from the rest
         nodes_by_level = deps_graph.by_levels()
         root_level = nodes_by_level.pop()
         root_node = root_level[0]
-        # Get the nodes in order and if we have to build them
-        self._build(nodes_by_level, keep_build, root_node, graph_info, remotes)
+        parallel_download = self._cache.config.parallel_download
+        if parallel_download:
+            self._downloader = _PackageDownloader(self._download_package_locked, self._out,
+                                                  parallel_download)
+            self._downloader.download([node for level in nodes_by_level for node in level
+                                       if node.binary in (BINARY_DOWNLOAD, BINARY_UPDATE)])
+        try:
+            # Get the nodes in order and if we have to build them
+            self._build(nodes_by_level, keep_build, root_node, graph_info, remotes)
+        finally:
+            if self._downloader:
+                self._downloader.close()
+                self._downloader = None
 
     def _build(self, nodes_by_level, keep_build, root_node, graph_info, remotes):
         processed_package_refs = set()
+        parallel_builds = self._parallel_builds()
         for level in nodes_by_level:
+            # Nodes of the same level are independent, their builds can run concurrently
+            parallel_nodes = []
+            cache_nodes = []
+            deferred_nodes = []  # Nodes that need the packages being built in parallel
             for node in level:
                 ref, conan_file = node.ref, node.conanfile
                 output = conan_file.output
@@ -326,11 +489,98 @@ class BinaryInstaller(object):
                         continue
                     assert ref.revision is not None, "Installer should receive RREV always"
                     _handle_system_requirements(conan_file, node.pref, self._cache, output)
+                    pref = node.pref
+                    if parallel_builds and node.binary == BINARY_BUILD and \
+                            pref not in processed_package_refs:
+                        processed_package_refs.add(pref)
+                        parallel_nodes.append(node)
+                        deferred_nodes.append(node)
+                    elif any(n.pref == pref for n in parallel_nodes):
+                        deferred_nodes.append(node)
+                    else:
+                        cache_nodes.append(node)
+
+            if parallel_nodes:
+                builds = _ParallelBuilds(parallel_nodes, parallel_builds,
+                                         self._build_node_process, keep_build, remotes)
+                builds.schedule()
+                # The rest of nodes of the level are installed while the packages are building
+                for node in cache_nodes:
                     self._handle_node_cache(node, keep_build, processed_package_refs, remotes)
+                    builds.schedule()
+                builds.wait()
+                self._apply_builds(builds.processes)
+                # Already built, with the PREV assigned
+                processed_package_refs.update(n.pref for n in parallel_nodes)
+            else:
+                for node in cache_nodes:
+                    self._handle_node_cache(node, keep_build, processed_package_refs, remotes)
+            for node in deferred_nodes:
+                self._handle_node_cache(node, keep_build, processed_package_refs, remotes)
 
         # Finally, propagate information to root node (ref=None)
         self._propagate_info(root_node)
 
+    def _parallel_builds(self):
+        parallel_builds = self._cache.config.parallel_builds
+        if parallel_builds and parallel_builds > 1:
+            if hasattr(os, "fork"):
+                return parallel_builds
+            self._out.warn("Parallel builds are not supported in this platform, "
+                           "packages will be built sequentially")
+        return None
+
+    def _apply_builds(self, processes):
+        """ applies the output and the recorded actions of the finished build processes, in the
+        same order of their nodes, raising the error of the first failing node
+        """
+        error = None
+        for process in processes:
+            prev, exc, output, recorder_calls = process.result
+            self._out.write(output)
+            ActionRecorderBuffer(recorder_calls).replay(self._recorder)
+            if exc is not None:
+                error = error or exc
+            else:
+                process.node.prev = prev
+        if error is not None:
+            raise error
+
+    def _build_node_process(self, node, keep_build, remotes):
+        """ builds the package of the node, to be run in a forked process. Everything printed is
+        captured and returned, together with the recorded actions, so the parent can apply them
+        """
+        # The threads of the parent don't exist in this process
+        self._downloader = None
+        self._remote_manager.after_fork()
+        buffer_stream = StringIO()
+        conanfile = node.conanfile
+        for output in (self._out, conanfile.output):
+            output._stream = output._stream_err = buffer_stream
+        runner = getattr(conanfile, "_conan_runner", None)
+        if runner is not None:
+            runner._output = buffer_stream
+        sys.stdout = sys.stderr = buffer_stream
+        recorder = ActionRecorderBuffer()
+        self._recorder = recorder
+
+        pref = node.pref
+        package_layout = self._cache.package_layout(pref.ref, conanfile.short_paths)
+        package_folder = package_layout.local().package(pref)
+        exc = None
+        try:
+            with self._cache.package_layout(pref.ref).package_lock(pref):
+                set_dirty(package_folder)
+                self._build_package(node, pref, conanfile.output, keep_build, remotes)
+                clean_dirty(package_folder)
+        except Exception as e:
+            exc = e
+            try:
+                pickle.dumps(exc)
+            except Exception:
+                exc = ConanException(str(e))
+        return node.prev, exc, buffer_stream.getvalue(), recorder.calls
+
     def _node_concurrently_installed(self, node, package_folder):
         if node.binary == BINARY_DOWNLOAD and os.path.exists(package_folder):
             return True
@@ -378,7 +628,13 @@ class BinaryInstaller(object):
 
         conanfile = node.conanfile
         output = conanfile.output
-        package_folder = self._cache.package_layout(pref.ref, conanfile.short_paths).package(pref)
+        package_layout = self._cache.package_layout(pref.ref, conanfile.short_paths)
+        # Built and downloaded in the local cache, but used from the lower caches if already there
+        package_folder = package_layout.local().package(pref)
+
+        # The download might have been done already by the downloader, under the package lock
+        downloaded = self._downloader is not None and \
+            self._downloader.get_package(pref, self._recorder)
 
         with self._cache.package_layout(pref.ref).package_lock(pref):
             if pref not in processed_package_references:
@@ -392,30 +648,41 @@ class BinaryInstaller(object):
                     assert pref.revision is not None, "PREV for %s to be built is None" % str(pref)
                 elif node.binary in (BINARY_UPDATE, BINARY_DOWNLOAD):
                     assert node.prev, "PREV for %s is None" % str(pref)
-                    if not self._node_concurrently_installed(node, package_folder):
-                        set_dirty(package_folder)
-                        assert pref.revision is not None, "Installer should receive #PREV always"
-                        self._remote_manager.get_package(pref, package_folder,
-                                                         node.binary_remote, output,
-                                                         self._recorder)
-                        output.info("Downloaded package revision %s" % pref.revision)
-                        with self._cache.package_layout(pref.ref).update_metadata() as metadata:
-                            metadata.packages[pref.id].remote = node.binary_remote.name
-                        clean_dirty(package_folder)
-                    else:
-                        output.success('Download skipped. Probable concurrent download')
-                        log_package_got_from_local_cache(pref)
-                        self._recorder.package_fetched_from_cache(pref)
+                    if not downloaded:
+                        self._download_package(node, package_folder, output, self._recorder)
                 elif node.binary == BINARY_CACHE:
                     assert node.prev, "PREV for %s is None" % str(pref)
                     output.success('Already installed!')
+                    _touch_folder(package_folder)  # Last use for the cache GC
                     log_package_got_from_local_cache(pref)
                     self._recorder.package_fetched_from_cache(pref)
 
             # Call the info method
-            self._call_package_info(conanfile, package_folder, ref=pref.ref)
+            self._call_package_info(conanfile, package_layout.package(pref), ref=pref.ref)
             self._recorder.package_cpp_info(pref, conanfile.cpp_info)
 
+    def _download_package(self, node, package_folder, output, recorder):
+        pref = node.pref
+        if not self._node_concurrently_installed(node, package_folder):
+            set_dirty(package_folder)
+            assert pref.revision is not None, "Installer should receive #PREV always"
+            self._remote_manager.get_package(pref, package_folder, node.binary_remote, output,
+                                             recorder)
+            output.info("Downloaded package revision %s" % pref.revision)
+            with self._cache.package_layout(pref.ref).update_metadata() as metadata:
+                metadata.packages[pref.id].remote = node.binary_remote.name
+            clean_dirty(package_folder)
+        else:
+            output.success('Download skipped. Probable concurrent download')
+            log_package_got_from_local_cache(pref)
+            recorder.package_fetched_from_cache(pref)
+
+    def _download_package_locked(self, node, output, recorder):
+        pref = node.pref
+        layout = self._cache.package_layout(pref.ref, node.conanfile.short_paths)
+        with self._cache.package_layout(pref.ref).package_lock(pref):
+            self._download_package(node, layout.local().package(pref), output, recorder)
+
     def _build_package(self, node, pref, output, keep_build, remotes):
         conanfile = node.conanfile
         assert pref.id, "Package-ID without value"
@@ -1,6 +1,7 @@
 import os
 
 from conans.client.cache.cache import ClientCache
+from conans.client.cmd.cache_gc import cache_gc, parse_age, parse_size
 from conans.client.generators import write_generators
 from conans.client.graph.graph import RECIPE_CONSUMER, RECIPE_VIRTUAL
 from conans.client.graph.printer import print_graph
@@ -117,3 +118,11 @@ class ConanManager(object):
                 deploy_conanfile = neighbours[0].conanfile
                 if hasattr(deploy_conanfile, "deploy") and callable(deploy_conanfile.deploy):
                     run_deploy(deploy_conanfile, install_folder)
+
+        max_size, max_age = self._cache.config.cache_max_size, self._cache.config.cache_max_age
+        if max_size or max_age:
+            keep = [(node.ref, node.package_id) for node in deps_graph.nodes
+                    if node.recipe not in (RECIPE_CONSUMER, RECIPE_VIRTUAL)]
+            cache_gc(self._cache, self._user_io.out,
+                     max_size=parse_size(max_size) if max_size else None,
+                     max_age=parse_age(max_age) if max_age else None, keep=keep)
@@ -2,6 +2,7 @@ import os
 import six
 import sys
 from colorama import Fore, Style
+from six import StringIO
 
 from conans.util.env_reader import get_env
 from conans.util.files import decode_text
@@ -146,3 +147,16 @@ class ScopedOutput(ConanOutput):
                                         newline=False, error=error)
         super(ScopedOutput, self).write("%s" % data, front=Color.BRIGHT_WHITE, back=back,
                                         newline=newline, error=error)
+
+
+class BufferedOutput(ConanOutput):
+    """ Output that stores everything written to it, so the output of the tasks executed
+    concurrently in a pool of threads can be written later to the real output with replay(), in a
+    deterministic order
+    """
+    def __init__(self, output):
+        super(BufferedOutput, self).__init__(StringIO(), color=output._color)
+        self._output = output
+
+    def replay(self):
+        self._output.write(self._stream.getvalue())
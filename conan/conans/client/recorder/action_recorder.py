@@ -191,3 +191,23 @@ class ActionRecorder(object):
             ret["installed"].append(tmp)
 
         return ret
+
+
+class ActionRecorderBuffer(object):
+    """ Stores the calls done to the ActionRecorder from a worker thread or process, so they can be
+    replayed later in the real one, keeping the order of the recorded actions deterministic
+    """
+    def __init__(self, calls=None):
+        self.calls = calls if calls is not None else []
+
+    def __getattr__(self, name):
+        if name.startswith("__"):
+            raise AttributeError(name)
+
+        def _record(*args, **kwargs):
+            self.calls.append((name, args, kwargs))
+        return _record
+
+    def replay(self, recorder):
+        for name, args, kwargs in self.calls:
+            getattr(recorder, name)(*args, **kwargs)
@@ -10,6 +10,8 @@ from conans.client.cache.remote_registry import Remote
 from conans.client.source import merge_directories
 from conans.errors import ConanConnectionError, ConanException, NotFoundException, \
     NoRestV2Available, PackageNotFoundException
+from conans.model.info import ConanInfo
+from conans.model.manifest import FileTreeManifest
 from conans.paths import EXPORT_SOURCES_DIR_OLD, \
     EXPORT_SOURCES_TGZ_NAME, EXPORT_TGZ_NAME, PACKAGE_TGZ_NAME, rm_conandir
 from conans.search.search import filter_packages
@@ -32,6 +34,16 @@ class RemoteManager(object):
         self._auth_manager = auth_manager
         self._hook_manager = hook_manager
 
+    def after_fork(self):
+        """ To be called in a forked child process before using the remotes
+        """
+        self._auth_manager.after_fork()
+
+    def close(self):
+        """ Releases the threads used to transfer the files, once the command finished
+        """
+        self._auth_manager.close()
+
     def check_credentials(self, remote):
         self._call_remote(remote, "check_credentials")
 
@@ -44,16 +56,18 @@ class RemoteManager(object):
         assert pref.revision, "get_package_snapshot requires PREV"
         return self._call_remote(remote, "get_package_snapshot", pref)
 
-    def upload_recipe(self, ref, files_to_upload, deleted, remote, retry, retry_wait):
+    def upload_recipe(self, ref, files_to_upload, deleted, remote, retry, retry_wait,
+                      output=None):
         assert ref.revision, "upload_recipe requires RREV"
         self._call_remote(remote, "upload_recipe", ref, files_to_upload, deleted,
-                          retry, retry_wait)
+                          retry, retry_wait, output)
 
-    def upload_package(self, pref, files_to_upload, deleted, remote, retry, retry_wait):
+    def upload_package(self, pref, files_to_upload, deleted, remote, retry, retry_wait,
+                       output=None):
         assert pref.ref.revision, "upload_package requires RREV"
         assert pref.revision, "upload_package requires PREV"
         self._call_remote(remote, "upload_package", pref,
-                          files_to_upload, deleted, retry, retry_wait)
+                          files_to_upload, deleted, retry, retry_wait, output)
 
     def get_recipe_manifest(self, ref, remote):
         ref = self._resolve_latest_ref(ref, remote)
@@ -69,6 +83,13 @@ class RemoteManager(object):
         pref = self._resolve_latest_pref(pref, remote)
         return self._call_remote(remote, "get_package_info", pref), pref
 
+    def get_packages_info(self, prefs, remote):
+        """ Read the ConanInfo and the manifest of many packages, of their latest revision unless
+        given, with a single request. Returns {pref: (info, manifest, pref with revisions)} of the
+        existing ones, or None if the remote doesn't support it
+        """
+        return self._call_remote(remote, "get_packages_info", prefs)
+
     def get_recipe(self, ref, remote):
         """
         Read the conans from remotes
@@ -77,7 +98,7 @@ class RemoteManager(object):
         returns (dict relative_filepath:abs_path , remote_name)"""
 
         self._hook_manager.execute("pre_download_recipe", reference=ref, remote=remote)
-        dest_folder = self._cache.package_layout(ref).export()
+        dest_folder = self._cache.package_layout(ref).local().export()
         rmdir(dest_folder)
 
         ref = self._resolve_latest_ref(ref, remote)
@@ -87,7 +108,9 @@ class RemoteManager(object):
         duration = time.time() - t1
         log_recipe_download(ref, duration, remote.name, zipped_files)
 
-        unzip_and_get_files(zipped_files, dest_folder, EXPORT_TGZ_NAME, output=self._output)
+        keep_tgz = get_env("CONAN_KEEP_DOWNLOADED_ARCHIVES", False)
+        unzip_and_get_files(zipped_files, dest_folder, EXPORT_TGZ_NAME, output=self._output,
+                            keep_tgz=keep_tgz)
         # Make sure that the source dir is deleted
         package_layout = self._cache.package_layout(ref)
         rm_conandir(package_layout.source())
@@ -96,6 +119,10 @@ class RemoteManager(object):
 
         with package_layout.update_metadata() as metadata:
             metadata.recipe.revision = ref.revision
+            metadata.recipe.remote = remote.name
+            if keep_tgz:
+                summary_hash = FileTreeManifest.load(dest_folder).summary_hash
+                metadata.recipe.archives = {EXPORT_TGZ_NAME: summary_hash}
 
         self._hook_manager.execute("post_download_recipe", conanfile_path=conanfile_path,
                                    reference=ref, remote=remote)
@@ -114,8 +141,13 @@ class RemoteManager(object):
         duration = time.time() - t1
         log_recipe_sources_download(ref, duration, remote.name, zipped_files)
 
+        keep_tgz = get_env("CONAN_KEEP_DOWNLOADED_ARCHIVES", False)
         unzip_and_get_files(zipped_files, export_sources_folder, EXPORT_SOURCES_TGZ_NAME,
-                            output=self._output)
+                            output=self._output, keep_tgz=keep_tgz)
+        if keep_tgz:
+            summary_hash = FileTreeManifest.load(export_folder).summary_hash
+            with self._cache.package_layout(ref).update_metadata() as metadata:
+                metadata.recipe.archives[EXPORT_SOURCES_TGZ_NAME] = summary_hash
         # REMOVE in Conan 2.0
         c_src_path = os.path.join(export_sources_folder, EXPORT_SOURCES_DIR_OLD)
         if os.path.exists(c_src_path):
@@ -136,15 +168,27 @@ class RemoteManager(object):
             snapshot = self._call_remote(remote, "get_package_snapshot", pref)
             if not is_package_snapshot_complete(snapshot):
                 raise PackageNotFoundException(pref)
-            zipped_files = self._call_remote(remote, "get_package", pref, dest_folder)
+            blob_store = self._cache.blob_store
+            # The files already in the store are linked instead of extracted
+            link_source = blob_store.link_source(dest_folder) if blob_store else None
+            zipped_files = self._call_remote(remote, "get_package", pref, dest_folder, link_source)
+            keep_tgz = get_env("CONAN_KEEP_DOWNLOADED_ARCHIVES", False)
 
+            info = ConanInfo.load_from_package(dest_folder)
             with self._cache.package_layout(pref.ref).update_metadata() as metadata:
                 metadata.packages[pref.id].revision = pref.revision
                 metadata.packages[pref.id].recipe_revision = pref.ref.revision
+                metadata.packages[pref.id].set_info(info)
+                if keep_tgz:
+                    summary_hash = FileTreeManifest.load(dest_folder).summary_hash
+                    metadata.packages[pref.id].archives = {PACKAGE_TGZ_NAME: summary_hash}
 
             duration = time.time() - t1
             log_package_download(pref, duration, remote, zipped_files)
-            unzip_and_get_files(zipped_files, dest_folder, PACKAGE_TGZ_NAME, output=self._output)
+            unzip_and_get_files(zipped_files, dest_folder, PACKAGE_TGZ_NAME, output=self._output,
+                                keep_tgz=keep_tgz, link_source=link_source)
+            if blob_store:
+                blob_store.link_package(dest_folder)
             # Issue #214 https://github.com/conan-io/conan/issues/214
             touch_folder(dest_folder)
             if get_env("CONAN_READ_ONLY_CACHE", False):
@@ -267,23 +311,25 @@ def check_compressed_files(tgz_name, files):
                                  "Please upgrade conan client." % f)
 
 
-def unzip_and_get_files(files, destination_dir, tgz_name, output):
+def unzip_and_get_files(files, destination_dir, tgz_name, output, keep_tgz=False,
+                        link_source=None):
     """Moves all files from package_files, {relative_name: tmp_abs_path}
     to destination_dir, unzipping the "tgz_name" if found"""
 
     tgz_file = files.pop(tgz_name, None)
     check_compressed_files(tgz_name, files)
     if tgz_file:
-        uncompress_file(tgz_file, destination_dir, output=output)
-        os.remove(tgz_file)
+        uncompress_file(tgz_file, destination_dir, output=output, link_source=link_source)
+        if not keep_tgz:
+            os.remove(tgz_file)
 
 
-def uncompress_file(src_path, dest_folder, output):
+def uncompress_file(src_path, dest_folder, output, link_source=None):
     t1 = time.time()
     try:
         with progress_bar.open_binary(src_path, desc="Decompressing %s" % os.path.basename(src_path),
                                       output=output) as file_handler:
-            tar_extract(file_handler, dest_folder)
+            tar_extract(file_handler, dest_folder, link_source=link_source)
     except Exception as e:
         error_msg = "Error while downloading/extracting files to %s\n%s\n" % (dest_folder, str(e))
         # try to remove the files
@@ -4,7 +4,7 @@ from conans.client.cache.remote_registry import Remote
 from conans.errors import ConanException, PackageNotFoundException, RecipeNotFoundException
 from conans.errors import NotFoundException
 from conans.model.ref import ConanFileReference, PackageReference
-from conans.paths import SYSTEM_REQS, rm_conandir
+from conans.paths import MANIFEST_STAT_CACHE, PACKAGES_FOLDER, SYSTEM_REQS, rm_conandir
 from conans.search.search import filter_outdated, search_packages, search_recipes
 from conans.util.log import logger
 
@@ -69,6 +69,8 @@ class DiskRemover(object):
                              "package folder:%s" % package)
             self._remove(path, package_layout.ref, "packages")
             self._remove_file(package_layout.system_reqs(), package_layout.ref, SYSTEM_REQS)
+            self._remove(os.path.join(package_layout.base_folder(), MANIFEST_STAT_CACHE,
+                                      PACKAGES_FOLDER), package_layout.ref, "stat caches")
         else:
             for id_ in ids_filter:  # remove just the specified packages
                 pref = PackageReference(package_layout.ref, id_)
@@ -79,6 +81,8 @@ class DiskRemover(object):
                 self._remove_file(pkg_folder + ".dirty", package_layout.ref, "dirty flag")
                 self._remove_file(package_layout.system_reqs_package(pref), package_layout.ref,
                                   "%s/%s" % (id_, SYSTEM_REQS))
+                self._remove_file(package_layout.manifest_stat_cache(pref), package_layout.ref,
+                                  "stat cache")
 
 
 class ConanRemover(object):
@@ -112,22 +116,26 @@ class ConanRemover(object):
         # Get the package layout using 'short_paths=False', remover will make use of the
         #  function 'rm_conandir' which already takes care of the linked folder.
         package_layout = self._cache.package_layout(ref, short_paths=False)
+        # Only the local cache is modified, never the lower read-only ones
+        local_layout = package_layout.local()
 
-        package_layout.remove_package_locks()  # Make sure to clean the locks too
+        local_layout.remove_package_locks()  # Make sure to clean the locks too
         remover = DiskRemover()
         if src:
-            remover.remove_src(package_layout)
+            remover.remove_src(local_layout)
         if build_ids is not None:
-            remover.remove_builds(package_layout, build_ids)
+            remover.remove_builds(local_layout, build_ids)
 
         if package_ids is not None:
-            remover.remove_packages(package_layout, package_ids)
+            remover.remove_packages(local_layout, package_ids)
             with package_layout.update_metadata() as metadata:
                 for package_id in package_ids:
                     metadata.clear_package(package_id)
 
         if not src and build_ids is None and package_ids is None:
-            remover.remove(package_layout, output=self._user_io.out)
+            remover.remove(local_layout, output=self._user_io.out)
+            if self._cache.cache_index:
+                self._cache.cache_index.remove(ref)
 
     def remove(self, pattern, remote_name, src=None, build_ids=None, package_ids_filter=None,
                force=False, packages_query=None, outdated=False):
@@ -230,6 +238,8 @@ class ConanRemover(object):
 
         if not remote_name:
             self._cache.delete_empty_dirs(deleted_refs)
+            if deleted_refs and self._cache.blob_store:
+                self._cache.blob_store.clean()
 
     def _ask_permission(self, ref, src, build_ids, package_ids_filter, force):
         def stringlist(alist):
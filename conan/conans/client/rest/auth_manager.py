@@ -13,6 +13,7 @@ Flow:
 """
 
 import hashlib
+import threading
 from uuid import getnode as get_mac
 
 from conans.client.cmd.user import update_localdb
@@ -89,7 +90,12 @@ class ConanApiAuthManager(object):
         self._user_io = user_io
         self._rest_client = rest_client
         self._localdb = localdb
-        self._remote = None
+        # The current remote and user are stored per thread, as the RestApiClient state
+        self._local = threading.local()
+
+    @property
+    def _remote(self):
+        return getattr(self._local, "remote", None)
 
     @property
     def remote(self):
@@ -97,11 +103,19 @@ class ConanApiAuthManager(object):
 
     @remote.setter
     def remote(self, remote):
-        self._remote = remote
+        self._local.remote = remote
         self._rest_client.remote_url = remote.url
         self._rest_client.verify_ssl = remote.verify_ssl
         self.user, self._rest_client.token = self._localdb.get_login(remote.url)
 
+    @property
+    def user(self):
+        return getattr(self._local, "user", None)
+
+    @user.setter
+    def user(self, user):
+        self._local.user = user
+
     def _store_login(self, login):
         try:
             self._localdb.set_login(login, self._remote.url)
@@ -110,6 +124,12 @@ class ConanApiAuthManager(object):
                 'Your credentials could not be stored in local cache\n')
             self._user_io.out.debug(str(e) + '\n')
 
+    def after_fork(self):
+        self._rest_client.after_fork()
+
+    def close(self):
+        self._rest_client.close()
+
     @staticmethod
     def get_mac_digest():
         sha1 = hashlib.sha1()
@@ -129,12 +149,14 @@ class ConanApiAuthManager(object):
         self._rest_client.check_credentials()
 
     @input_credentials_if_unauthorized
-    def upload_recipe(self, ref, files_to_upload, deleted, retry, retry_wait):
-        return self._rest_client.upload_recipe(ref, files_to_upload, deleted, retry, retry_wait)
+    def upload_recipe(self, ref, files_to_upload, deleted, retry, retry_wait, output=None):
+        return self._rest_client.upload_recipe(ref, files_to_upload, deleted, retry, retry_wait,
+                                               output)
 
     @input_credentials_if_unauthorized
-    def upload_package(self, pref, files_to_upload, deleted, retry, retry_wait):
-        return self._rest_client.upload_package(pref, files_to_upload, deleted, retry, retry_wait)
+    def upload_package(self, pref, files_to_upload, deleted, retry, retry_wait, output=None):
+        return self._rest_client.upload_package(pref, files_to_upload, deleted, retry, retry_wait,
+                                                output)
 
     @input_credentials_if_unauthorized
     def get_recipe_manifest(self, ref):
@@ -145,8 +167,12 @@ class ConanApiAuthManager(object):
         return self._rest_client.get_package_manifest(pref)
 
     @input_credentials_if_unauthorized
-    def get_package(self, pref, dest_folder):
-        return self._rest_client.get_package(pref, dest_folder)
+    def get_packages_info(self, prefs):
+        return self._rest_client.get_packages_info(prefs)
+
+    @input_credentials_if_unauthorized
+    def get_package(self, pref, dest_folder, link_source=None):
+        return self._rest_client.get_package(pref, dest_folder, link_source)
 
     @input_credentials_if_unauthorized
     def get_recipe(self, ref, dest_folder):
@@ -178,6 +178,10 @@ class ClientV2Router(ClientCommonRouter):
         """get recipe manifest url"""
         return self.base_url + self._for_package_files(pref)
 
+    def packages_info(self):
+        """Get the revisions, manifests and conaninfos of many packages url"""
+        return self.base_url + routes.packages_info
+
     def package_revisions(self, pref):
         """get revisions for a package url"""
         return self.base_url + _format_pref(routes.package_revisions, pref)
@@ -45,6 +45,13 @@ class ConanRequester(object):
             else:
                 self._client_certificates = self._client_cert_path
 
+    def after_fork(self):
+        """ The connections of the session are shared with the parent process, a forked child
+        process opens its own ones
+        """
+        if isinstance(self._http_requester, requests.Session):
+            self._http_requester = requests.Session()
+
     @property
     def retry(self):
         return self._retry
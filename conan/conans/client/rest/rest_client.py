@@ -1,6 +1,8 @@
+import threading
 from collections import defaultdict
+from multiprocessing.pool import ThreadPool
 
-from conans import CHECKSUM_DEPLOY, REVISIONS, ONLY_V2
+from conans import CHECKSUM_DEPLOY, ONLY_V2, PACKAGES_INFO, REVISIONS
 from conans.client.rest.rest_client_v1 import RestV1Methods
 from conans.client.rest.rest_client_v2 import RestV2Methods
 from conans.errors import OnlyV2Available
@@ -11,23 +13,88 @@ class RestApiClient(object):
         Rest Api Client for handle remote.
     """
 
-    def __init__(self, output, requester, revisions_enabled, put_headers=None):
+    def __init__(self, output, requester, revisions_enabled, put_headers=None,
+                 parallel_download=None):
 
-        # Set to instance
-        self.token = None
-        self.remote_url = None
-        self.custom_headers = {}  # Can set custom headers to each request
+        # The remote dependent state (url, token, ssl verification, headers) is stored per thread,
+        # so concurrent transfers against different remotes do not interfere
+        self._local = threading.local()
         self._output = output
         self.requester = requester
 
-        # Remote manager will set it to True or False dynamically depending on the remote
-        self.verify_ssl = True
         self._put_headers = put_headers
         self._revisions_enabled = revisions_enabled
+        self._parallel_download = parallel_download
+        self._transfer_pool = None
+        self._transfer_pool_lock = threading.Lock()
 
         self._cached_capabilities = defaultdict(list)
 
-    def _get_api(self):
+    def after_fork(self):
+        """ Discards the state inherited by a forked child process that it cannot use: the
+        threads of the transfer pool only exist in the parent, and so do the connections
+        """
+        self._transfer_pool = None
+        self._transfer_pool_lock = threading.Lock()
+        self.requester.after_fork()
+
+    def close(self):
+        """ Finishes the threads of the transfer pool, if any. It is created again if needed
+        """
+        with self._transfer_pool_lock:
+            transfer_pool, self._transfer_pool = self._transfer_pool, None
+        if transfer_pool is not None:
+            transfer_pool.close()
+            transfer_pool.join()
+
+    def _get_transfer_pool(self):
+        """ The pool of threads transferring the files of the recipes and packages, shared by all
+        the transfers of the client, or None if they are not transferred concurrently
+        """
+        if not self._parallel_download or self._parallel_download < 2:
+            return None
+        with self._transfer_pool_lock:
+            if self._transfer_pool is None:
+                self._transfer_pool = ThreadPool(self._parallel_download)
+        return self._transfer_pool
+
+    @property
+    def token(self):
+        return getattr(self._local, "token", None)
+
+    @token.setter
+    def token(self, token):
+        self._local.token = token
+
+    @property
+    def remote_url(self):
+        return getattr(self._local, "remote_url", None)
+
+    @remote_url.setter
+    def remote_url(self, remote_url):
+        self._local.remote_url = remote_url
+
+    @property
+    def verify_ssl(self):
+        # Remote manager will set it to True or False dynamically depending on the remote
+        return getattr(self._local, "verify_ssl", True)
+
+    @verify_ssl.setter
+    def verify_ssl(self, verify_ssl):
+        self._local.verify_ssl = verify_ssl
+
+    @property
+    def custom_headers(self):
+        # Can set custom headers to each request
+        if not hasattr(self._local, "custom_headers"):
+            self._local.custom_headers = {}
+        return self._local.custom_headers
+
+    @custom_headers.setter
+    def custom_headers(self, custom_headers):
+        self._local.custom_headers = custom_headers
+
+    def _get_api(self, output=None):
         if self.remote_url not in self._cached_capabilities:
             tmp = RestV1Methods(self.remote_url, self.token, self.custom_headers, self._output,
                                 self.requester, self.verify_ssl, self._put_headers)
@@ -38,12 +105,13 @@ class RestApiClient(object):
 
         if self._revisions_enabled and REVISIONS in self._cached_capabilities[self.remote_url]:
             checksum_deploy = CHECKSUM_DEPLOY in self._cached_capabilities[self.remote_url]
-            return RestV2Methods(self.remote_url, self.token, self.custom_headers, self._output,
-                                 self.requester, self.verify_ssl, self._put_headers,
-                                 checksum_deploy)
+            return RestV2Methods(self.remote_url, self.token, self.custom_headers,
+                                 output or self._output, self.requester, self.verify_ssl,
+                                 self._put_headers, checksum_deploy, self._get_transfer_pool())
         else:
-            return RestV1Methods(self.remote_url, self.token, self.custom_headers, self._output,
-                                 self.requester, self.verify_ssl, self._put_headers)
+            return RestV1Methods(self.remote_url, self.token, self.custom_headers,
+                                 output or self._output, self.requester, self.verify_ssl,
+                                 self._put_headers)
 
     def get_recipe_manifest(self, ref):
         return self._get_api().get_recipe_manifest(ref)
@@ -54,6 +122,15 @@ class RestApiClient(object):
     def get_package_info(self, pref):
         return self._get_api().get_package_info(pref)
 
+    def get_packages_info(self, prefs):
+        """ None if the remote cannot return the info of many packages with a single request
+        """
+        api = self._get_api()
+        if (not isinstance(api, RestV2Methods) or
+                PACKAGES_INFO not in self._cached_capabilities[self.remote_url]):
+            return None
+        return api.get_packages_info(prefs)
+
     def get_recipe(self, ref, dest_folder):
         return self._get_api().get_recipe(ref, dest_folder)
 
@@ -63,8 +140,8 @@ class RestApiClient(object):
     def get_recipe_sources(self, ref, dest_folder):
         return self._get_api().get_recipe_sources(ref, dest_folder)
 
-    def get_package(self, pref, dest_folder):
-        return self._get_api().get_package(pref, dest_folder)
+    def get_package(self, pref, dest_folder, link_source=None):
+        return self._get_api().get_package(pref, dest_folder, link_source)
 
     def get_package_snapshot(self, ref):
         return self._get_api().get_package_snapshot(ref)
@@ -75,12 +152,13 @@ class RestApiClient(object):
     def get_package_path(self, pref, path):
         return self._get_api().get_package_path(pref, path)
 
-    def upload_recipe(self, ref, files_to_upload, deleted, retry, retry_wait):
-        return self._get_api().upload_recipe(ref, files_to_upload, deleted, retry,
-                                             retry_wait)
+    def upload_recipe(self, ref, files_to_upload, deleted, retry, retry_wait, output=None):
+        return self._get_api(output).upload_recipe(ref, files_to_upload, deleted, retry,
+                                                   retry_wait)
 
-    def upload_package(self, pref, files_to_upload, deleted, retry, retry_wait):
-        return self._get_api().upload_package(pref, files_to_upload, deleted, retry, retry_wait)
+    def upload_package(self, pref, files_to_upload, deleted, retry, retry_wait, output=None):
+        return self._get_api(output).upload_package(pref, files_to_upload, deleted, retry,
+                                                    retry_wait)
 
     def authenticate(self, user, password):
         return self._get_api().authenticate(user, password)
@@ -1,14 +1,18 @@
 import json
+import os
 
 from requests.auth import AuthBase, HTTPBasicAuth
 
 from conans import COMPLEX_SEARCH_CAPABILITY
+from conans.client.rest.uploader_downloader import FileDownloader
 from conans.errors import (EXCEPTION_CODE_MAPPING, NotFoundException, ConanException,
                            AuthenticationException, RecipeNotFoundException,
-                           PackageNotFoundException)
+                           PackageNotFoundException, ForbiddenException)
 from conans.model.ref import ConanFileReference
+from conans.paths import PACKAGE_TGZ_NAME
 from conans.search.search import filter_packages
-from conans.util.files import decode_text
+from conans.util.env_reader import get_env
+from conans.util.files import decode_text, rmdir
 from conans.util.log import logger
 
 
@@ -77,6 +81,35 @@ class RestCommonMethods(object):
     def auth(self):
         return JWTAuth(self.token)
 
+    def _download_extract_package_tgz(self, url, dest_folder, auth, link_source=None):
+        """ downloads the conan_package.tgz extracting it to dest_folder while it is received,
+        instead of storing it and reading it again. If it fails, the folder is removed and False
+        is returned, so all the files can be downloaded and extracted as usual.
+        With CONAN_KEEP_DOWNLOADED_ARCHIVES the file is also saved in dest_folder
+        """
+        if self._output:
+            self._output.writeln("Downloading %s" % PACKAGE_TGZ_NAME)
+        downloader = FileDownloader(self.requester, self._output, self.verify_ssl)
+        file_path = None
+        if get_env("CONAN_KEEP_DOWNLOADED_ARCHIVES", False):
+            file_path = os.path.join(dest_folder, PACKAGE_TGZ_NAME)
+        try:
+            downloader.download_extract(url, dest_folder, auth=auth, file_path=file_path,
+                                        link_source=link_source)
+        except (NotFoundException, ForbiddenException, AuthenticationException):
+            raise
+        except Exception as exc:
+            logger.debug("REST: Streamed extraction of %s failed: %s" % (url, str(exc)))
+            if self._output:
+                self._output.writeln("")
+                self._output.warn("Error extracting %s while downloading it, downloading it "
+                                  "again: %s" % (PACKAGE_TGZ_NAME, str(exc)))
+            rmdir(dest_folder)
+            return False
+        if self._output:
+            self._output.writeln("")
+        return True
+
     @handle_return_deserializer()
     def authenticate(self, user, password):
         """Sends user + password to get a token"""
@@ -211,10 +211,17 @@ class RestV1Methods(RestCommonMethods):
         urls = self._get_file_to_url_dict(url)
         return urls
 
-    def get_package(self, pref, dest_folder):
+    def get_package(self, pref, dest_folder, link_source=None):
         urls = self._get_package_urls(pref)
         check_compressed_files(PACKAGE_TGZ_NAME, urls)
+        tgz_url = urls.pop(PACKAGE_TGZ_NAME, None)
+        # The manifest is downloaded before extracting the tgz, for the link_source
         zipped_files = self._download_files_to_folder(urls, dest_folder)
+        if tgz_url:
+            auth, _ = self._file_server_capabilities(tgz_url)
+            if not self._download_extract_package_tgz(tgz_url, dest_folder, auth, link_source):
+                urls[PACKAGE_TGZ_NAME] = tgz_url
+                zipped_files = self._download_files_to_folder(urls, dest_folder)
         return zipped_files
 
     def _get_package_urls(self, pref):
@@ -3,6 +3,7 @@ import traceback
 
 import time
 
+from conans.client.output import BufferedOutput
 from conans.client.remote_manager import check_compressed_files
 from conans.client.rest.client_routes import ClientV2Router
 from conans.client.rest.rest_client_common import RestCommonMethods, get_exception_from_error
@@ -21,11 +22,12 @@ from conans.util.log import logger
 class RestV2Methods(RestCommonMethods):
 
     def __init__(self, remote_url, token, custom_headers, output, requester, verify_ssl,
-                 put_headers=None, checksum_deploy=False):
+                 put_headers=None, checksum_deploy=False, transfer_pool=None):
 
         super(RestV2Methods, self).__init__(remote_url, token, custom_headers, output, requester,
                                             verify_ssl, put_headers)
         self._checksum_deploy = checksum_deploy
+        self._transfer_pool = transfer_pool
 
     @property
     def router(self):
@@ -76,6 +78,21 @@ class RestV2Methods(RestCommonMethods):
         content = self._get_remote_file_contents(url)
         return ConanInfo.loads(decode_text(content))
 
+    def get_packages_info(self, prefs):
+        """ Returns {pref: (ConanInfo, FileTreeManifest, pref with revisions)} of the packages of the
+        list that exist in the remote, with a single request
+        """
+        url = self.router.packages_info()
+        data = self.get_json(url, data={"packages": [pref.full_repr() for pref in prefs]})
+        ret = {}
+        for pref in prefs:
+            package = data["packages"].get(pref.full_repr())
+            if package:
+                ret[pref] = (ConanInfo.loads(package["conaninfo"]),
+                             FileTreeManifest.loads(package["manifest"]),
+                             PackageReference.loads(package["reference"]))
+        return ret
+
     def get_recipe(self, ref, dest_folder):
         url = self.router.recipe_snapshot(ref)
         data = self._get_file_list_json(url)
@@ -108,14 +125,23 @@ class RestV2Methods(RestCommonMethods):
         ret = {fn: os.path.join(dest_folder, fn) for fn in files}
         return ret
 
-    def get_package(self, pref, dest_folder):
+    def get_package(self, pref, dest_folder, link_source=None):
         url = self.router.package_snapshot(pref)
         data = self._get_file_list_json(url)
         files = data["files"]
         check_compressed_files(PACKAGE_TGZ_NAME, files)
         # If we didn't indicated reference, server got the latest, use absolute now, it's safer
         urls = {fn: self.router.package_file(pref, fn) for fn in files}
-        self._download_and_save_files(urls, dest_folder, files)
+        if PACKAGE_TGZ_NAME in files:
+            # The manifest is downloaded before extracting the tgz, for the link_source
+            files.remove(PACKAGE_TGZ_NAME)
+            self._download_and_save_files(urls, dest_folder, files)
+            if not self._download_extract_package_tgz(urls[PACKAGE_TGZ_NAME], dest_folder,
+                                                      self.auth, link_source):
+                files.append(PACKAGE_TGZ_NAME)
+                self._download_and_save_files(urls, dest_folder, files)
+        else:
+            self._download_and_save_files(urls, dest_folder, files)
         ret = {fn: os.path.join(dest_folder, fn) for fn in files}
         return ret
 
@@ -171,32 +197,57 @@ class RestV2Methods(RestCommonMethods):
                 for fn in files_to_upload}
         self._upload_files(files_to_upload, urls, retry, retry_wait)
 
+    def _transfer_files(self, transfer, filenames):
+        """ calls transfer(filename, output) for every file, concurrently in the transfer pool of
+        the client, sharing the requester session, if any. Then the output of every transfer is
+        buffered and written in the order of the files. Returns the results in the same order,
+        raising the error of the first file that failed, if any
+        """
+        if self._transfer_pool is None or len(filenames) < 2:
+            return [transfer(filename, self._output) for filename in filenames]
+
+        outputs = [BufferedOutput(self._output) if self._output else None for _ in filenames]
+        async_results = [self._transfer_pool.apply_async(transfer, (filename, output))
+                         for filename, output in zip(filenames, outputs)]
+        for async_result in async_results:  # All finished before raising any error
+            async_result.wait()
+        for output in outputs:
+            if output:
+                output.replay()
+        return [async_result.get() for async_result in async_results]
+
     def _upload_files(self, files, urls, retry, retry_wait):
         t1 = time.time()
-        failed = []
-        uploader = FileUploader(self.requester, self._output, self.verify_ssl)
-        # conan_package.tgz and conan_export.tgz are uploaded first to avoid uploading conaninfo.txt
-        # or conanamanifest.txt with missing files due to a network failure
-        for filename in sorted(files):
-            self._output.rewrite_line("Uploading %s" % filename)
-            resource_url = urls[filename]
+
+        def upload(filename, output):
+            output.rewrite_line("Uploading %s" % filename)
+            uploader = FileUploader(self.requester, output, self.verify_ssl)
             try:
-                response = uploader.upload(resource_url, files[filename], auth=self.auth,
+                response = uploader.upload(urls[filename], files[filename], auth=self.auth,
                                            dedup=self._checksum_deploy, retry=retry,
                                            retry_wait=retry_wait,
                                            headers=self._put_headers)
-                self._output.writeln("")
+                output.writeln("")
                 if not response.ok:
-                    self._output.error("\nError uploading file: %s, '%s'" % (filename,
-                                                                             response.content))
-                    failed.append(filename)
-                else:
-                    pass
+                    output.error("\nError uploading file: %s, '%s'" % (filename,
+                                                                       response.content))
+                    return False
             except (AuthenticationException, ForbiddenException):
                 raise
             except Exception as exc:
-                self._output.error("\nError uploading file: %s, '%s'" % (filename, exc))
-                failed.append(filename)
+                output.error("\nError uploading file: %s, '%s'" % (filename, exc))
+                return False
+            return True
+
+        # conan_package.tgz and conan_export.tgz are uploaded first to avoid uploading conaninfo.txt
+        # or conanamanifest.txt with missing files due to a network failure
+        compressed = [filename for filename in sorted(files) if filename.endswith(".tgz")]
+        others = [filename for filename in sorted(files) if filename not in compressed]
+        failed = []
+        for filenames in (compressed, others):
+            if filenames:
+                results = self._transfer_files(upload, filenames)
+                failed.extend(f for f, uploaded in zip(filenames, results) if not uploaded)
 
         if failed:
             raise ConanException("Execute upload again to retry upload the failed files: %s"
@@ -205,17 +256,19 @@ class RestV2Methods(RestCommonMethods):
             logger.debug("\nUPLOAD: All uploaded! Total time: %s\n" % str(time.time() - t1))
 
     def _download_and_save_files(self, urls, dest_folder, files):
-        downloader = FileDownloader(self.requester, self._output, self.verify_ssl)
+
+        def download(filename, output):
+            if output:
+                output.writeln("Downloading %s" % filename)
+            downloader = FileDownloader(self.requester, output, self.verify_ssl)
+            abs_path = os.path.join(dest_folder, filename)
+            downloader.download(urls[filename], abs_path, auth=self.auth)
+            if output:
+                output.writeln("")
+
         # Take advantage of filenames ordering, so that conan_package.tgz and conan_export.tgz
         # can be < conanfile, conaninfo, and sent always the last, so smaller files go first
-        for filename in sorted(files, reverse=True):
-            if self._output:
-                self._output.writeln("Downloading %s" % filename)
-            resource_url = urls[filename]
-            abs_path = os.path.join(dest_folder, filename)
-            downloader.download(resource_url, abs_path, auth=self.auth)
-            if self._output:
-                self._output.writeln("")
+        self._transfer_files(download, sorted(files, reverse=True))
 
     def _remove_conanfile_files(self, ref, files):
         # V2 === revisions, do not remove files, it will create a new revision if the files changed
@@ -1,3 +1,5 @@
+import hashlib
+import io
 import os
 import time
 import traceback
@@ -5,14 +7,14 @@ import traceback
 from conans.client.tools.files import human_size
 from conans.errors import AuthenticationException, ConanConnectionError, ConanException, \
     NotFoundException, ForbiddenException
-from conans.util.files import mkdir, save_append, sha1sum, to_file_bytes
+from conans.util.files import file_checksums, mkdir, save_append, tar_extract, to_file_bytes
 from conans.util.log import logger
 from conans.util.tracer import log_download
 
 
 class FileUploader(object):
 
-    def __init__(self, requester, output, verify, chunk_size=1000):
+    def __init__(self, requester, output, verify, chunk_size=None):
         self.chunk_size = chunk_size
         self.output = output
         self.requester = requester
@@ -25,9 +27,10 @@ class FileUploader(object):
         retry_wait = retry_wait if retry_wait is not None else self.requester.retry_wait
         retry_wait = retry_wait if retry_wait is not None else 5
 
-        # Send always the header with the Sha1
+        # Send always the header with the Sha1. It has to be known before sending the contents,
+        # the md5 is computed in the same read to be reused by the tracer
         headers = headers or {}
-        headers["X-Checksum-Sha1"] = sha1sum(abs_path)
+        headers["X-Checksum-Sha1"] = file_checksums(abs_path)["sha1"]
         if dedup:
             dedup_headers = {"X-Checksum-Deploy": "true"}
             if headers:
@@ -46,22 +49,17 @@ class FileUploader(object):
 
         self.output.info("")
         # Actual transfer of the real content
-        it = load_in_chunks(abs_path, self.chunk_size)
-        # Now it is a chunked read file
-        file_size = os.stat(abs_path).st_size
-        it = upload_with_progress(file_size, it, self.chunk_size, self.output)
-        # Now it will print progress in each iteration
-        iterable_to_file = IterableToFileAdapter(it, file_size)
-        # Now it is prepared to work with request
         ret = call_with_retry(self.output, retry, retry_wait, self._upload_file, url,
-                              data=iterable_to_file, headers=headers, auth=auth)
+                              abs_path=abs_path, headers=headers, auth=auth)
 
         return ret
 
-    def _upload_file(self, url, data,  headers, auth):
+    def _upload_file(self, url, abs_path,  headers, auth):
         try:
-            response = self.requester.put(url, data=data, verify=self.verify,
-                                          headers=headers, auth=auth)
+            # A new reader for every attempt, a retry has to send the file from the beginning
+            with UploadBodyAdapter(abs_path, self.output, self.chunk_size) as data:
+                response = self.requester.put(url, data=data, verify=self.verify,
+                                              headers=headers, auth=auth)
             if response.status_code == 401:
                 raise AuthenticationException(response.content)
 
@@ -80,47 +78,62 @@ class FileUploader(object):
         return response
 
 
-class IterableToFileAdapter(object):
-    def __init__(self, iterable, total_size):
-        self.iterator = iter(iterable)
-        self.total_size = total_size
+class UploadBodyAdapter(object):
+    """ File-like object to be used as the body of the upload requests. The file is read in
+    large blocks into a single reusable buffer, and every read returns a view of it, so the
+    contents are not copied to a new bytes object for every block. The http client sends each
+    block before reading the next one. The progress is computed from the offset in the file.
+    """
+    min_block_size = 64 * 1024
+    max_block_size = 4 * 1024 * 1024
+
+    def __init__(self, path, output, block_size=None):
+        self._file = io.open(path, "rb")
+        self.total_size = os.fstat(self._file.fileno()).st_size
+        if not block_size:
+            # About a hundredth of the file, the granularity of the progress bar
+            block_size = min(max(self.total_size // 100, self.min_block_size),
+                             self.max_block_size)
+        self._buffer = bytearray(block_size)
+        self._view = memoryview(self._buffer)
+        self._offset = 0
+        self._output = output
+        self._last_progress = None
 
     def read(self, size=-1):  # @UnusedVariable
-        return next(self.iterator, b'')
+        """ The size requested by the http client is ignored, always returning a full block """
+        n = self._file.readinto(self._buffer)
+        if not n:
+            return b''
+        self._offset += n
+        self._print_progress()
+        return self._view[:n]
+
+    def _print_progress(self):
+        units = progress_units(self._offset, self.total_size)
+        if self._last_progress != units:  # Avoid screen refresh if nothing has change
+            print_progress(self._output, units,
+                           human_readable_progress(self._offset, self.total_size))
+            self._last_progress = units
+
+    def close(self):
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
 
     def __len__(self):
         return self.total_size
 
     def __iter__(self):
-        return self.iterator.__iter__()
-
-
-class upload_with_progress(object):
-    def __init__(self, totalsize, iterator, chunk_size, output):
-        self.totalsize = totalsize
-        self.output = output
-        self.chunk_size = chunk_size
-        self.aprox_chunks = self.totalsize * 1.0 / chunk_size
-        self.groups = iterator
-
-    def __iter__(self):
-        last_progress = None
-        for index, chunk in enumerate(self.groups):
-            if self.aprox_chunks == 0:
-                index = self.aprox_chunks
-
-            units = progress_units(index, self.aprox_chunks)
-            progress = human_readable_progress(index * self.chunk_size, self.totalsize)
-            if last_progress != units:  # Avoid screen refresh if nothing has change
-                print_progress(self.output, units, progress)
-                last_progress = units
-            yield chunk
-
-        progress = human_readable_progress(self.totalsize, self.totalsize)
-        print_progress(self.output, progress_units(100, 100), progress)
-
-    def __len__(self):
-        return self.totalsize
+        while True:
+            block = self.read()
+            if not block:
+                break
+            yield block
 
 
 def load_in_chunks(path, chunk_size=1024):
@@ -156,17 +169,46 @@ class FileDownloader(object):
             if overwrite:
                 if self.output:
                     self.output.warn("file '%s' already exists, overwriting" % file_path)
+                # Any existing file is a partial download to be resumed when retrying
+                os.remove(file_path)
             else:
                 # Should not happen, better to raise, probably we had to remove
                 # the dest folder before
                 raise ConanException("Error, the file to download already exists: '%s'" % file_path)
 
-        return call_with_retry(self.output, retry, retry_wait, self._download_file, url, auth,
-                               headers, file_path)
+        try:
+            return call_with_retry(self.output, retry, retry_wait, self._download_file, url, auth,
+                                   headers, file_path)
+        except Exception:
+            if file_path and os.path.exists(file_path):
+                os.remove(file_path)
+            raise
 
-    def _download_file(self, url, auth, headers, file_path):
+    def download_extract(self, url, destination_dir, auth=None, headers=None, file_path=None,
+                         link_source=None):
+        """ downloads a tgz file extracting it to destination_dir as the bytes are received, without
+        storing the file, unless a file_path is given. The size and the sha1 checksum, if reported
+        by the server, are verified once finished. It is not retried, the caller should clean
+        destination_dir and file_path if it fails. link_source is passed to tar_extract
+        """
         t1 = time.time()
+        response = self._get(url, auth, headers)
+        file_handler = None
+        if file_path:
+            mkdir(os.path.dirname(file_path))
+            file_handler = open(file_path, "wb")
+        reader = _ResponseReader(response, self.chunk_size * 100, self.output, file_handler)
+        try:
+            tar_extract(reader, destination_dir, stream=True, link_source=link_source)
+            reader.read()  # The rest of the stream after the end of the tar, for the checksum
+        finally:
+            response.close()
+            if file_handler:
+                file_handler.close()
+        reader.check()
+        log_download(url, time.time() - t1)
 
+    def _get(self, url, auth, headers):
         try:
             response = self.requester.get(url, stream=True, verify=self.verify, auth=auth,
                                           headers=headers)
@@ -183,10 +225,21 @@ class FileDownloader(object):
             elif response.status_code == 401:
                 raise AuthenticationException()
             raise ConanException("Error %d downloading file %s" % (response.status_code, url))
+        return response
+
+    def _download_file(self, url, auth, headers, file_path):
+        t1 = time.time()
+        offset = os.path.getsize(file_path) if file_path and os.path.exists(file_path) else 0
+        if offset:
+            response = self._resume(url, auth, headers, file_path, offset)
+            if response.status_code != 206:  # The server ignored the Range, send it all again
+                offset = 0
+        else:
+            response = self._get(url, auth, headers)
 
         try:
             logger.debug("DOWNLOAD: %s" % url)
-            data = self._download_data(response, file_path)
+            data = self._download_data(response, file_path, offset)
             duration = time.time() - t1
             log_download(url, duration)
             return data
@@ -197,9 +250,40 @@ class FileDownloader(object):
             raise ConanConnectionError("Download failed, check server, possibly try again\n%s"
                                        % str(e))
 
-    def _download_data(self, response, file_path):
+    def _resume(self, url, auth, headers, file_path, offset):
+        """ requests the rest of the file of a previous attempt that failed after writing 'offset'
+        bytes. If the server refuses the range, the file is removed so next attempt starts again
+        """
+        logger.debug("DOWNLOAD: resuming %s from byte %d" % (url, offset))
+        headers = dict(headers or {})
+        headers["Range"] = "bytes=%d-" % offset
+        headers["Accept-Encoding"] = "identity"  # The range refers to the not encoded bytes
+        try:
+            response = self._get(url, auth, headers)
+        except (NotFoundException, ForbiddenException, AuthenticationException):
+            raise
+        except ConanException:
+            os.remove(file_path)
+            raise
+        content_range = response.headers.get("Content-Range", "")
+        if response.status_code == 206 and not content_range.startswith("bytes %d-" % offset):
+            response.close()
+            os.remove(file_path)
+            raise ConanException("Invalid range '%s' resuming the download of %s"
+                                 % (content_range, url))
+        return response
+
+    def _download_data(self, response, file_path, offset=0):
         ret = bytearray()
         total_length = response.headers.get('content-length')
+        checksum = response.headers.get("X-Checksum-Sha1") if file_path else None
+        sha1 = hashlib.sha1() if checksum else None
+
+        if file_path and not offset and os.path.exists(file_path):
+            os.remove(file_path)  # Written by a previous attempt that can't be resumed
+        if sha1 is not None and offset:
+            for data in load_in_chunks(file_path, 1024 * 100):
+                sha1.update(data)
 
         if total_length is None:  # no content length header
             if not file_path:
@@ -210,6 +294,8 @@ class FileDownloader(object):
                     progress = human_readable_progress(total_length, total_length)
                     print_progress(self.output, 50, progress)
                 save_append(file_path, response.content)
+                if sha1 is not None:
+                    sha1.update(response.content)
         else:
             total_length = int(total_length)
             encoding = response.headers.get('content-encoding')
@@ -229,9 +315,12 @@ class FileDownloader(object):
                         ret_buffer.extend(data)
                     if file_handler is not None:
                         file_handler.write(to_file_bytes(data))
+                    if sha1 is not None:
+                        sha1.update(data)
                     if self.output:
-                        units = progress_units(download_size, total_length)
-                        progress = human_readable_progress(download_size, total_length)
+                        units = progress_units(offset + download_size, offset + total_length)
+                        progress = human_readable_progress(offset + download_size,
+                                                           offset + total_length)
                         if last_progress != units:  # Avoid screen refresh if nothing has change
                             print_progress(self.output, units, progress)
                             last_progress = units
@@ -239,7 +328,7 @@ class FileDownloader(object):
 
             if file_path:
                 mkdir(os.path.dirname(file_path))
-                with open(file_path, 'wb') as handle:
+                with open(file_path, 'ab' if offset else 'wb') as handle:
                     dl_size = download_chunks(file_handler=handle)
             else:
                 dl_size = download_chunks(ret_buffer=ret)
@@ -250,12 +339,70 @@ class FileDownloader(object):
                 raise ConanException("Transfer interrupted before "
                                      "complete: %s < %s" % (dl_size, total_length))
 
+        if sha1 is not None:
+            if sha1.hexdigest() != checksum:
+                os.remove(file_path)
+                raise ConanException("Bad checksum of the downloaded file: %s != %s"
+                                     % (sha1.hexdigest(), checksum))
+
         if not file_path:
             return bytes(ret)
         else:
             return
 
 
+class _ResponseReader(object):
+    """ File-like object reading the body of a streamed response, computing its size and sha1 and
+    printing the progress as it is read. The body is also written to file_handler, if any
+    """
+    def __init__(self, response, chunk_size, output, file_handler=None):
+        self._response = response
+        self._file_handler = file_handler
+        self._chunks = iter(response.iter_content(chunk_size))
+        self._buffer = bytearray()
+        self._sha1 = hashlib.sha1()
+        self._output = output
+        self._last_progress = None
+        self.size = 0
+        total_length = response.headers.get('content-length')
+        self._total_length = int(total_length) if total_length is not None else None
+
+    def read(self, size=-1):
+        while size < 0 or len(self._buffer) < size:
+            chunk = next(self._chunks, None)
+            if chunk is None:
+                break
+            self._received(chunk)
+            self._buffer.extend(chunk)
+        if size < 0:
+            size = len(self._buffer)
+        data = bytes(self._buffer[:size])
+        del self._buffer[:size]
+        return data
+
+    def _received(self, chunk):
+        self.size += len(chunk)
+        self._sha1.update(chunk)
+        if self._file_handler:
+            self._file_handler.write(chunk)
+        if self._output and self._total_length:
+            units = progress_units(self.size, self._total_length)
+            if self._last_progress != units:  # Avoid screen refresh if nothing has change
+                print_progress(self._output, units,
+                               human_readable_progress(self.size, self._total_length))
+                self._last_progress = units
+
+    def check(self):
+        gzip = self._response.headers.get('content-encoding') == "gzip"
+        if self._total_length is not None and self.size != self._total_length and not gzip:
+            raise ConanException("Transfer interrupted before "
+                                 "complete: %s < %s" % (self.size, self._total_length))
+        checksum = self._response.headers.get("X-Checksum-Sha1")
+        if checksum and checksum != self._sha1.hexdigest():
+            raise ConanException("Bad checksum of the downloaded file: %s != %s"
+                                 % (self._sha1.hexdigest(), checksum))
+
+
 def progress_units(progress, total):
     if total == 0:
         return 0
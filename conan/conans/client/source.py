@@ -19,9 +19,13 @@ def complete_recipe_sources(remote_manager, cache, conanfile, ref, remotes):
     occassions, conan needs to get them too, like if uploading to a server, to keep the recipes
     complete
     """
-    sources_folder = cache.package_layout(ref, conanfile.short_paths).export_sources()
+    package_layout = cache.package_layout(ref, conanfile.short_paths)
+    sources_folder = package_layout.export_sources()
     if os.path.exists(sources_folder):
         return None
+    # The sources are stored next to the recipe, that has to be in the local cache
+    package_layout.copy_up()
+    sources_folder = package_layout.export_sources()
 
     if conanfile.exports_sources is None:
         mkdir(sources_folder)
@@ -1,12 +1,16 @@
 import calendar
 import datetime
+import json
+import multiprocessing
 import os
 import time
+from multiprocessing.pool import ThreadPool
 
 from conans.errors import ConanException
 from conans.paths import CONAN_MANIFEST, EXPORT_SOURCES_TGZ_NAME, EXPORT_TGZ_NAME, PACKAGE_TGZ_NAME
 from conans.util.env_reader import get_env
 from conans.util.files import load, md5, md5sum, save, walk
+from conans.util.log import logger
 
 
 def discarded_file(filename):
@@ -48,6 +52,72 @@ def gather_files(folder):
     return file_dict, symlinks
 
 
+def _stat_key(path):
+    st = os.stat(path)
+    return [st.st_size, getattr(st, "st_mtime_ns", int(st.st_mtime * 1e9)), st.st_ino]
+
+
+def _load_stat_cache(path):
+    try:
+        return json.loads(load(path))
+    except Exception:  # Missing, corrupted or not readable, the files are hashed again
+        return {}
+
+
+def _hash_threads():
+    threads = get_env("CONAN_MANIFEST_THREADS", 0)
+    if not threads:
+        try:
+            threads = min(multiprocessing.cpu_count(), 8)
+        except NotImplementedError:
+            threads = 1
+    return threads
+
+
+def _md5sums(files, stat_cache=None):
+    """ {name: md5} of the {name: path} files, hashed in a pool of threads (hashlib releases the
+    GIL). With CONAN_MANIFEST_STAT_CACHE the md5 of the files that were not modified since the
+    previous time are taken from the stat_cache file
+    """
+    use_stat_cache = stat_cache is not None and get_env("CONAN_MANIFEST_STAT_CACHE", False)
+    entries = _load_stat_cache(stat_cache) if use_stat_cache else {}
+    result = {}
+    keys = {}
+    pending = []
+    for name, path in files.items():
+        if use_stat_cache:
+            keys[name] = _stat_key(path)
+            cached = entries.get(name)
+            if cached and cached[:-1] == keys[name]:
+                result[name] = cached[-1]
+                continue
+        pending.append(name)
+
+    threads = min(_hash_threads(), len(pending))
+    if threads > 1:
+        pool = ThreadPool(threads)
+        try:
+            sums = pool.map(md5sum, [files[name] for name in pending])
+        finally:
+            pool.close()
+            pool.join()
+    else:
+        sums = [md5sum(files[name]) for name in pending]
+    result.update(zip(pending, sums))
+
+    if use_stat_cache:
+        # The files modified in the last seconds could be modified again keeping the same mtime
+        limit = (time.time() - 2) * 1e9
+        new_entries = {name: keys[name] + [md5_] for name, md5_ in result.items()
+                       if keys[name][1] < limit}
+        if new_entries != entries:
+            try:
+                save(stat_cache, json.dumps(new_entries))
+            except (IOError, OSError) as e:  # i.e. a read-only cache
+                logger.debug("MANIFEST: Cannot save the stat cache %s: %s" % (stat_cache, str(e)))
+    return result
+
+
 class FileTreeManifest(object):
 
     def __init__(self, the_time, file_sums):
@@ -110,22 +180,23 @@ class FileTreeManifest(object):
         save(path, repr(self))
 
     @classmethod
-    def create(cls, folder, exports_sources_folder=None):
+    def create(cls, folder, exports_sources_folder=None, stat_cache=None):
         """ Walks a folder and create a FileTreeManifest for it, reading file contents
         from disk, and capturing current time
+        @param stat_cache: path of the file caching the md5 of the files by their size,
+        modification time and inode, with CONAN_MANIFEST_STAT_CACHE. It must be out of the
+        folders, not to be packaged with them
         """
         files, _ = gather_files(folder)
         for f in (PACKAGE_TGZ_NAME, EXPORT_TGZ_NAME, CONAN_MANIFEST, EXPORT_SOURCES_TGZ_NAME):
             files.pop(f, None)
 
-        file_dict = {}
-        for name, filepath in files.items():
-            file_dict[name] = md5sum(filepath)
-
         if exports_sources_folder:
             export_files, _ = gather_files(exports_sources_folder)
-            for name, filepath in export_files.items():
-                file_dict["export_source/%s" % name] = md5sum(filepath)
+            for name, path in export_files.items():
+                files["export_source/%s" % name] = path
+
+        file_dict = _md5sums(files, stat_cache)
 
         date = calendar.timegm(time.gmtime())
 
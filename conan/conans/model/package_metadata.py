@@ -10,6 +10,8 @@ class _RecipeMetadata(object):
         self._revision = None
         self.properties = {}
         self.remote = None
+        # {tgz_name: summary hash of the manifest of the files it was created from}
+        self.archives = {}
 
     @property
     def revision(self):
@@ -22,7 +24,8 @@ class _RecipeMetadata(object):
     def to_dict(self):
         ret = {"revision": self.revision,
                "remote": self.remote,
-               "properties": self.properties}
+               "properties": self.properties,
+               "archives": self.archives}
         return ret
 
     @staticmethod
@@ -31,6 +34,7 @@ class _RecipeMetadata(object):
         ret.revision = data["revision"]
         ret.remote = data.get("remote")
         ret.properties = data["properties"]
+        ret.archives = data.get("archives", {})
         ret.time = data.get("time")
         return ret
 
@@ -42,6 +46,10 @@ class _BinaryPackageMetadata(object):
         self._recipe_revision = None
         self.properties = {}
         self.remote = None
+        self.archives = {}
+        # ConanInfo.serialize_min() of the package, only valid for the revision it was stored for
+        self.info = None
+        self.info_revision = None
 
     @property
     def revision(self):
@@ -51,6 +59,18 @@ class _BinaryPackageMetadata(object):
     def revision(self, r):
         self._revision = DEFAULT_REVISION_V1 if r is None else r
 
+    def set_info(self, info):
+        """ Stores the ConanInfo projection of the current revision of the package
+        """
+        self.info = info.serialize_min()
+        self.info_revision = self.revision
+
+    def get_info(self):
+        """ The stored ConanInfo projection, or None if it was stored for other revision
+        """
+        if self.info is not None and self.info_revision == self.revision:
+            return self.info
+
     @property
     def recipe_revision(self):
         return self._recipe_revision
@@ -63,7 +83,10 @@ class _BinaryPackageMetadata(object):
         ret = {"revision": self.revision,
                "recipe_revision": self.recipe_revision,
                "remote": self.remote,
-               "properties": self.properties}
+               "properties": self.properties,
+               "archives": self.archives,
+               "info": self.info,
+               "info_revision": self.info_revision}
         return ret
 
     @staticmethod
@@ -73,6 +96,9 @@ class _BinaryPackageMetadata(object):
         ret.recipe_revision = data.get("recipe_revision")
         ret.properties = data.get("properties")
         ret.remote = data.get("remote")
+        ret.archives = data.get("archives", {})
+        ret.info = data.get("info")
+        ret.info_revision = data.get("info_revision")
         return ret
 
 
@@ -92,6 +118,15 @@ class PackageMetadata(object):
             ret.packages[pid] = _BinaryPackageMetadata.loads(v)
         return ret
 
+    def copy(self):
+        """ Copy with the same recipe and package entries, to add or remove packages without
+        modifying this one
+        """
+        ret = PackageMetadata()
+        ret.recipe = self.recipe
+        ret.packages.update(self.packages)
+        return ret
+
     def dumps(self):
         tmp = {"recipe": self.recipe.to_dict(),
                "packages": {k: v.to_dict() for k, v in self.packages.items()}}
@@ -66,6 +66,10 @@ class RestRoutes(object):
     def package_revision_file(self):
         return '%s/files/{path}' % self.package_revision
 
+    @property
+    def packages_info(self):
+        return 'conans/packages/info'
+
     # ONLY V1
     @property
     def v1_updown_file(self):
@@ -1,7 +1,10 @@
 # coding=utf-8
 
+import copy
 import os
 import platform
+import shutil
+import threading
 from contextlib import contextmanager
 
 
@@ -15,18 +18,48 @@ from conans.model.package_metadata import PackageMetadata
 from conans.model.ref import ConanFileReference
 from conans.model.ref import PackageReference
 from conans.paths import CONANFILE, SYSTEM_REQS, EXPORT_FOLDER, EXPORT_SRC_FOLDER, SRC_FOLDER, \
-    BUILD_FOLDER, PACKAGES_FOLDER, SYSTEM_REQS_FOLDER, SCM_FOLDER, PACKAGE_METADATA
-from conans.util.files import load, save, rmdir
-from conans.util.locks import Lock, NoLock, ReadLock, SimpleLock, WriteLock
+    BUILD_FOLDER, PACKAGES_FOLDER, SYSTEM_REQS_FOLDER, SCM_FOLDER, PACKAGE_METADATA, \
+    MANIFEST_STAT_CACHE
+from conans.util.files import is_dirty, load, mkdir, rmdir, save
+from conans.util.fork import fork_lock
+from conans.util.locks import Lock, NoLock, OSReadLock, OSWriteLock, ReadLock, SimpleLock, \
+    WriteLock
 from conans.util.log import logger
 
 
+# The InterProcessLock doesn't lock between threads of the same process
+_metadata_thread_lock = fork_lock(threading.RLock())
+# {path: (stat key, PackageMetadata)} of the metadata files read by this process
+_metadata_cache = {}
+
+
+def _read_metadata(path):
+    """ The PackageMetadata of the file, only read and parsed again if its modification time,
+    size or inode changed. It is shared, it must not be modified. Raises IOError or OSError if
+    the file cannot be read
+    """
+    with _metadata_thread_lock:  # Not read while other thread is saving it
+        try:
+            st = os.stat(path)
+        except OSError:
+            _metadata_cache.pop(path, None)
+            raise
+        key = st.st_mtime, st.st_size, st.st_ino
+        entry = _metadata_cache.get(path)
+        if entry is None or entry[0] != key:
+            entry = key, PackageMetadata.loads(load(path))
+            _metadata_cache[path] = entry
+        return entry[1]
+
+
 def short_path(func):
     if platform.system() == "Windows":
         from conans.util.windows import path_shortener
 
         def wrap(self, *args, **kwargs):
             p = func(self, *args, **kwargs)
+            if not p.startswith(self._base_folder):  # The lower caches are never modified
+                return p
             return path_shortener(p, self._short_paths)
 
         return wrap
@@ -35,14 +68,94 @@ def short_path(func):
 
 
 class PackageCacheLayout(object):
-    """ This is the package layout for Conan cache """
-
-    def __init__(self, base_folder, ref, short_paths, no_lock):
+    """ This is the package layout for Conan cache. The recipe, its metadata and its packages are
+    looked up in the read-only lower caches (lower_folders, the base folders of the reference in
+    them), in order, when they are not in the local cache. Everything else is local, and all the
+    modifications are done in the local cache: the recipe is copied to it before it is modified
+    """
+
+    def __init__(self, base_folder, ref, short_paths, no_lock, cache_index=None, os_locks=False,
+                 lower_folders=(), lock_timeout=None):
         assert isinstance(ref, ConanFileReference)
         self._ref = ref
         self._base_folder = os.path.normpath(base_folder)
         self._short_paths = short_paths
         self._no_lock = no_lock
+        self._cache_index = cache_index
+        self._os_locks = os_locks
+        self._lock_timeout = lock_timeout  # Seconds waiting for the OS locks, None to wait forever
+        self._lower_folders = [os.path.normpath(folder) for folder in lower_folders]
+
+    def local(self):
+        """ The layout of the reference without the lower caches, to write or remove its folders
+        """
+        if not self._lower_folders:
+            return self
+        return PackageCacheLayout(self._base_folder, self._ref, self._short_paths, self._no_lock,
+                                  cache_index=self._cache_index, os_locks=self._os_locks,
+                                  lock_timeout=self._lock_timeout)
+
+    def _lookup(self, name):
+        """ The path of the name in the local cache if it exists there, otherwise in the first
+        lower cache containing it
+        """
+        path = os.path.join(self._base_folder, name)
+        if not self._lower_folders or os.path.exists(path):
+            return path
+        # The exported files are taken from the cache of the recipe, they belong to its revision
+        key = name if name == PACKAGE_METADATA else EXPORT_FOLDER
+        for folder in [self._base_folder] + self._lower_folders:
+            if os.path.exists(os.path.join(folder, key)):
+                return os.path.join(folder, name)
+        return path
+
+    def _lower_packages(self):
+        """ {package_id: (package folder, package metadata)} of the complete packages in the lower
+        caches built from the same recipe revision
+        """
+        result = {}
+        if not self._lower_folders:
+            return result
+        try:
+            revision = self._load_metadata().recipe.revision
+        except RecipeNotFoundException:
+            return result
+        for folder in self._lower_folders:
+            try:
+                metadata = _read_metadata(os.path.join(folder, PACKAGE_METADATA))
+            except (IOError, OSError):
+                continue
+            if metadata.recipe.revision != revision:
+                continue
+            for package_id, package_metadata in metadata.packages.items():
+                package_folder = os.path.join(folder, PACKAGES_FOLDER, package_id)
+                if (package_id not in result and os.path.isdir(package_folder) and
+                        not is_dirty(package_folder)):
+                    result[package_id] = package_folder, package_metadata
+        return result
+
+    def copy_up(self):
+        """ Copies the recipe of the lower cache to the local one, to be modified there, i.e. to
+        download its sources or to build it. It has to be called with the write lock
+        """
+        names = (EXPORT_SRC_FOLDER, EXPORT_FOLDER, SCM_FOLDER, PACKAGE_METADATA)
+        for name, lower_path in [(name, self._lookup(name)) for name in names]:
+            local_path = os.path.join(self._base_folder, name)
+            if lower_path == local_path or not os.path.exists(lower_path):
+                continue
+            tmp_path = local_path + ".tmp"
+            rmdir(tmp_path)
+            if os.path.isdir(lower_path):
+                shutil.copytree(lower_path, tmp_path, symlinks=True)
+            elif name == PACKAGE_METADATA:
+                # The packages of the lower caches are merged when loading, never stored locally
+                metadata = _read_metadata(lower_path).copy()
+                metadata.packages.clear()
+                save(tmp_path, metadata.dumps())
+            else:
+                mkdir(self._base_folder)
+                shutil.copy2(lower_path, tmp_path)
+            os.rename(tmp_path, local_path)
 
     @property
     def ref(self):
@@ -53,7 +166,7 @@ class PackageCacheLayout(object):
         return self._base_folder
 
     def export(self):
-        return os.path.join(self._base_folder, EXPORT_FOLDER)
+        return self._lookup(EXPORT_FOLDER)
 
     def conanfile(self):
         export = self.export()
@@ -61,7 +174,7 @@ class PackageCacheLayout(object):
 
     @short_path
     def export_sources(self):
-        return os.path.join(self._base_folder, EXPORT_SRC_FOLDER)
+        return self._lookup(EXPORT_SRC_FOLDER)
 
     @short_path
     def source(self):
@@ -103,13 +216,25 @@ class PackageCacheLayout(object):
     def package(self, pref):
         assert isinstance(pref, PackageReference)
         assert pref.ref == self._ref
-        return os.path.join(self._base_folder, PACKAGES_FOLDER, pref.id)
+        package_folder = os.path.join(self._base_folder, PACKAGES_FOLDER, pref.id)
+        if self._lower_folders and not os.path.exists(package_folder):
+            lower_package = self._lower_packages().get(pref.id)
+            if lower_package:
+                return lower_package[0]
+        return package_folder
 
     def scm_folder(self):
-        return os.path.join(self._base_folder, SCM_FOLDER)
+        return self._lookup(SCM_FOLDER)
 
     def package_metadata(self):
-        return os.path.join(self._base_folder, PACKAGE_METADATA)
+        return self._lookup(PACKAGE_METADATA)
+
+    def manifest_stat_cache(self, pref=None):
+        """ The file caching the md5 of the files of the export folders, or of the package, to
+        compute their manifests. It is out of them, never packaged, uploaded or deployed
+        """
+        name = "%s/%s" % (PACKAGES_FOLDER, pref.id) if pref else EXPORT_FOLDER
+        return os.path.join(self._base_folder, MANIFEST_STAT_CACHE, "%s.json" % name)
 
     def recipe_manifest(self):
         return FileTreeManifest.load(self.export())
@@ -117,7 +242,8 @@ class PackageCacheLayout(object):
     def package_manifests(self, pref):
         package_folder = self.package(pref)
         readed_manifest = FileTreeManifest.load(package_folder)
-        expected_manifest = FileTreeManifest.create(package_folder)
+        expected_manifest = FileTreeManifest.create(package_folder,
+                                                    stat_cache=self.manifest_stat_cache(pref))
         return readed_manifest, expected_manifest
 
     def recipe_exists(self):
@@ -159,26 +285,60 @@ class PackageCacheLayout(object):
                         if os.path.isdir(os.path.join(packages_dir, dirname))]
         except OSError:  # if there isn't any package folder
             packages = []
+        packages.extend(package_id for package_id in self._lower_packages()
+                        if package_id not in packages)
         return packages
 
     # Metadata
-    def load_metadata(self):
+    def _load_metadata(self):
         try:
-            text = load(self.package_metadata())
-        except IOError:
+            metadata = _read_metadata(self.package_metadata())
+        except (IOError, OSError):
             raise RecipeNotFoundException(self._ref)
-        return PackageMetadata.loads(text)
+        return metadata.copy()
+
+    def load_metadata(self):
+        """ The metadata of the reference, it is cached while the file is not modified and its
+        package entries are shared, so it can only be modified with update_metadata()
+        """
+        metadata = self._load_metadata()
+        for package_id, (_, package_metadata) in self._lower_packages().items():
+            if package_id not in metadata.packages:
+                metadata.packages[package_id] = package_metadata
+        return metadata
 
     @contextmanager
     def update_metadata(self):
-        lockfile = self.package_metadata() + ".lock"
-        with fasteners.InterProcessLock(lockfile, logger=logger):
+        """ Yields the metadata to be modified, it is saved only if it changed. Several updates
+        of the same reference should be done in one, as the file is locked and written once
+        """
+        metadata_path = os.path.join(self._base_folder, PACKAGE_METADATA)  # Always the local one
+        lockfile = metadata_path + ".lock"
+        with _metadata_thread_lock, fasteners.InterProcessLock(lockfile, logger=logger):
             try:
-                metadata = self.load_metadata()
-            except RecipeNotFoundException:
-                metadata = PackageMetadata()
+                # Always read, a concurrent update could keep the same mtime and size
+                text = load(self.package_metadata())
+                metadata = PackageMetadata.loads(text)
+            except (IOError, OSError):
+                text, metadata = None, PackageMetadata()
+            # The packages of the lower caches can be updated, i.e. the remote they are uploaded
+            # to, but they are only stored locally if they are modified
+            lower_packages = {}
+            for package_id, (_, package_metadata) in self._lower_packages().items():
+                if package_id not in metadata.packages:
+                    lower_packages[package_id] = package_metadata
+                    metadata.packages[package_id] = copy.deepcopy(package_metadata)
             yield metadata
-            save(self.package_metadata(), metadata.dumps())
+            for package_id, package_metadata in lower_packages.items():
+                updated = metadata.packages.get(package_id)
+                if updated is not None and updated.to_dict() == package_metadata.to_dict():
+                    del metadata.packages[package_id]
+            new_text = metadata.dumps()
+            if new_text != text or self.package_metadata() != metadata_path:
+                save(metadata_path, new_text)
+                _metadata_cache.pop(metadata_path, None)  # Maybe saved with the same mtime
+                if self._cache_index is not None:
+                    self._cache_index.update(self._ref, metadata)
 
     # Revisions
     def package_summary_hash(self, pref):
@@ -193,11 +353,15 @@ class PackageCacheLayout(object):
     def conanfile_read_lock(self, output):
         if self._no_lock:
             return NoLock()
+        if self._os_locks:
+            return OSReadLock(self._base_folder, self._ref, output, timeout=self._lock_timeout)
         return ReadLock(self._base_folder, self._ref, output)
 
     def conanfile_write_lock(self, output):
         if self._no_lock:
             return NoLock()
+        if self._os_locks:
+            return OSWriteLock(self._base_folder, self._ref, output, timeout=self._lock_timeout)
         return WriteLock(self._base_folder, self._ref, output)
 
     def conanfile_lock_files(self, output):
@@ -25,6 +25,9 @@ class PackageEditableLayout(object):
         """ Returns the base folder for this package reference """
         return self._base_folder
 
+    def local(self):
+        return self
+
     def conanfile(self):
         """ Path to the conanfile. We can agree that an editable package
             needs to be a Conan package
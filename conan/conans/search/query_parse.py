@@ -68,6 +68,39 @@ def evaluate_postfix(postfix, evaluator):
         return stack[0]
 
 
+def _and(predicate1, predicate2):
+    return lambda value: predicate1(value) and predicate2(value)
+
+
+def _or(predicate1, predicate2):
+    return lambda value: predicate1(value) or predicate2(value)
+
+
+def compile_postfix(postfix, compiler):
+    """
+    Compiles a postfix expression into a predicate, to evaluate it many times without
+    parsing the expressions again
+    @param postfix:  Postfix expression as a list
+    @param compiler: Function that will return a predicate receiving expressions
+                     like "compiler.version=12"
+    @return: Function returning a bool for the value it receives
+    """
+    if not postfix:  # If no query return all?
+        return lambda value: True
+
+    stack = []
+    for el in postfix:
+        if not is_operator(el):
+            stack.append((el, compiler(el)))
+        else:
+            _, o1 = stack.pop()
+            _, o2 = stack.pop()
+            stack.append((None, _or(o1, o2) if el == "|" else _and(o1, o2)))
+    if len(stack) != 1:
+        raise Exception("Bad stack: %s" % str([el for el, _ in stack]))
+    return stack[0][1]
+
+
 def infix_to_postfix(exp):
     """
     Translates an infix expression to postfix using an standard algorithm
@@ -7,7 +7,7 @@ from conans.errors import ConanException, RecipeNotFoundException
 from conans.model.info import ConanInfo
 from conans.model.ref import ConanFileReference, PackageReference
 from conans.paths import CONANINFO
-from conans.search.query_parse import evaluate_postfix, infix_to_postfix
+from conans.search.query_parse import compile_postfix, infix_to_postfix
 from conans.util.files import list_folder_subdirs, load
 from conans.util.log import logger
 
@@ -48,57 +48,59 @@ def filter_packages(query, package_infos):
             raise ConanException("'not' operator is not allowed")
         postfix = infix_to_postfix(query) if query else []
         result = OrderedDict()
+        if not package_infos:
+            return result
+        # Compiled once, the expressions are not parsed again for every package
+        predicate = compile_postfix(postfix, _compile_expression)
         for package_id, info in package_infos.items():
-            if evaluate_postfix_with_info(postfix, info):
+            if predicate(info):
                 result[package_id] = info
         return result
     except Exception as exc:
         raise ConanException("Invalid package query: %s. %s" % (query, exc))
 
 
-def evaluate_postfix_with_info(postfix, conan_vars_info):
-
-    # Evaluate conaninfo with the expression
-
-    def evaluate_info(expression):
-        """Receives an expression like compiler.version="12"
-        Uses conan_vars_info in the closure to evaluate it"""
-        name, value = expression.split("=", 1)
-        value = value.replace("\"", "")
-        return evaluate(name, value, conan_vars_info)
-
-    return evaluate_postfix(postfix, evaluate_info)
-
-
-def evaluate(prop_name, prop_value, conan_vars_info):
-    """
-    Evaluates a single prop_name, prop_value like "os", "Windows" against
-    conan_vars_info.serialize_min()
-    """
-
-    def compatible_prop(setting_value, prop_value):
-        return (prop_value == setting_value) or (prop_value == "None" and setting_value is None)
-
-    info_settings = conan_vars_info.get("settings", [])
-    info_options = conan_vars_info.get("options", [])
-
+def _compile_expression(expression):
+    """Receives an expression like compiler.version="12" and returns the function evaluating
+    it against conan_vars_info.serialize_min()"""
+    prop_name, prop_value = expression.split("=", 1)
+    prop_value = prop_value.replace("\"", "")
     if (prop_name in ["os", "os_build", "compiler", "arch", "arch_build", "build_type"] or
             prop_name.startswith("compiler.")):
-        return compatible_prop(info_settings.get(prop_name, None), prop_value)
+        section = "settings"
     else:
-        return compatible_prop(info_options.get(prop_name, None), prop_value)
+        section = "options"
+
+    if prop_value == "None":
+        def evaluate_info(conan_vars_info):
+            setting_value = conan_vars_info.get(section, {}).get(prop_name, None)
+            return setting_value == prop_value or setting_value is None
+    else:
+        def evaluate_info(conan_vars_info):
+            return conan_vars_info.get(section, {}).get(prop_name, None) == prop_value
+    return evaluate_info
 
 
 def search_recipes(cache, pattern=None, ignorecase=True):
     # Conan references in main storage
+    prefix = None
     if pattern:
         if isinstance(pattern, ConanFileReference):
             pattern = str(pattern)
+        # The matched references always start with the pattern until its first wildcard
+        prefix = re.split(r"[*?\[]", pattern, 1)[0]
         pattern = translate(pattern)
         pattern = re.compile(pattern, re.IGNORECASE) if ignorecase else re.compile(pattern)
 
-    subdirs = list_folder_subdirs(basedir=cache.store, level=4)
-    refs = [ConanFileReference(*folder.split("/")) for folder in subdirs]
+    if cache.cache_index:
+        refs = cache.cache_index.refs(prefix, ignorecase)
+    else:
+        subdirs = list_folder_subdirs(basedir=cache.store, level=4)
+        refs = [ConanFileReference(*folder.split("/")) for folder in subdirs]
+    if cache.lower_stores:
+        refs = set(refs)
+        refs.update(cache.lower_refs(prefix, ignorecase))
+        refs = list(refs)
     refs.extend(cache.editable_packages.edited_refs.keys())
     if pattern:
         refs = [r for r in refs if _partial_match(pattern, r)]
@@ -129,7 +131,8 @@ def search_packages(package_layout, query):
                            settings: {os: Windows}}}
     param package_layout: Layout for the given reference
     """
-    if not os.path.exists(package_layout.base_folder()) or (
+    if not (os.path.exists(package_layout.base_folder()) or
+            os.path.exists(package_layout.export())) or (
             package_layout.ref.revision and
             package_layout.recipe_revision() != package_layout.ref.revision):
         raise RecipeNotFoundException(package_layout.ref, print_rev=True)
@@ -140,24 +143,27 @@ def search_packages(package_layout, query):
 def _get_local_infos_min(package_layout):
     result = OrderedDict()
 
-    packages_path = package_layout.packages()
-    subdirs = list_folder_subdirs(packages_path, level=1)
-    for package_id in subdirs:
+    try:
+        metadata = package_layout.load_metadata()
+    except RecipeNotFoundException:  # Old cache without metadata
+        metadata = None
+    for package_id in package_layout.conan_packages():
         # Read conaninfo
         pref = PackageReference(package_layout.ref, package_id)
         info_path = os.path.join(package_layout.package(pref), CONANINFO)
         if not os.path.exists(info_path):
             logger.error("There is no ConanInfo: %s" % str(info_path))
             continue
-        conan_info_content = load(info_path)
 
-        info = ConanInfo.loads(conan_info_content)
-        if package_layout.ref.revision:
-            metadata = package_layout.load_metadata()
-            recipe_revision = metadata.packages[package_id].recipe_revision
+        package_metadata = metadata.packages.get(package_id) if metadata else None
+        if package_layout.ref.revision and package_metadata:
+            recipe_revision = package_metadata.recipe_revision
             if recipe_revision and recipe_revision != package_layout.ref.revision:
                 continue
-        conan_vars_info = info.serialize_min()
+        conan_vars_info = package_metadata.get_info() if package_metadata else None
+        if conan_vars_info is None:
+            info = ConanInfo.loads(load(info_path))
+            conan_vars_info = info.serialize_min()
         result[package_id] = conan_vars_info
 
     return result
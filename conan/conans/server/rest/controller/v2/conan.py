@@ -1,7 +1,7 @@
 from bottle import request
 
 from conans.errors import NotFoundException
-from conans.model.ref import ConanFileReference
+from conans.model.ref import ConanFileReference, PackageReference
 from conans.server.rest.bottle_routes import BottleRoutes
 from conans.server.rest.controller.v2 import get_package_ref
 from conans.server.service.v2.service_v2 import ConanServiceV2
@@ -42,6 +42,12 @@ class ConanControllerV2(object):
             conan_service.upload_package_file(request.body, request.headers, pref,
                                               the_path, auth_user)
 
+        @app.route(r.packages_info, method=["POST"])
+        def get_packages_info(auth_user):
+            prefs = [PackageReference.loads(pref) for pref in request.json["packages"]]
+            ret = conan_service.get_packages_info(prefs, auth_user)
+            return {"packages": {pref.full_repr(): info for pref, info in ret.items()}}
+
         @app.route(r.recipe_revision_files, method=["GET"])
         def get_recipe_file_list(name, version, username, channel, auth_user, revision):
             ref = ConanFileReference(name, version, username, channel, revision)
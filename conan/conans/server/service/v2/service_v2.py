@@ -3,10 +3,11 @@ import os
 from bottle import FileUpload, static_file
 
 from conans.errors import RecipeNotFoundException, PackageNotFoundException
+from conans.paths import CONAN_MANIFEST, CONANINFO
 from conans.server.service.common.common import CommonService
 from conans.server.service.mime import get_mime_type
 from conans.server.store.server_store import ServerStore
-from conans.util.files import mkdir
+from conans.util.files import load, mkdir
 
 
 class ConanServiceV2(CommonService):
@@ -71,6 +72,34 @@ class ConanServiceV2(CommonService):
             raise PackageNotFoundException(pref, print_rev=True)
         return tmp
 
+    def get_packages_info(self, prefs, auth_user):
+        """ Returns the full reference, with the latest revisions if not given, and the contents of
+        the manifest and the conaninfo of every existing package of the list, so a client can
+        evaluate many binaries with a single request. The missing packages are not included
+        """
+        ret = {}
+        for requested_pref in prefs:
+            pref = requested_pref
+            self._authorizer.check_read_conan(auth_user, pref.ref)
+            if pref.ref.revision is None:
+                latest = self._server_store.get_last_revision(pref.ref)
+                if not latest:
+                    continue
+                pref = pref.copy_with_revs(latest.revision, pref.revision)
+            if pref.revision is None:
+                latest = self._server_store.get_last_package_revision(pref)
+                if not latest:
+                    continue
+                pref = pref.copy_with_revs(pref.ref.revision, latest.revision)
+            manifest_path = self._server_store.get_package_file_path(pref, CONAN_MANIFEST)
+            info_path = self._server_store.get_package_file_path(pref, CONANINFO)
+            if not os.path.exists(manifest_path) or not os.path.exists(info_path):
+                continue
+            ret[requested_pref] = {"reference": pref.full_repr(),
+                                   "manifest": load(manifest_path),
+                                   "conaninfo": load(info_path)}
+        return ret
+
     # PACKAGE METHODS
     def get_package_file_list(self, pref, auth_user):
         self._authorizer.check_read_conan(auth_user, pref.ref)
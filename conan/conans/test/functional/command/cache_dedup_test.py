@@ -0,0 +1,136 @@
+import os
+import platform
+import stat
+import textwrap
+import unittest
+from collections import OrderedDict
+
+from mock import patch
+
+from conans.client.cache.blob_store import BlobStore
+from conans.client.cache.cache import BLOBS_FOLDER
+from conans.model.ref import ConanFileReference, PackageReference
+from conans.test.utils.tools import TestClient, TestServer
+from conans.util.files import load, walk
+
+conanfile = textwrap.dedent("""
+    import os
+    from conans import ConanFile
+    from conans.tools import save
+
+    class Pkg(ConanFile):
+        name = "Pkg"
+        version = "0.1"
+        settings = "os"
+
+        def package(self):
+            save(os.path.join(self.package_folder, "include", "header.h"), "header")
+            save(os.path.join(self.package_folder, "lib", "lib.a"), "lib %s" % self.settings.os)
+            save(os.path.join(self.package_folder, "bin", "tool"), "tool")
+            os.chmod(os.path.join(self.package_folder, "bin", "tool"), 0o755)
+            save(os.path.join(self.package_folder, "bin", "data"), "tool")
+    """)
+
+
+@unittest.skipIf(platform.system() == "Windows", "Hardlinks are not always supported")
+class CacheDedupTest(unittest.TestCase):
+
+    def setUp(self):
+        self.servers = OrderedDict([("default", TestServer())])
+        self.users = {"default": [("lasote", "mypass")]}
+        self.client = TestClient(servers=self.servers, users=self.users)
+        self.client.run("config set general.cache_dedup=True")
+        self.client.save({"conanfile.py": conanfile})
+        self.ref = ConanFileReference.loads("Pkg/0.1@lasote/stable")
+
+    def _files(self, package_id):
+        layout = self.client.cache.package_layout(self.ref)
+        folder = layout.package(PackageReference(self.ref, package_id))
+        return {name: os.stat(os.path.join(folder, name))
+                for name in ("include/header.h", "lib/lib.a", "bin/tool", "bin/data")}
+
+    def _blobs(self):
+        return sorted(f for _, _, files in walk(os.path.join(self.client.cache.store,
+                                                             BLOBS_FOLDER))
+                      for f in files)
+
+    def _package_ids(self):
+        self.client.run("search Pkg/0.1@lasote/stable --raw")
+        return [line.split(":")[1].strip() for line in str(self.client.out).splitlines()
+                if "Package_ID" in line]
+
+    def _check_deduplicated(self):
+        windows, linux = self._package_ids()
+        windows_files, linux_files = self._files(windows), self._files(linux)
+        self.assertTrue(os.path.samestat(windows_files["include/header.h"],
+                                         linux_files["include/header.h"]))
+        self.assertFalse(os.path.samestat(windows_files["lib/lib.a"], linux_files["lib/lib.a"]))
+        # Same content, different permissions
+        self.assertFalse(os.path.samestat(windows_files["bin/tool"], windows_files["bin/data"]))
+        self.assertTrue(windows_files["bin/tool"].st_mode & stat.S_IXUSR)
+        self.assertEqual(3, windows_files["include/header.h"].st_nlink)
+        # header.h, data, tool, lib.a * 2, conaninfo.txt * 2
+        self.assertEqual(7, len(self._blobs()))
+
+    def test_create_remove(self):
+        self.client.run("create . lasote/stable -s os=Windows")
+        self.client.run("create . lasote/stable -s os=Linux")
+        self._check_deduplicated()
+        windows, linux = self._package_ids()
+        package_folder = self.client.cache.package_layout(self.ref).package(
+            PackageReference(self.ref, linux))
+        self.assertEqual("lib Linux", load(os.path.join(package_folder, "lib", "lib.a")))
+
+        self.client.run("remove Pkg/0.1@lasote/stable -p %s -f" % windows)
+        self.assertEqual(5, len(self._blobs()))
+        self.assertEqual(2, self._files(linux)["include/header.h"].st_nlink)
+        self.client.run("remove * -f")
+        self.assertEqual([], self._blobs())
+
+    def test_download(self):
+        self.client.run("create . lasote/stable -s os=Windows")
+        self.client.run("create . lasote/stable -s os=Linux")
+        self.client.run("upload * --all --confirm")
+        self.client.run("remove * -f")
+
+        self.client.run("install Pkg/0.1@lasote/stable -s os=Windows")
+        self.client.run("install Pkg/0.1@lasote/stable -s os=Linux")
+        self._check_deduplicated()
+        self.client.run("upload * --all --confirm")  # The manifests are still valid
+
+    def test_download_links_on_extract(self):
+        self.client.run("create . lasote/stable -s os=Windows")
+        self.client.run("create . lasote/stable -s os=Linux")
+        self.client.run("upload * --all --confirm")
+        windows, linux = self._package_ids()
+        self.client.run("remove Pkg/0.1@lasote/stable -p %s -f" % linux)
+
+        # The links of the files are checked before the package is linked after extracting it
+        extracted = {}
+        link_package = BlobStore.link_package
+
+        def check_links(store, package_folder):
+            for name in ("include/header.h", "lib/lib.a"):
+                extracted[name] = os.stat(os.path.join(package_folder, name)).st_nlink
+            link_package(store, package_folder)
+
+        with patch.object(BlobStore, "link_package", autospec=True, side_effect=check_links):
+            self.client.run("install Pkg/0.1@lasote/stable -s os=Linux")
+        self.assertIn("Downloading conan_package.tgz", self.client.out)
+        # header.h is linked to the blob of the Windows package, lib.a is new
+        self.assertEqual({"include/header.h": 3, "lib/lib.a": 1}, extracted)
+        self._check_deduplicated()
+
+    def test_export_pkg(self):
+        self.client.run("create . lasote/stable -s os=Windows")
+        self.client.run("install . -s os=Linux")
+        self.client.run("export-pkg . lasote/stable -s os=Linux")
+        self._check_deduplicated()
+
+    def test_disabled(self):
+        self.client.run("config set general.cache_dedup=False")
+        self.client.run("create . lasote/stable -s os=Windows")
+        self.client.run("create . lasote/stable -s os=Linux")
+        windows, linux = self._package_ids()
+        self.assertEqual(1, self._files(windows)["include/header.h"].st_nlink)
+        self.assertEqual([], self._blobs())
@@ -0,0 +1,125 @@
+import os
+import platform
+import re
+import textwrap
+import time
+import unittest
+
+from mock import patch
+
+from conans.model.ref import ConanFileReference, PackageReference
+from conans.test.utils.tools import TestClient
+
+conanfile = textwrap.dedent("""
+    import os
+    from conans import ConanFile
+    from conans.tools import save
+
+    class Pkg(ConanFile):
+        name = "Pkg"
+        version = "0.1"
+        settings = "os"
+
+        def package(self):
+            save(os.path.join(self.package_folder, "data"), "x" * 400000)
+    """)
+
+DAY = 24 * 3600
+
+
+class CacheGCTest(unittest.TestCase):
+
+    def setUp(self):
+        self.client = TestClient()
+        self.client.save({"conanfile.py": conanfile})
+        self.ref = ConanFileReference.loads("Pkg/0.1@user/channel")
+        self.ids = {}
+        for os_ in ("Windows", "Linux", "Macos"):
+            self.client.run("create . user/channel -s os=%s" % os_)
+            self.ids[os_] = re.search(r"Package '(\w+)' created", str(self.client.out)).group(1)
+        self.layout = self.client.cache.package_layout(self.ref)
+        # Windows used 40 days ago, Linux 20 days ago, Macos 10 days ago
+        for days, os_ in ((40, "Windows"), (20, "Linux"), (10, "Macos")):
+            self._set_last_use(self._package(os_), days)
+
+    def _package(self, os_):
+        return self.layout.package(PackageReference(self.ref, self.ids[os_]))
+
+    @staticmethod
+    def _set_last_use(folder, days):
+        timestamp = time.time() - days * DAY
+        os.utime(folder, (timestamp, timestamp))
+
+    def _packages(self):
+        return sorted(os_ for os_ in self.ids if os.path.exists(self._package(os_)))
+
+    def test_max_age(self):
+        self._set_last_use(self.layout.source(), 50)
+        self.client.run("cache gc --max-age 30d")
+        self.assertIn("Pkg/0.1@user/channel: Removed package %s" % self.ids["Windows"],
+                      self.client.out)
+        self.assertIn("Pkg/0.1@user/channel: Removed source", self.client.out)
+        self.assertEqual(["Linux", "Macos"], self._packages())
+        self.assertFalse(os.path.exists(self.layout.source()))
+        self.assertEqual(3, len(self.layout.conan_builds()))
+
+        self.client.run("search Pkg/0.1@user/channel")
+        self.assertNotIn(self.ids["Windows"], self.client.out)
+        self.assertIn(self.ids["Linux"], self.client.out)
+
+    def test_max_size(self):
+        # The least recently used ones are removed until the rest fit
+        self.client.run("cache gc --max-size 1M")
+        self.assertEqual(["Linux", "Macos"], self._packages())
+        self.assertEqual(3, len(self.layout.conan_builds()))
+        self.client.run("cache gc --max-size=500KB")
+        self.assertEqual(["Macos"], self._packages())
+        self.client.run("cache gc --max-size=0")
+        self.assertEqual([], self._packages())
+        self.assertEqual([], self.layout.conan_builds())
+        self.assertIn("Freed", self.client.out)
+
+    @unittest.skipIf(platform.system() == "Windows", "Hardlinks are not always supported")
+    def test_max_size_dedup(self):
+        # The 3 packages are linked to the same blob, it is counted only once
+        self.client.run("config set general.cache_dedup=True")
+        for os_ in ("Windows", "Linux", "Macos"):
+            self.client.run("create . user/channel -s os=%s" % os_)
+        self.client.run("cache gc --max-size=500KB")
+        self.assertEqual(["Linux", "Macos", "Windows"], self._packages())
+        self.assertNotIn("Freed", self.client.out)
+        # Removing the least recently used ones doesn't free the blob, all of them are removed
+        self.client.run("cache gc --max-size=300KB")
+        self.assertEqual([], self._packages())
+
+    def test_max_age_sizes(self):
+        # Only the removed folders are measured
+        with patch("conans.client.cmd.cache_gc._folder_size", return_value=100) as folder_size:
+            self.client.run("cache gc --max-age 30d")
+        self.assertEqual(["Linux", "Macos"], self._packages())
+        self.assertEqual([self._package("Windows")],
+                         [call_args[0][0] for call_args in folder_size.call_args_list])
+        self.assertIn("Freed 100B of the cache\n", self.client.out)
+
+    def test_used_packages(self):
+        self.client.run("install Pkg/0.1@user/channel -s os=Windows")
+        self.client.run("cache gc --max-age 5d")
+        self.assertEqual(["Windows"], self._packages())
+
+    def test_gc_after_install(self):
+        self.client.run("config set general.cache_max_age=30d")
+        self.client.run("install Pkg/0.1@user/channel -s os=Linux")
+        self.assertEqual(["Linux", "Macos"], self._packages())
+
+        # The installed packages are always kept
+        self.client.run("config set general.cache_max_size=0")
+        self.client.run("install Pkg/0.1@user/channel -s os=Linux")
+        self.assertEqual(["Linux"], self._packages())
+
+    def test_errors(self):
+        self.client.run("cache gc", assert_error=True)
+        self.assertIn("Specify --max-size and/or --max-age", self.client.out)
+        self.client.run("cache gc --max-size=10X", assert_error=True)
+        self.assertIn("Invalid size '10X'", self.client.out)
+        self.client.run("cache gc --max-age=1y", assert_error=True)
+        self.assertIn("Invalid age '1y'", self.client.out)
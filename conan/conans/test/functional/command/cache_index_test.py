@@ -0,0 +1,92 @@
+import os
+import unittest
+from collections import OrderedDict
+
+from conans.client.cache.cache import CACHE_INDEX
+from conans.model.package_metadata import PackageMetadata
+from conans.paths import PACKAGE_METADATA
+from conans.test.utils.conanfile import TestConanFile
+from conans.test.utils.tools import TestClient, TestServer
+from conans.util.files import load, rmdir, save
+
+
+class CacheIndexTest(unittest.TestCase):
+
+    def setUp(self):
+        self.servers = OrderedDict([("default", TestServer())])
+        self.client = TestClient(servers=self.servers, users={"default": [("lasote", "mypass")]})
+        for name, version in (("Hello", "0.1"), ("Hello", "0.2"), ("Bye", "0.1")):
+            self.client.save({"conanfile.py": str(TestConanFile(name, version))},
+                             clean_first=True)
+            self.client.run("create . lasote/stable")
+        self.client.run("upload * --all --confirm")
+
+    def _search(self, pattern=""):
+        self.client.run("search %s --raw" % pattern)
+        return str(self.client.out).splitlines()
+
+    def test_same_results(self):
+        patterns = ["", "Hello*", "hello*", "Hello/0.1@*", "*0.1*", "Bye/0.1@lasote/stable",
+                    "Hel?o*", "[BH]*", "Nothing*"]
+        searches = [self._search(pattern) for pattern in patterns]
+
+        self.client.run("config set general.cache_index=True")
+        self.assertEqual(searches, [self._search(pattern) for pattern in patterns])
+        self.assertTrue(os.path.exists(os.path.join(self.client.cache.store, CACHE_INDEX)))
+
+        self.client.run("search hello* --case-sensitive --raw")
+        self.assertNotIn("Hello", self.client.out)
+
+        # Disabled it is removed, it would be outdated
+        self.client.run("config set general.cache_index=False")
+        self.client.run("search")
+        self.assertFalse(os.path.exists(os.path.join(self.client.cache.store, CACHE_INDEX)))
+
+    def test_updated(self):
+        self.client.run("config set general.cache_index=True")
+        self.client.run("config index --check")
+        self.assertIn("The cache index is consistent with the cache", self.client.out)
+
+        self.client.save({"conanfile.py": str(TestConanFile("Other", "0.1"))}, clean_first=True)
+        self.client.run("export . lasote/stable")
+        self.client.run("remove Hello/0.1@lasote/stable -f")
+        self.client.run("remove Hello/0.2@lasote/stable -p -f")
+        self.client.run("install Bye/0.1@lasote/stable --build")
+        self.client.run("install Hello/0.1@lasote/stable")
+        self.client.run("remote remove default")
+        self.assertEqual(["Bye/0.1@lasote/stable", "Hello/0.1@lasote/stable",
+                          "Hello/0.2@lasote/stable", "Other/0.1@lasote/stable"],
+                         self._search())
+        self.client.run("config index --check")
+        self.assertIn("The cache index is consistent with the cache", self.client.out)
+
+    def test_check_rebuild(self):
+        self.client.run("config set general.cache_index=True")
+        self.client.run("search")
+        # Modified without updating the index
+        store = self.client.cache.store
+        rmdir(os.path.join(store, "Bye"))
+        os.rename(os.path.join(store, "Hello", "0.1", "lasote"),
+                  os.path.join(store, "Hello", "0.1", "other"))
+        metadata_path = os.path.join(store, "Hello", "0.2", "lasote", "stable", PACKAGE_METADATA)
+        metadata = PackageMetadata.loads(load(metadata_path))
+        metadata.recipe.remote = None
+        save(metadata_path, metadata.dumps())
+
+        self.client.run("config index --check", assert_error=True)
+        self.assertIn("ERROR: Bye/0.1@lasote/stable: Not in the cache", self.client.out)
+        self.assertIn("ERROR: Hello/0.1@lasote/stable: Not in the cache", self.client.out)
+        self.assertIn("ERROR: Hello/0.1@other/stable: Not in the index", self.client.out)
+        self.assertIn("ERROR: Hello/0.2@lasote/stable: Outdated metadata in the index",
+                      self.client.out)
+        self.assertIn("The cache index is not consistent with the cache", self.client.out)
+
+        self.client.run("config index --rebuild")
+        self.assertIn("The cache index has been rebuilt", self.client.out)
+        self.client.run("config index --check")
+        self.assertIn("The cache index is consistent with the cache", self.client.out)
+        self.assertEqual(["Hello/0.1@other/stable", "Hello/0.2@lasote/stable"], self._search())
+
+    def test_not_enabled(self):
+        self.client.run("config index --check", assert_error=True)
+        self.assertIn("The cache index is not enabled", self.client.out)
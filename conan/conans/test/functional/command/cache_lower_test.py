@@ -0,0 +1,180 @@
+import os
+import re
+import textwrap
+import unittest
+
+from mock import patch
+
+from conans.model.package_metadata import PackageMetadata
+from conans.model.ref import ConanFileReference, PackageReference
+from conans.paths import PACKAGE_METADATA
+from conans.test.utils.test_files import temp_folder
+from conans.test.utils.tools import TestClient, TestServer
+from conans.util.files import load, walk
+
+conanfile = textwrap.dedent("""
+    import os
+    from conans import ConanFile
+    from conans.tools import save, load
+
+    class Pkg(ConanFile):
+        name = "Pkg"
+        version = "0.1"
+        settings = "os"
+        exports_sources = "data.txt"
+
+        def build(self):
+            self.output.info("BUILDING %s" % load("data.txt"))
+
+        def package(self):
+            self.copy("data.txt")
+    """)
+
+
+def _folder_snapshot(folder):
+    return sorted((os.path.relpath(os.path.join(root, f), folder),
+                   os.path.getmtime(os.path.join(root, f)))
+                  for root, _, files in walk(folder) for f in files)
+
+
+class CacheLowerTest(unittest.TestCase):
+
+    def setUp(self):
+        self.lower = TestClient()
+        self.lower.save({"conanfile.py": conanfile, "data.txt": "lower"})
+        self.ref = ConanFileReference.loads("Pkg/0.1@user/channel")
+        self.ids = {}
+        for os_ in ("Windows", "Linux"):
+            self.lower.run("create . user/channel -s os=%s" % os_)
+            self.ids[os_] = re.search(r"Package '(\w+)' created", str(self.lower.out)).group(1)
+        self.lower_snapshot = _folder_snapshot(self.lower.cache.store)
+
+        server = TestServer(write_permissions=[("*/*@*/*", "*")])
+        self.client = TestClient(servers={"default": server},
+                                 users={"default": [("lasote", "mypass")]})
+        self.client.run('config set "storage.lower_paths=%s"' % self.lower.cache.store)
+        self.local_folder = os.path.join(self.client.cache.store, self.ref.dir_repr())
+
+    def tearDown(self):
+        # The lower cache is never modified
+        self.assertEqual(self.lower_snapshot, _folder_snapshot(self.lower.cache.store))
+
+    def _layout(self):
+        return self.client.cache.package_layout(self.ref)
+
+    def _pref(self, os_):
+        return PackageReference(self.ref, self.ids[os_])
+
+    def test_install_from_lower(self):
+        self.client.run("install Pkg/0.1@user/channel -s os=Windows")
+        self.assertIn("Pkg/0.1@user/channel: Already installed!", self.client.out)
+        lower_package = self.lower.cache.package_layout(self.ref).package(self._pref("Windows"))
+        self.assertEqual(lower_package, self._layout().package(self._pref("Windows")))
+        # Locks and metadata are local, recipe and packages are not copied
+        self.assertFalse(os.path.exists(os.path.join(self.local_folder, "export")))
+        self.assertFalse(os.path.exists(os.path.join(self.local_folder, "package")))
+
+        self.client.run("search Pkg/0.1@user/channel")
+        self.assertIn(self.ids["Windows"], self.client.out)
+        self.assertIn(self.ids["Linux"], self.client.out)
+        self.client.run("search")
+        self.assertIn("Pkg/0.1@user/channel", self.client.out)
+
+    def test_search_pattern(self):
+        self.client.save({"conanfile.py": conanfile.replace('"Pkg"', '"Other"')})
+        self.client.run("export . user/channel")
+        for pattern in ("Pkg/0.1@user/*", "pkg*", "Pkg/0.1@user/channel"):
+            self.client.run('search "%s"' % pattern)
+            self.assertIn("Pkg/0.1@user/channel", self.client.out)
+            self.assertNotIn("Other", self.client.out)
+        self.client.run('search "pkg*" --case-sensitive')
+        self.assertIn("There are no packages matching the 'pkg*' pattern", self.client.out)
+        self.client.run("search")
+        self.assertIn("Other/0.1@user/channel", self.client.out)
+        self.assertEqual(1, str(self.client.out).count("Pkg/0.1@user/channel"))
+
+        # Only the folders of the names matching the pattern are listed
+        with patch("conans.client.cache.cache.os.listdir", side_effect=os.listdir) as listdir:
+            self.client.run('search "Pkg/0.1*"')
+        self.assertEqual([self.lower.cache.store,
+                          os.path.join(self.lower.cache.store, "Pkg"),
+                          os.path.join(self.lower.cache.store, "Pkg", "0.1"),
+                          os.path.join(self.lower.cache.store, "Pkg", "0.1", "user")],
+                         [os.path.normpath(call[0][0]) for call in listdir.call_args_list])
+
+    def test_search_lower_index(self):
+        self.lower.run("config set general.cache_index=True")
+        self.lower.run("search")  # Builds the index of the lower cache
+        self.lower_snapshot = _folder_snapshot(self.lower.cache.store)
+        with patch("conans.client.cache.cache._store_refs") as store_refs:
+            self.client.run('search "Pkg*"')
+        self.assertIn("Pkg/0.1@user/channel", self.client.out)
+        self.assertFalse(store_refs.called)
+
+    def test_build_local(self):
+        self.client.run("install Pkg/0.1@user/channel -s os=Macos --build=missing")
+        self.assertIn("BUILDING lower", self.client.out)
+        macos = PackageReference(self.ref, re.search(r"Package '(\w+)' created",
+                                                     str(self.client.out)).group(1))
+        package_folder = self._layout().package(macos)
+        self.assertEqual(os.path.join(self.local_folder, "package", macos.id), package_folder)
+        self.assertEqual("lower", load(os.path.join(package_folder, "data.txt")))
+        # The recipe was copied up to be built
+        self.assertTrue(os.path.exists(os.path.join(self.local_folder, "export", "conanfile.py")))
+        self.assertEqual(3, len(self._layout().conan_packages()))
+
+        # The local package is removed, the lower ones are kept
+        self.client.run("remove Pkg/0.1@user/channel -f")
+        self.assertFalse(os.path.exists(package_folder))
+        self.client.run("install Pkg/0.1@user/channel -s os=Linux")
+        self.assertIn("Pkg/0.1@user/channel: Already installed!", self.client.out)
+
+    def test_local_metadata(self):
+        self.client.run("install Pkg/0.1@user/channel -s os=Macos --build=missing")
+        macos_id = re.search(r"Package '(\w+)' created", str(self.client.out)).group(1)
+        # The packages only in the lower cache are not stored in the local metadata
+        local_metadata = PackageMetadata.loads(load(os.path.join(self.local_folder,
+                                                                 PACKAGE_METADATA)))
+        self.assertEqual([macos_id], list(local_metadata.packages))
+        metadata = self._layout().load_metadata()
+        self.assertEqual(sorted([macos_id, self.ids["Windows"], self.ids["Linux"]]),
+                         sorted(metadata.packages))
+
+    def test_forced_build_and_export(self):
+        self.client.run("install Pkg/0.1@user/channel -s os=Linux --build")
+        self.assertIn("BUILDING lower", self.client.out)
+        local_package = os.path.join(self.local_folder, "package", self.ids["Linux"])
+        self.assertEqual(local_package, self._layout().package(self._pref("Linux")))
+
+        self.client.save({"conanfile.py": conanfile, "data.txt": "local"})
+        self.client.run("create . user/channel -s os=Windows")
+        self.assertIn("BUILDING local", self.client.out)
+        self.assertEqual(os.path.join(self.local_folder, "export"), self._layout().export())
+        self.assertEqual("local", load(os.path.join(self._layout().package(self._pref("Windows")),
+                                                    "data.txt")))
+
+    def test_cache_gc_local(self):
+        self.client.run("install Pkg/0.1@user/channel -s os=Linux --build")
+        self.client.run("cache gc --max-size=0")
+        self.assertIn("Removed package %s" % self.ids["Linux"], self.client.out)
+        self.assertNotIn(self.ids["Windows"], self.client.out)
+
+    def test_upload_lower_package(self):
+        tmp_folder = temp_folder()
+        with patch("conans.client.cmd.uploader.mkdir_tmp", return_value=tmp_folder):
+            self.client.run("upload Pkg/0.1@user/channel -p %s" % self.ids["Windows"])
+        self.assertIn("Uploading conan_package.tgz", self.client.out)
+        # The package tgz is compressed out of the lower cache and removed after the upload
+        self.assertFalse(os.path.exists(tmp_folder))
+        self.assertFalse(os.path.exists(os.path.join(self.local_folder, "package")))
+
+        self.client.run("remove * -f")
+        self.client.run("config rm storage.lower_paths")
+        self.client.run("install Pkg/0.1@user/channel -s os=Windows")
+        self.assertIn("Downloading conan_package.tgz", self.client.out)
+
+    def test_relative_path_error(self):
+        self.client.run("config set storage.lower_paths=data")
+        self.client.run("search", assert_error=True)
+        self.assertIn("Conan storage lower path 'data' has to be an absolute path",
+                      self.client.out)
@@ -0,0 +1,65 @@
+import os
+import textwrap
+import unittest
+
+from conans.model.ref import ConanFileReference, PackageReference
+from conans.paths import PACKAGE_TGZ_NAME
+from conans.test.utils.tools import TestClient, TestRequester, TestServer
+from conans.util.files import load
+
+
+class _CorruptedChecksumRequester(TestRequester):
+    """ Reports a wrong checksum the first time the package tgz is downloaded """
+    corrupted = False
+
+    def get(self, url, **kwargs):
+        response = super(_CorruptedChecksumRequester, self).get(url, **kwargs)
+        if PACKAGE_TGZ_NAME in url and not _CorruptedChecksumRequester.corrupted:
+            _CorruptedChecksumRequester.corrupted = True
+            response.headers["X-Checksum-Sha1"] = "123"
+        return response
+
+
+class InstallPackageExtractTest(unittest.TestCase):
+
+    def setUp(self):
+        self.servers = {"default": TestServer()}
+        client = TestClient(servers=self.servers, users={"default": [("lasote", "mypass")]})
+        conanfile = textwrap.dedent("""
+            from conans import ConanFile
+
+            class Hello(ConanFile):
+                name = "Hello"
+                version = "0.1"
+                exports_sources = "*.h"
+
+                def package(self):
+                    self.copy("*.h", dst="include")
+            """)
+        client.save({"conanfile.py": conanfile, "hello.h": "hello header"})
+        client.run("create . lasote/stable")
+        client.run("upload * --all --confirm")
+        self.ref = ConanFileReference.loads("Hello/0.1@lasote/stable")
+
+    def _check_package(self, client):
+        pref = PackageReference(self.ref, "5ab84d6acfe1f23c4fae0ab88f26e3a396351ac9")
+        package_folder = client.cache.package_layout(self.ref).package(pref)
+        self.assertEqual("hello header", load(os.path.join(package_folder, "include", "hello.h")))
+        self.assertTrue(os.path.exists(os.path.join(package_folder, "conaninfo.txt")))
+        self.assertFalse(os.path.exists(os.path.join(package_folder, PACKAGE_TGZ_NAME)))
+
+    def test_extract_while_downloading(self):
+        client = TestClient(servers=self.servers, users={"default": [("lasote", "mypass")]})
+        client.run("install Hello/0.1@lasote/stable")
+        self.assertIn("Downloading %s" % PACKAGE_TGZ_NAME, client.out)
+        self.assertNotIn("WARN: Error extracting", client.out)
+        self._check_package(client)
+
+    def test_fallback(self):
+        _CorruptedChecksumRequester.corrupted = False
+        client = TestClient(servers=self.servers, users={"default": [("lasote", "mypass")]},
+                            requester_class=_CorruptedChecksumRequester)
+        client.run("install Hello/0.1@lasote/stable")
+        self.assertIn("WARN: Error extracting %s while downloading it, downloading it again: "
+                      "Bad checksum of the downloaded file" % PACKAGE_TGZ_NAME, client.out)
+        self._check_package(client)
@@ -0,0 +1,105 @@
+import json
+import os
+import textwrap
+import unittest
+
+from conans.test.utils.test_files import temp_folder
+from conans.test.utils.tools import TestClient
+from conans.util.files import load
+
+
+class InstallParallelBuildsTest(unittest.TestCase):
+
+    # Every Lib build leaves a marker and waits a while for the markers of the 4 Libs,
+    # reporting how many of them were building at the same time
+    lib = textwrap.dedent("""
+        import os
+        import time
+        from conans import ConanFile
+        from conans.tools import save
+
+        class Lib(ConanFile):
+            name = "{name}"
+            version = "0.1"
+            requires = {requires}
+
+            def build(self):
+                self.output.info("Building with Base %s" % self.deps_cpp_info["Base"].version
+                                 if "Base" in self.deps_cpp_info.deps else "Building")
+                self.run("echo Running {name}")
+                if self.name != "Base":
+                    markers = r"{markers}"
+                    save(os.path.join(markers, self.name), "")
+                    timeout = time.time() + 20
+                    while len(os.listdir(markers)) < 4 and time.time() < timeout:
+                        time.sleep(0.1)
+                    self.output.info("Builds running: %d" % len(os.listdir(markers)))
+                if "{name}" in "{fail}":
+                    raise Exception("Failed {name}")
+        """)
+
+    def _client(self, fail=""):
+        client = TestClient()
+        markers = temp_folder()
+        client.save({"conanfile.py": self.lib.format(name="Base", requires="None", fail=fail,
+                                                     markers=markers)})
+        client.run("export . user/testing")
+        requires = []
+        for i in range(4):
+            name = "Lib%s" % i
+            client.save({"conanfile.py": self.lib.format(name=name, fail=fail, markers=markers,
+                                                         requires='"Base/0.1@user/testing"')},
+                        clean_first=True)
+            client.run("export . user/testing")
+            requires.append("%s/0.1@user/testing" % name)
+        client.save({"conanfile.txt": "[requires]\n%s" % "\n".join(requires)}, clean_first=True)
+        return client
+
+    def test_parallel_builds(self):
+        client = self._client()
+        client.run("config set general.parallel_builds=4")
+        client.run("install . --build=missing --json=install.json")
+
+        output = str(client.out)
+        # Base and then the 4 Libs concurrently
+        self.assertLess(output.index("Base/0.1@user/testing: Package '"),
+                        output.index("Lib0/0.1@user/testing: Building with Base 0.1"))
+        for i in range(4):
+            name = "Lib%s/0.1@user/testing" % i
+            self.assertIn("%s: Building with Base 0.1" % name, output)
+            self.assertIn("Running Lib%s" % i, output)
+            self.assertIn("%s: Builds running: 4" % name, output)
+            self.assertIn("%s: Package '" % name, output)
+        # The output of every package is written all together, in the same order
+        lines = [line for line in output.splitlines() if line.startswith("Lib")]
+        builds = [line.split(":")[0] for line in lines if "Building with Base" in line]
+        self.assertEqual(builds, ["Lib%s/0.1@user/testing" % i for i in range(4)])
+        self.assertLess(output.index("Running Lib0"), output.index("Lib1/0.1@user/testing: "
+                                                                   "Building with Base"))
+
+        installed = json.loads(load(os.path.join(client.current_folder, "install.json")))
+        for item in installed["installed"]:
+            self.assertTrue(item["packages"][0]["built"])
+            self.assertIn("cpp_info", item["packages"][0])
+
+        client.run("install .")
+        for i in range(4):
+            self.assertIn("Lib%s/0.1@user/testing: Already installed!" % i, client.out)
+
+    def test_parallel_builds_error(self):
+        client = self._client(fail="Lib1 Lib2")
+        client.run("config set general.parallel_builds=4")
+        client.run("install . --build=missing", assert_error=True)
+        # All the builds of the level finish, the first failing one is reported
+        self.assertIn("Lib0/0.1@user/testing: Package '", client.out)
+        self.assertIn("Lib3/0.1@user/testing: Package '", client.out)
+        self.assertIn("Lib2/0.1@user/testing: ERROR: Package '", client.out)
+        self.assertIn("ERROR: Lib1/0.1@user/testing: Error in build() method, line 24\n"
+                      "\traise Exception(\"Failed Lib1\")", client.out)
+        self.assertNotIn("ERROR: Lib2/0.1@user/testing", client.out)
+
+        client.run("install . --build=missing --json=install.json", assert_error=True)
+        installed = json.loads(load(os.path.join(client.current_folder, "install.json")))
+        errors = {item["recipe"]["id"]: item["packages"][0]["error"]
+                  for item in installed["installed"] if item["packages"][0]["error"]}
+        self.assertEqual(["Lib1/0.1@user/testing", "Lib2/0.1@user/testing"], sorted(errors))
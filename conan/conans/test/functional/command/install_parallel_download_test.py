@@ -0,0 +1,155 @@
+import json
+import os
+import textwrap
+import threading
+import time
+import unittest
+
+from conans.test.utils.conanfile import TestConanFile
+from conans.test.utils.test_files import temp_folder
+from conans.test.utils.tools import TestClient, TestRequester, TestServer
+from conans.util.files import load, save
+
+# Leaves a marker while building and waits a while for the download of Lib3, reporting if it
+# was downloaded while building
+lib1 = textwrap.dedent("""
+    import os
+    import time
+    from conans import ConanFile
+    from conans.tools import load, save
+
+    class Lib1(ConanFile):
+        name = "Lib1"
+        version = "0.1"
+        requires = "Base/0.1@lasote/stable"
+
+        def build(self):
+            save(os.path.join(r"{markers}", "Lib1"), "")
+            marker = os.path.join(r"{markers}", "Lib3")
+            timeout = time.time() + 20
+            while not os.path.exists(marker) and time.time() < timeout:
+                time.sleep(0.1)
+            self.output.info("Lib3 downloaded while building: %s"
+                             % (os.path.exists(marker) and load(marker)))
+    """)
+
+
+class _MarkerRequester(TestRequester):
+    """ With wait_build, the download of the Lib3 package waits a while for the build of Lib1 to
+    start, leaving a marker that tells if it was building
+    """
+    markers = None
+    wait_build = False
+
+    def get(self, url, **kwargs):
+        if _MarkerRequester.wait_build and "conan_package.tgz" in url and "Lib3" in url:
+            building = os.path.join(_MarkerRequester.markers, "Lib1")
+            timeout = time.time() + 5
+            while not os.path.exists(building) and time.time() < timeout:
+                time.sleep(0.1)
+            save(os.path.join(_MarkerRequester.markers, "Lib3"), str(os.path.exists(building)))
+        return super(_MarkerRequester, self).get(url, **kwargs)
+
+
+class InstallParallelDownloadTest(unittest.TestCase):
+
+    def setUp(self):
+        self.servers = {"default": TestServer()}
+        client = TestClient(servers=self.servers, users={"default": [("lasote", "mypass")]})
+        # Graph: Consumer -> Lib0..Lib3 -> Base
+        client.save({"conanfile.py": str(TestConanFile("Base", "0.1"))})
+        client.run("create . lasote/stable")
+        self.requires = []
+        _MarkerRequester.markers = temp_folder()
+        save(os.path.join(_MarkerRequester.markers, "Lib3"), "")  # Not to wait in its create
+        self.addCleanup(setattr, _MarkerRequester, "wait_build", False)
+        for i in range(4):
+            name = "Lib%s" % i
+            conanfile = str(TestConanFile(name, "0.1", requires=["Base/0.1@lasote/stable"]))
+            if name == "Lib1":
+                conanfile = lib1.format(markers=_MarkerRequester.markers)
+            client.save({"conanfile.py": conanfile}, clean_first=True)
+            client.run("create . lasote/stable")
+            self.requires.append("%s/0.1@lasote/stable" % name)
+        client.run("upload * --all --confirm")
+        for name in ("Lib1", "Lib3"):
+            os.remove(os.path.join(_MarkerRequester.markers, name))
+
+    def _install(self, parallel_download=None, build="", parallel_builds=None):
+        client = TestClient(servers=self.servers, users={"default": [("lasote", "mypass")]},
+                            requester_class=_MarkerRequester)
+        if parallel_download:
+            client.run("config set general.parallel_download=%s" % parallel_download)
+        if parallel_builds:
+            client.run("config set general.parallel_builds=%s" % parallel_builds)
+        client.save({"conanfile.py": str(TestConanFile("Consumer", "0.1",
+                                                       requires=self.requires))})
+        client.run("install . %s --json=install.json" % build)
+        # Only the packages output, the transfers progress is not scoped and can be interleaved
+        output = [line for line in str(client.out).splitlines()
+                  if line.startswith(("Lib", "Base"))]
+        installed = json.loads(load(os.path.join(client.current_folder, "install.json")))
+        packages = {item["recipe"]["id"]: item["packages"][0] for item in installed["installed"]}
+        return client, output, {ref: (package["downloaded"], package["built"])
+                                for ref, package in packages.items()}
+
+    def test_same_output(self):
+        _, sequential_output, sequential_packages = self._install()
+        client, parallel_output, parallel_packages = self._install(parallel_download=4)
+        self.assertEqual(sequential_output, parallel_output)
+        self.assertEqual(sequential_packages, parallel_packages)
+        for require in self.requires + ["Base/0.1@lasote/stable"]:
+            self.assertIn("%s: Downloaded package revision" % require, "\n".join(parallel_output))
+
+        client.run("install .")
+        for require in self.requires:
+            self.assertIn("%s: Already installed!" % require, client.out)
+
+    def _check_download_while_building(self, parallel_builds=None):
+        _MarkerRequester.wait_build = True
+        client, output, packages = self._install(parallel_download=4, build="--build=Lib1",
+                                                 parallel_builds=parallel_builds)
+        self.assertIn("Lib1/0.1@lasote/stable: Building your package in ", "\n".join(output))
+        # Lib3 is after Lib1 in the graph, but its download doesn't wait for the build
+        self.assertIn("Lib1/0.1@lasote/stable: Lib3 downloaded while building: True", output)
+        for require in ("Lib0/0.1@lasote/stable", "Lib2/0.1@lasote/stable"):
+            self.assertIn("%s: Downloaded package revision" % require, "\n".join(output))
+        self.assertEqual((False, True), packages["Lib1/0.1@lasote/stable"])
+        self.assertEqual((True, False), packages["Lib0/0.1@lasote/stable"])
+
+    def test_download_while_building(self):
+        self._check_download_while_building()
+
+    def test_download_while_building_parallel(self):
+        # The builds in forked processes don't wait for the downloads either
+        self._check_download_while_building(parallel_builds=2)
+
+    def test_missing_binary(self):
+        client = TestClient(servers=self.servers, users={"default": [("lasote", "mypass")]})
+        client.save({"conanfile.py": str(TestConanFile("Pkg", "0.1"))})
+        client.run("export . lasote/stable")
+        client.run("config set general.parallel_download=4")
+        client.save({"conanfile.py": str(TestConanFile("Consumer", "0.1",
+                                                       requires=["Lib0/0.1@lasote/stable",
+                                                                 "Pkg/0.1@lasote/stable"]))},
+                    clean_first=True)
+        # The pending downloads are finished before reporting the error
+        client.run("install .", assert_error=True)
+        self.assertIn("ERROR: Missing prebuilt package for 'Pkg/0.1@lasote/stable'", client.out)
+        client.run("install . --build=missing")
+        self.assertIn("Lib0/0.1@lasote/stable: Already installed!", client.out)
+        self.assertIn("Pkg/0.1@lasote/stable: Created package revision", client.out)
+
+    def test_no_threads_left(self):
+        # The threads transferring the files are finished with the commands
+        client = TestClient(servers=self.servers, users={"default": [("lasote", "mypass")]},
+                            revisions_enabled=True)
+        client.run("config set general.parallel_download=4")
+        client.save({"conanfile.py": str(TestConanFile("Pkg", "0.1"))})
+        client.run("create . lasote/stable")
+        threads = threading.active_count()
+        client.run("upload Pkg* --all --confirm")
+        client.run("remove * -f")
+        client.run("install Pkg/0.1@lasote/stable")
+        self.assertIn("Pkg/0.1@lasote/stable: Downloaded package revision", client.out)
+        self.assertEqual(threads, threading.active_count())
@@ -1379,3 +1379,38 @@ class SearchRemoteAllTestCase(unittest.TestCase):
         self.assertIn("all: http://fake", self.client.out)
         self.client.run("search -r {} {}".format(self.remote_name, self.reference))
         self.assertIn("Existing recipe in remote 'all':", self.client.out)  # Searching in 'all'
+
+
+class SearchPackagesInfoCacheTest(unittest.TestCase):
+
+    def test_cached_info(self):
+        client = TestClient()
+        conanfile = textwrap.dedent("""
+            from conans import ConanFile
+            class MyLib(ConanFile):
+                settings = "os"
+            """)
+        client.save({"conanfile.py": conanfile})
+        client.run("create . lib/1.0@user/channel -s os=Windows")
+        client.run("export-pkg . lib/1.0@user/channel -s os=Linux")
+        ref = ConanFileReference.loads("lib/1.0@user/channel")
+        layout = client.cache.package_layout(ref)
+        metadata = layout.load_metadata()
+        self.assertEqual(2, len(metadata.packages))
+        for package_id, package_metadata in metadata.packages.items():
+            info_path = os.path.join(layout.package(PackageReference(ref, package_id)),
+                                     CONANINFO)
+            self.assertEqual(package_metadata.revision, package_metadata.info_revision)
+            # The conaninfo.txt is not read while the revision is the same
+            save(info_path, load(info_path).replace("os=", "os=Cached"))
+
+        client.run("search lib/1.0@user/channel -q os=Linux")
+        self.assertIn("os: Linux", client.out)
+        self.assertNotIn("os: Windows", client.out)
+
+        with layout.update_metadata() as metadata:
+            for package_metadata in metadata.packages.values():
+                package_metadata.revision = "other"
+        client.run("search lib/1.0@user/channel")
+        self.assertIn("os: CachedLinux", client.out)
+        self.assertIn("os: CachedWindows", client.out)
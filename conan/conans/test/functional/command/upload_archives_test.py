@@ -0,0 +1,76 @@
+import os
+import textwrap
+import unittest
+from collections import OrderedDict
+
+from conans.model.ref import ConanFileReference, PackageReference
+from conans.paths import EXPORT_SOURCES_TGZ_NAME, EXPORT_TGZ_NAME, PACKAGE_TGZ_NAME
+from conans.test.utils.tools import NO_SETTINGS_PACKAGE_ID, TestClient, TestServer
+from conans.util.files import load, md5sum
+
+
+class UploadArchivesTest(unittest.TestCase):
+
+    def setUp(self):
+        self.servers = OrderedDict([("r1", TestServer()), ("r2", TestServer())])
+        self.users = {"r1": [("lasote", "mypass")], "r2": [("lasote", "mypass")]}
+        self.client = TestClient(servers=self.servers, users=self.users)
+        conanfile = textwrap.dedent("""
+            from conans import ConanFile
+
+            class Pkg(ConanFile):
+                exports = "*.txt"
+                exports_sources = "*.h"
+
+                def package(self):
+                    self.copy("*.h", dst="include")
+            """)
+        self.client.save({"conanfile.py": conanfile, "notes.txt": "notes", "pkg.h": "header"})
+        self.client.run("create . pkg/0.1@lasote/stable")
+        self.client.run("upload pkg/0.1@lasote/stable --all -r r1")
+        self.assertIn("Compressing recipe", self.client.out)
+        self.assertIn("Compressing package", self.client.out)
+        self.ref = ConanFileReference.loads("pkg/0.1@lasote/stable")
+        self.pref = PackageReference(self.ref, NO_SETTINGS_PACKAGE_ID)
+
+    def _server_archives(self):
+        archives = []
+        for server in self.servers.values():
+            store = server.server_store
+            ref = self.ref.copy_with_rev(store.get_last_revision(self.ref).revision)
+            pref = PackageReference(ref, self.pref.id)
+            pref = pref.copy_with_revs(ref.revision,
+                                       store.get_last_package_revision(pref).revision)
+            archives.append([md5sum(os.path.join(store.export(ref), name))
+                             for name in (EXPORT_TGZ_NAME, EXPORT_SOURCES_TGZ_NAME)] +
+                            [md5sum(os.path.join(store.package(pref), PACKAGE_TGZ_NAME))])
+        return archives
+
+    def test_upload_other_remote(self):
+        self.client.run("upload pkg/0.1@lasote/stable --all -r r2")
+        self.assertNotIn("Compressing", self.client.out)
+        self.assertIn("Uploading conan_package.tgz", self.client.out)
+        r1_archives, r2_archives = self._server_archives()
+        self.assertEqual(r1_archives, r2_archives)
+
+    def test_outdated_archive(self):
+        package_layout = self.client.cache.package_layout(self.ref)
+        with package_layout.update_metadata() as metadata:
+            metadata.packages[self.pref.id].archives = {PACKAGE_TGZ_NAME: "other"}
+        self.client.run("upload pkg/0.1@lasote/stable --all -r r2")
+        self.assertNotIn("Compressing recipe", self.client.out)
+        self.assertIn("Compressing package", self.client.out)
+
+    def test_keep_downloaded_archives(self):
+        client = TestClient(servers=self.servers, users=self.users)
+        client.run("config set general.keep_downloaded_archives=True")
+        client.run("install pkg/0.1@lasote/stable -r r1")
+        package_folder = client.cache.package_layout(self.ref).package(self.pref)
+        self.assertTrue(os.path.exists(os.path.join(package_folder, PACKAGE_TGZ_NAME)))
+        self.assertEqual("header", load(os.path.join(package_folder, "include", "pkg.h")))
+
+        client.run("upload pkg/0.1@lasote/stable --all -r r2")
+        self.assertIn("Downloading conan_sources.tgz", client.out)
+        self.assertNotIn("Compressing", client.out)
+        r1_archives, r2_archives = self._server_archives()
+        self.assertEqual(r1_archives, r2_archives)
@@ -0,0 +1,112 @@
+import json
+import os
+import threading
+import time
+import unittest
+from collections import OrderedDict
+
+from mock import patch
+
+from conans.client.cmd.uploader import CmdUpload
+from conans.client.tools.env import environment_append
+from conans.errors import ConanException
+from conans.model.ref import ConanFileReference
+from conans.test.utils.conanfile import TestConanFile
+from conans.test.utils.tools import TestClient, TestRequester, TestServer
+from conans.util.files import load
+
+
+class _HighLatencyRequester(TestRequester):
+    """ Simulates the round trip time of a real remote for each PUT request, recording the
+    maximum number of requests running at the same time
+    """
+    latency = 0.05
+    lock = threading.Lock()
+    running = 0
+    max_running = 0
+
+    def put(self, url, **kwargs):
+        cls = _HighLatencyRequester
+        with cls.lock:
+            cls.running += 1
+            cls.max_running = max(cls.max_running, cls.running)
+        try:
+            time.sleep(self.latency)
+            return super(_HighLatencyRequester, self).put(url, **kwargs)
+        finally:
+            with cls.lock:
+                cls.running -= 1
+
+
+class UploadParallelTest(unittest.TestCase):
+
+    def setUp(self):
+        self.servers = OrderedDict([("default", TestServer())])
+        self.client = TestClient(servers=self.servers, users={"default": [("lasote", "mypass")]},
+                                 requester_class=_HighLatencyRequester)
+        self.refs = []
+        for name in ("Hello0", "Hello1", "Hello2"):
+            conanfile = TestConanFile(name, "0.1", settings='"os"')
+            self.client.save({"conanfile.py": str(conanfile)}, clean_first=True)
+            for os_ in ("Windows", "Linux"):
+                self.client.run("create . lasote/stable -s os=%s" % os_)
+            self.refs.append(ConanFileReference.loads("%s/0.1@lasote/stable" % name))
+
+    def _upload(self, parallel, assert_error=False):
+        _HighLatencyRequester.max_running = 0
+        with environment_append({"CONAN_CPU_COUNT": "4"}):
+            self.client.run("upload * --all --confirm --json=upload.json %s"
+                            % ("--parallel" if parallel else ""), assert_error=assert_error)
+        uploading = [line for line in str(self.client.out).splitlines()
+                     if line.startswith(("Uploading package", "Uploaded conan recipe")) or
+                     line.endswith("@lasote/stable to remote 'default'")]
+        info = json.loads(load(os.path.join(self.client.current_folder, "upload.json")))
+        uploaded = [(item["recipe"]["id"], [p["id"] for p in item["packages"]])
+                    for item in info["uploaded"]]
+        return _HighLatencyRequester.max_running, uploading, uploaded
+
+    def _check_server(self):
+        store = self.servers["default"].server_store
+        for ref in self.refs:
+            ref = ref.copy_with_rev(store.get_last_revision(ref).revision)
+            self.assertEqual(2, len(os.listdir(store.packages(ref))))
+
+    def test_parallel_upload(self):
+        max_running, uploading, uploaded = self._upload(parallel=True)
+        self.assertGreater(max_running, 1)
+        self._check_server()
+
+        # The recipes are uploaded before any binary, and the output of every upload is kept
+        # together and in order
+        recipes = [line for ref in self.refs
+                   for line in ("Uploading %s to remote 'default'" % str(ref),
+                                "Uploaded conan recipe '%s' to 'default'" % str(ref))]
+        self.assertEqual(recipes, [line.split(": ")[0] for line in uploading[:6]])
+        packages = ["Uploading package %d/6: %s" % (index + 1, ref)
+                    for index, ref in enumerate(ref for ref in self.refs for _ in range(2))]
+        self.assertEqual(packages, [line.rsplit(":", 1)[0] for line in uploading[6:]])
+
+        # The same is recorded as in the sequential upload
+        self.client.run("remove * -f -r default")
+        max_running, _, sequential_uploaded = self._upload(parallel=False)
+        self.assertEqual(1, max_running)
+        self.assertEqual(sequential_uploaded, uploaded)
+        self.assertEqual([str(ref) for ref in self.refs], [ref for ref, _ in uploaded])
+
+    def test_parallel_upload_error(self):
+        original_upload_package = CmdUpload._upload_package
+
+        def upload_package(cmd_upload, pref, *args, **kwargs):
+            if pref.ref.name == "Hello1":
+                cmd_upload._user_io.out.writeln("Failing %s" % pref.id)
+                raise ConanException("Upload of %s failed" % pref.id)
+            return original_upload_package(cmd_upload, pref, *args, **kwargs)
+
+        with patch.object(CmdUpload, "_upload_package", new=upload_package):
+            _, _, uploaded = self._upload(parallel=True, assert_error=True)
+        self.assertIn("ERROR: Upload of ", self.client.out)
+        self.assertEqual(2, str(self.client.out).count("Failing "))
+        # The rest of binaries are uploaded and recorded
+        self.assertEqual([("Hello0/0.1@lasote/stable", 2), ("Hello1/0.1@lasote/stable", 0),
+                          ("Hello2/0.1@lasote/stable", 2)],
+                         [(ref, len(packages)) for ref, packages in uploaded])
@@ -0,0 +1,128 @@
+import threading
+import time
+import unittest
+from collections import OrderedDict
+
+from conans.test.utils.conanfile import TestConanFile
+from conans.test.utils.tools import TestClient, TestRequester, TestServer
+
+
+class _HighLatencyRequester(TestRequester):
+    """ Simulates the round trip time of a real remote for each GET request, recording the
+    requested urls and the maximum number of requests running at the same time. With
+    wait_running, every request waits until that many have run at the same time, or a timeout,
+    so the concurrent ones overlap
+    """
+    latency = 0.05
+    lock = threading.Condition()
+    running = 0
+    max_running = 0
+    wait_running = None
+    urls = []
+
+    def get(self, url, **kwargs):
+        cls = _HighLatencyRequester
+        with cls.lock:
+            cls.urls.append(url)
+            cls.running += 1
+            cls.max_running = max(cls.max_running, cls.running)
+            cls.lock.notify_all()
+            timeout = time.time() + 5
+            while (cls.wait_running and cls.max_running < cls.wait_running and
+                   time.time() < timeout):
+                cls.lock.wait(0.1)
+        try:
+            time.sleep(self.latency)
+            return super(_HighLatencyRequester, self).get(url, **kwargs)
+        finally:
+            with cls.lock:
+                cls.running -= 1
+
+
+class BinaryRemotesLookupTest(unittest.TestCase):
+
+    def setUp(self):
+        self.servers = OrderedDict([("r%s" % i, TestServer()) for i in range(5)])
+        self.users = {name: [("lasote", "mypass")] for name in self.servers}
+        self.conanfiles = {name: str(TestConanFile(name, "0.1")) for name in ("PkgA", "PkgB")}
+        client = TestClient(servers=self.servers, users=self.users, revisions_enabled=False)
+        for conanfile in self.conanfiles.values():
+            client.save({"conanfile.py": conanfile})
+            client.run("create . lasote/stable")
+        # The packages are only in r2 and r4
+        for remote in ("r2", "r4"):
+            client.run("upload Pkg* --all --confirm -r=%s" % remote)
+
+    def _install(self, parallel_download=None, wait_running=None):
+        # Recipes not retrieved from any remote, their binaries are looked for in all of them
+        client = TestClient(servers=self.servers, users=self.users, revisions_enabled=False,
+                            requester_class=_HighLatencyRequester)
+        if parallel_download:
+            client.run("config set general.parallel_download=%s" % parallel_download)
+        for conanfile in self.conanfiles.values():
+            client.save({"conanfile.py": conanfile}, clean_first=True)
+            client.run("export . lasote/stable")
+        client.save({"conanfile.txt": "[requires]\nPkgA/0.1@lasote/stable\n"
+                                      "PkgB/0.1@lasote/stable"}, clean_first=True)
+        _HighLatencyRequester.max_running = 0
+        _HighLatencyRequester.wait_running = wait_running
+        _HighLatencyRequester.urls = []
+        try:
+            client.run("install .")
+        finally:
+            _HighLatencyRequester.wait_running = None
+        for name in ("PkgA", "PkgB"):
+            self.assertIn("%s/0.1@lasote/stable: Retrieving package "
+                          "5ab84d6acfe1f23c4fae0ab88f26e3a396351ac9 from remote 'r2'" % name,
+                          client.out)
+        return _HighLatencyRequester.max_running
+
+    def _requested_remotes(self):
+        return sorted(set(name for name, server in self.servers.items()
+                          for url in _HighLatencyRequester.urls
+                          if url.startswith(server.fake_url)))
+
+    def _lookup_urls(self):
+        return [url for url in _HighLatencyRequester.urls if url.endswith("download_urls")]
+
+    def test_concurrent_lookup(self):
+        self.assertEqual(1, self._install())
+        # All the remotes of a package are queried at the same time, not only the first ones
+        self.assertGreaterEqual(self._install(parallel_download=8, wait_running=5), 5)
+        self.assertEqual(["r0", "r1", "r2", "r3", "r4"], self._requested_remotes())
+        # Every remote at most once for each package, r2 once more for each download
+        self.assertLessEqual(len(self._lookup_urls()), 12)
+
+    def test_requests_per_remote(self):
+        # The queries of the remotes after the one having the package are skipped if they
+        # haven't started when it is found, always with a single thread
+        for parallel_download in (None, 1):
+            self._install(parallel_download)
+            self.assertEqual(["r0", "r1", "r2"], self._requested_remotes())
+            # r0 and r1 for each package, r2 for each package and to download it
+            self.assertEqual(8, len(self._lookup_urls()))
+
+    def test_not_found(self):
+        conanfile = str(TestConanFile("Pkg", "0.1", settings='"os"'))
+        client = TestClient(servers=self.servers, users=self.users, revisions_enabled=False)
+        client.run("config set general.parallel_download=8")
+        client.save({"conanfile.py": conanfile})
+        client.run("export . lasote/stable")
+        client.run("install Pkg/0.1@lasote/stable -s os=Windows", assert_error=True)
+        self.assertIn("Missing prebuilt package for 'Pkg/0.1@lasote/stable'", client.out)
+
+    def test_error_first_remote(self):
+        # The error of a remote is raised unless the package is found in a previous one
+        client = TestClient(servers=self.servers, users=self.users, revisions_enabled=False)
+        client.run("config set general.parallel_download=8")
+        client.run("remote update r3 http://this_not_exist8823.com")
+        client.save({"conanfile.py": self.conanfiles["PkgA"]})
+        client.run("export . lasote/stable")
+        client.run("install PkgA/0.1@lasote/stable")
+        self.assertIn("from remote 'r2'", client.out)
+
+        client.run("remove * -f")
+        client.run("remote update r1 http://this_not_exist8824.com")
+        client.run("export . lasote/stable")
+        client.run("install PkgA/0.1@lasote/stable", assert_error=True)
+        self.assertIn("Unable to connect to r1=http://this_not_exist8824.com", client.out)
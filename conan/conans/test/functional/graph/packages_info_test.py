@@ -0,0 +1,88 @@
+import re
+import unittest
+from collections import OrderedDict
+
+from conans import COMPLEX_SEARCH_CAPABILITY, REVISIONS
+from conans.test.utils.conanfile import TestConanFile
+from conans.test.utils.tools import TestClient, TestRequester, TestServer
+
+
+class _RecordingRequester(TestRequester):
+    """ Records the method and url of every request
+    """
+    requests = []
+
+    def get(self, url, **kwargs):
+        _RecordingRequester.requests.append(("GET", url))
+        return super(_RecordingRequester, self).get(url, **kwargs)
+
+    def post(self, url, **kwargs):
+        _RecordingRequester.requests.append(("POST", url))
+        return super(_RecordingRequester, self).post(url, **kwargs)
+
+
+class PackagesInfoTest(unittest.TestCase):
+
+    def _create(self, server_capabilities=None):
+        self.servers = OrderedDict([("default",
+                                     TestServer(server_capabilities=server_capabilities))])
+        client = TestClient(servers=self.servers, users={"default": [("lasote", "mypass")]},
+                            revisions_enabled=True)
+        client.save({"conanfile.py": str(TestConanFile("Base", "0.1"))})
+        client.run("create . lasote/stable")
+        self.requires = []
+        for name in ("Lib1", "Lib2", "Lib3"):
+            client.save({"conanfile.py": str(TestConanFile(name, "0.1",
+                                                           requires=["Base/0.1@lasote/stable"]))},
+                        clean_first=True)
+            client.run("create . lasote/stable")
+            self.requires.append("%s/0.1@lasote/stable" % name)
+        client.run("upload * --all --confirm")
+
+    def _install(self, client, args=""):
+        _RecordingRequester.requests = []
+        client.save({"conanfile.py": str(TestConanFile("Consumer", "0.1",
+                                                       requires=self.requires))},
+                    clean_first=True)
+        client.run("install . %s" % args)
+        packages_info = [url for method, url in _RecordingRequester.requests
+                         if method == "POST" and url.endswith("/v2/conans/packages/info")]
+        latest = [url for method, url in _RecordingRequester.requests
+                  if re.search("/packages/.*/latest$", url)]
+        return len(packages_info), len(latest)
+
+    def _client(self, revisions_enabled=True):
+        return TestClient(servers=self.servers, users={"default": [("lasote", "mypass")]},
+                          requester_class=_RecordingRequester, revisions_enabled=revisions_enabled)
+
+    def test_request_per_level(self):
+        self._create()
+        client = self._client()
+        # One request for Base and other for the 3 libraries, none per package
+        self.assertEqual((2, 0), self._install(client))
+        self.assertEqual(4, str(client.out).count("Downloading conan_package.tgz"))
+
+        # Checking for updates of the cached binaries too
+        self.assertEqual((2, 0), self._install(client, "--update"))
+        self.assertNotIn("Downloading conan_package.tgz", client.out)
+        self.assertNotIn("Current package is older", client.out)
+
+    def test_missing_binaries(self):
+        self._create()
+        client = self._client()
+        client.run("remove Lib2/0.1@lasote/stable -p -f -r default")
+        self.assertEqual((2, 0), self._install(client, "--build missing"))
+        self.assertEqual(3, str(client.out).count("Downloading conan_package.tgz"))
+        self.assertIn("Lib2/0.1@lasote/stable: Building your package", client.out)
+
+    def test_fallback(self):
+        self._create(server_capabilities=[COMPLEX_SEARCH_CAPABILITY, REVISIONS])
+        client = self._client()
+        self.assertEqual((0, 4), self._install(client))
+        self.assertEqual(4, str(client.out).count("Downloading conan_package.tgz"))
+
+        # Without revisions the v2 api is not used
+        self._create()
+        client = self._client(revisions_enabled=False)
+        self.assertEqual((0, 0), self._install(client))
+        self.assertEqual(4, str(client.out).count("Downloading conan_package.tgz"))
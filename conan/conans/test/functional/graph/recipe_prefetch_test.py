@@ -0,0 +1,109 @@
+import json
+import os
+import threading
+import time
+import unittest
+from collections import OrderedDict
+
+from conans.test.utils.conanfile import TestConanFile
+from conans.test.utils.tools import TestClient, TestRequester, TestServer
+from conans.util.files import load
+
+
+class _HighLatencyRequester(TestRequester):
+    """ Simulates the round trip time of a real remote for each GET request, recording the
+    maximum number of requests running at the same time
+    """
+    latency = 0.05
+    lock = threading.Lock()
+    running = 0
+    max_running = 0
+
+    def get(self, url, **kwargs):
+        cls = _HighLatencyRequester
+        with cls.lock:
+            cls.running += 1
+            cls.max_running = max(cls.max_running, cls.running)
+        try:
+            time.sleep(self.latency)
+            return super(_HighLatencyRequester, self).get(url, **kwargs)
+        finally:
+            with cls.lock:
+                cls.running -= 1
+
+
+class RecipePrefetchTest(unittest.TestCase):
+
+    def setUp(self):
+        self.servers = {"default": TestServer()}
+        client = TestClient(servers=self.servers, users={"default": [("lasote", "mypass")]})
+        # Graph: Consumer -> Lib0..Lib7 -> Base
+        client.save({"conanfile.py": str(TestConanFile("Base", "0.1"))})
+        client.run("export . lasote/stable")
+        self.requires = []
+        for i in range(8):
+            name = "Lib%s" % i
+            client.save({"conanfile.py": str(TestConanFile(name, "0.1",
+                                                           requires=["Base/0.1@lasote/stable"]))},
+                        clean_first=True)
+            client.run("export . lasote/stable")
+            self.requires.append("%s/0.1@lasote/stable" % name)
+        client.run("upload * --confirm")
+
+    def _info(self, parallel_download=None):
+        client = TestClient(servers=self.servers, users={"default": [("lasote", "mypass")]},
+                            requester_class=_HighLatencyRequester)
+        if parallel_download:
+            client.run("config set general.parallel_download=%s" % parallel_download)
+        client.save({"conanfile.py": str(TestConanFile("Consumer", "0.1",
+                                                       requires=self.requires))},
+                    clean_first=True)
+        _HighLatencyRequester.max_running = 0
+        client.run("info . --json=graph.json")
+        # Only the recipes output, the transfers progress is not scoped and can be interleaved
+        recipes_output = [line for line in str(client.out).splitlines()
+                          if line.startswith(("Lib", "Base"))]
+        graph = json.loads(load(os.path.join(client.current_folder, "graph.json")))
+        for item in graph:  # Dependants are not sorted (computed from a set)
+            item.get("required_by", []).sort()
+        return _HighLatencyRequester.max_running, recipes_output, graph
+
+    def test_same_graph_concurrent(self):
+        sequential_running, sequential_output, sequential_graph = self._info()
+        parallel_running, parallel_output, parallel_graph = self._info(parallel_download=8)
+        self.assertEqual(sequential_graph, parallel_graph)
+        self.assertEqual(sequential_output, parallel_output)
+        for require in self.requires:
+            self.assertTrue(any(line.startswith("%s: Downloaded recipe revision" % require)
+                                for line in parallel_output))
+        self.assertEqual(1, sequential_running)
+        self.assertGreater(parallel_running, 1)
+
+    def test_prefetch_error(self):
+        client = TestClient(servers=self.servers, users={"default": [("lasote", "mypass")]})
+        client.run("config set general.parallel_download=4")
+        client.save({"conanfile.py": str(TestConanFile("Consumer", "0.1",
+                                                       requires=["Lib0/0.1@lasote/stable",
+                                                                 "Missing/0.1@lasote/stable"]))})
+        client.run("install .", assert_error=True)
+        self.assertIn("Lib0/0.1@lasote/stable: Downloaded recipe revision", client.out)
+        self.assertIn("Unable to find 'Missing/0.1@lasote/stable' in remotes", client.out)
+
+    def test_multiple_remotes(self):
+        servers = OrderedDict([("r1", TestServer()), ("r2", TestServer())])
+        client = TestClient(servers=servers, users={"r1": [("lasote", "mypass")],
+                                                    "r2": [("lasote", "mypass")]})
+        for i, remote in enumerate(servers):
+            client.save({"conanfile.py": str(TestConanFile("Pkg%s" % i, "0.1"))},
+                        clean_first=True)
+            client.run("export . lasote/stable")
+            client.run("upload Pkg%s* --confirm -r=%s" % (i, remote))
+        client.run("remove * -f")
+        client.run("config set general.parallel_download=4")
+        client.save({"conanfile.py": str(TestConanFile("Consumer", "0.1",
+                                                       requires=["Pkg0/0.1@lasote/stable",
+                                                                 "Pkg1/0.1@lasote/stable"]))})
+        client.run("info .")
+        self.assertIn("Pkg0/0.1@lasote/stable\n    ID: ", client.out)
+        self.assertIn("    Remote: r1=", client.out)
+        self.assertIn("    Remote: r2=", client.out)
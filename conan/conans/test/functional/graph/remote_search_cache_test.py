@@ -0,0 +1,105 @@
+import os
+import threading
+import time
+import unittest
+
+from conans.client.cache.remote_search_cache import REMOTE_SEARCH_CACHE_FILE
+from conans.model.ref import ConanFileReference
+from conans.test.utils.conanfile import TestConanFile
+from conans.test.utils.tools import TestClient, TestRequester, TestServer
+
+
+class _SearchCounterRequester(TestRequester):
+    searches = 0
+
+    def get(self, url, **kwargs):
+        if "/search" in url:
+            _SearchCounterRequester.searches += 1
+        return super(_SearchCounterRequester, self).get(url, **kwargs)
+
+
+class RemoteSearchCacheTest(unittest.TestCase):
+
+    def setUp(self):
+        self.server = TestServer()
+        self.servers = {"default": self.server}
+        self.creator = TestClient(servers=self.servers,
+                                  users={"default": [("lasote", "mypass")]})
+        self._upload("0.1")
+        self._upload("0.2")
+
+        _SearchCounterRequester.searches = 0
+        self.client = TestClient(servers=self.servers, requester_class=_SearchCounterRequester,
+                                 users={"default": [("lasote", "mypass")]})
+        self.client.run("config set general.remote_search_ttl=300")
+        self.client.save({"conanfile.py": str(TestConanFile("Hello", "0.1",
+                                                            requires=["Say/[*]@lasote/stable"]))})
+
+    def _upload(self, version):
+        self.creator.save({"conanfile.py": str(TestConanFile("Say", version))}, clean_first=True)
+        self.creator.run("export . lasote/stable")
+        self.creator.run("upload Say/%s@lasote/stable --confirm" % version)
+
+    def _install(self, args=""):
+        self.client.run("remove Say* -f")
+        self.client.run("install . --build=missing %s" % args)
+
+    def test_no_search_within_ttl(self):
+        self._install()
+        self.assertIn("resolved to 'Say/0.2@lasote/stable'", self.client.out)
+        self.assertEqual(_SearchCounterRequester.searches, 1)
+
+        self._upload("0.3")
+        self._install()
+        self.assertIn("resolved to 'Say/0.2@lasote/stable'", self.client.out)
+        self.assertEqual(_SearchCounterRequester.searches, 1)
+
+        # --update always refreshes the stored results
+        self._install("--update")
+        self.assertIn("resolved to 'Say/0.3@lasote/stable'", self.client.out)
+        self.assertEqual(_SearchCounterRequester.searches, 2)
+        self._install()
+        self.assertIn("resolved to 'Say/0.3@lasote/stable'", self.client.out)
+        self.assertEqual(_SearchCounterRequester.searches, 2)
+
+    def test_expired_ttl(self):
+        self.client.run("config set general.remote_search_ttl=1")
+        self._install()
+        self.assertEqual(_SearchCounterRequester.searches, 1)
+        time.sleep(1.5)
+        self._install()
+        self.assertEqual(_SearchCounterRequester.searches, 2)
+
+    def test_disabled(self):
+        self.client.run("config rm general.remote_search_ttl")
+        self._install()
+        self._install()
+        self.assertEqual(_SearchCounterRequester.searches, 2)
+        cache_file = os.path.join(self.client.cache.cache_folder, REMOTE_SEARCH_CACHE_FILE)
+        self.assertFalse(os.path.exists(cache_file))
+
+    def test_remote_changes_invalidate(self):
+        self._install()
+        cache_file = os.path.join(self.client.cache.cache_folder, REMOTE_SEARCH_CACHE_FILE)
+        self.assertTrue(os.path.exists(cache_file))
+        self.client.run("remote add other http://other.com")
+        self.assertFalse(os.path.exists(cache_file))
+        self.client.run("remote remove other")
+        self._install()
+        self.assertEqual(_SearchCounterRequester.searches, 2)
+
+    def test_concurrent_set(self):
+        search_cache = self.client.cache.remote_search_cache
+        remote = self.client.cache.registry.load_remotes()["default"]
+        ref = ConanFileReference.loads("Say/0.1@lasote/stable")
+        patterns = ["Pkg%d/*@lasote/stable" % i for i in range(20)]
+        threads = [threading.Thread(target=search_cache.set, args=(remote, pattern, [ref]))
+                   for pattern in patterns]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        for pattern in patterns:
+            self.assertEqual([ref], search_cache.get(remote, pattern))
+        self.assertFalse(os.path.exists(os.path.join(self.client.cache.cache_folder,
+                                                     REMOTE_SEARCH_CACHE_FILE + ".tmp")))
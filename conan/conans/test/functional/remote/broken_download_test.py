@@ -1,12 +1,13 @@
 import os
 import unittest
 
+import six
 from requests.exceptions import ConnectionError
 
 from conans.model.ref import ConanFileReference
 from conans.test.utils.cpp_test_files import cpp_hello_conan_files
-from conans.test.utils.tools import TestClient, TestRequester, TestServer
-from conans.util.files import save
+from conans.test.utils.tools import TestClient, TestRequester, TestServer, TestingResponse
+from conans.util.files import load, save
 
 
 class BrokenDownloadTest(unittest.TestCase):
@@ -85,3 +86,45 @@ class ConanFileToolsTest(ConanFile):
         client.run('config set general.retry_wait=0')
         client.run("install lib/1.0@lasote/stable")
         self.assertEqual(10, str(client.out).count("Waiting 0 seconds to retry..."))
+
+    def client_resumes_test(self):
+        server = TestServer()
+        servers = {"default": server}
+        client = TestClient(servers=servers, users={"default": [("lasote", "mypass")]})
+        files = cpp_hello_conan_files()
+        client.save(files)
+        client.run("export . lasote/stable")
+        client.run("upload Hello/0.1@lasote/stable")
+        ref = ConanFileReference.loads("Hello/0.1@lasote/stable")
+        manifest = load(os.path.join(client.cache.package_layout(ref).export(),
+                                     "conanmanifest.txt"))
+
+        class _BrokenResponse(TestingResponse):
+            def iter_content(self, chunk_size=1):
+                content = self.content
+                yield content[:len(content) // 2]
+                raise ConnectionError("Fake connection broken")
+
+        class DownloadBrokenRequester(TestRequester):
+            ranges = []
+
+            def get(self, url, **kwargs):
+                response = super(DownloadBrokenRequester, self).get(url, **kwargs)
+                if "conan_export.tgz" in url:
+                    headers = kwargs.get("headers") or {}
+                    DownloadBrokenRequester.ranges.append(headers.get("Range"))
+                    if len(DownloadBrokenRequester.ranges) == 1:
+                        return _BrokenResponse(response.test_response)
+                return response
+
+        client = TestClient(servers=servers, users={"default": [("lasote", "mypass")]},
+                            requester_class=DownloadBrokenRequester)
+        client.run("download Hello/0.1@lasote/stable --recipe")
+        self.assertIn("Fake connection broken", client.out)
+        self.assertEqual(1, str(client.out).count("Waiting 0 seconds to retry..."))
+        # The second request asks for the rest of the file
+        self.assertIsNone(DownloadBrokenRequester.ranges[0])
+        six.assertRegex(self, DownloadBrokenRequester.ranges[1], r"^bytes=[1-9]\d*-$")
+        export_folder = client.cache.package_layout(ref).export()
+        self.assertEqual(manifest, load(os.path.join(export_folder, "conanmanifest.txt")))
+        self.assertFalse(os.path.exists(os.path.join(export_folder, "conan_export.tgz")))
@@ -0,0 +1,78 @@
+import os
+import unittest
+
+import requests
+from mock import patch
+from nose.plugins.attrib import attr
+
+from conans import DEFAULT_REVISION_V1
+from conans.client.conf import ConanClientConfigParser
+from conans.client.rest.conan_requester import ConanRequester
+from conans.client.rest.rest_client import RestApiClient
+from conans.client.rest.uploader_downloader import UploadBodyAdapter
+from conans.model.manifest import FileTreeManifest
+from conans.model.ref import ConanFileReference
+from conans.paths import CONANFILE, CONAN_MANIFEST, EXPORT_SOURCES_TGZ_NAME
+from conans.test.utils.server_launcher import TestServerLauncher
+from conans.test.utils.test_files import temp_folder
+from conans.test.utils.tools import TestBufferConanOutput
+from conans.util.files import load, save
+
+
+@attr('slow')
+@attr('rest_api')
+class UploadBlocksTest(unittest.TestCase):
+    """ Uploads a file to a real server (sockets), checking that the http client sends it in the
+    blocks read by the UploadBodyAdapter, about a hundredth of the file each
+    """
+    size = 8 * 1024 * 1024
+
+    def setUp(self):
+        self.server = TestServerLauncher()
+        self.server.start()
+        filename = os.path.join(temp_folder(), "conan.conf")
+        save(filename, "")
+        requester = ConanRequester(ConanClientConfigParser(filename), requests)
+        self.api = RestApiClient(TestBufferConanOutput(), requester=requester,
+                                 revisions_enabled=False)
+        self.api.remote_url = "http://127.0.0.1:%s" % str(self.server.port)
+        self.api.token = self.api.authenticate("private_user", "private_pass")
+
+        folder = temp_folder()
+        self.files = {CONANFILE: os.path.join(folder, CONANFILE),
+                      CONAN_MANIFEST: os.path.join(folder, CONAN_MANIFEST),
+                      EXPORT_SOURCES_TGZ_NAME: os.path.join(folder, EXPORT_SOURCES_TGZ_NAME)}
+        save(self.files[CONANFILE], "from conans import ConanFile\n\n"
+                                    "class MyConan(ConanFile):\n    pass\n")
+        FileTreeManifest(123123123, {}).save(folder)
+        with open(self.files[EXPORT_SOURCES_TGZ_NAME], "wb") as f:
+            f.write(os.urandom(self.size))
+
+    def tearDown(self):
+        self.server.stop()
+        self.server.clean()
+
+    def test_upload_blocks(self):
+        blocks = {}  # {path: [sizes of the blocks read]}
+        original_read = UploadBodyAdapter.read
+
+        def read(adapter, *args, **kwargs):
+            block = original_read(adapter, *args, **kwargs)
+            blocks.setdefault(adapter._file.name, []).append(len(block))
+            return block
+
+        ref = ConanFileReference("Pkg", "1.0", "private_user", "testing")
+        with patch.object(UploadBodyAdapter, "read", autospec=True, side_effect=read):
+            self.api.upload_recipe(ref, self.files, None, retry=0, retry_wait=0)
+
+        export = self.server.server_store.export(ref.copy_with_rev(DEFAULT_REVISION_V1))
+        for name, path in self.files.items():
+            self.assertEqual(load(path, binary=True),
+                             load(os.path.join(export, name), binary=True))
+        block_size = self.size // 100
+        self.assertEqual([block_size] * 100 + [self.size - 100 * block_size, 0],
+                         blocks[self.files[EXPORT_SOURCES_TGZ_NAME]])
+        # The small files are sent in a single block
+        for name in (CONANFILE, CONAN_MANIFEST):
+            size = os.path.getsize(self.files[name])
+            self.assertEqual([size, 0], blocks[self.files[name]])
@@ -1,15 +1,17 @@
 import os
 import platform
+import time
 import unittest
 
 from parameterized.parameterized import parameterized
 
+from conans.client.tools.env import environment_append
 from conans.model.manifest import FileTreeManifest
 from conans.model.ref import ConanFileReference, PackageReference
 from conans.paths import CONANFILE, CONAN_MANIFEST
 from conans.test.utils.test_files import temp_folder
 from conans.test.utils.tools import NO_SETTINGS_PACKAGE_ID, TestClient, TestServer
-from conans.util.files import load, md5, save
+from conans.util.files import load, md5, save, walk
 
 
 def export_folder(base, ref):
@@ -320,3 +322,26 @@ class ConanFileTest(ConanFile):
                         assert_error=True)
         self.assertIn("%s local cache package is corrupted" % str(pref),
                       self.client.user_io.out)
+
+    def test_stat_cache(self):
+        self.client.run("install %s --build missing" % str(self.ref))
+        pref = PackageReference(self.ref, NO_SETTINGS_PACKAGE_ID)
+        layout = self.client.cache.package_layout(self.ref)
+        old = time.time() - 100
+        for root, _, files in walk(layout.base_folder()):
+            for f in files:
+                os.utime(os.path.join(root, f), (old, old))
+
+        with environment_append({"CONAN_MANIFEST_STAT_CACHE": "True"}):
+            self.client.run("install %s --manifests" % str(self.ref))
+            self.client.run("install %s --verify" % str(self.ref))
+        self.assertIn("Manifest for '%s': OK" % str(pref), self.client.out)
+        self.assertIn("data.txt", load(layout.manifest_stat_cache()))
+        self.assertIn("conaninfo.txt", load(layout.manifest_stat_cache(pref)))
+        # Never saved in the folders, that are copied or deployed
+        for folder in (layout.export(), layout.export_sources(), layout.package(pref)):
+            self.assertEqual([], [f for _, _, files in walk(folder) for f in files
+                                  if f.startswith("__conan")])
+
+        self.client.run("remove %s -p -f" % str(self.ref))
+        self.assertFalse(os.path.exists(layout.manifest_stat_cache(pref)))
@@ -68,3 +68,29 @@ class CacheTest(unittest.TestCase):
             metadata.packages[pref2.id].revision = "prevision"
 
         self.assertTrue(layout2.package_exists(pref2))
+
+    def test_metadata_cache(self):
+        layout = self.cache.package_layout(self.ref)
+        with layout.update_metadata() as metadata:
+            metadata.recipe.revision = "rev1"
+        metadata_path = layout.package_metadata()
+        mtime = os.path.getmtime(metadata_path)
+
+        # Not parsed again while not modified, the copies can add packages
+        metadata = layout.load_metadata()
+        metadata.packages["999"].revision = "prev"
+        self.assertIs(metadata.recipe, layout.load_metadata().recipe)
+        self.assertNotIn("999", layout.load_metadata().packages)
+
+        # Not saved if not modified
+        os.utime(metadata_path, (mtime - 10, mtime - 10))
+        with layout.update_metadata() as metadata:
+            metadata.recipe.revision = "rev1"
+        self.assertEqual(mtime - 10, os.path.getmtime(metadata_path))
+
+        # Modified by other process with the same mtime, but different size
+        other = PackageMetadata()
+        other.recipe.revision = "revision2"
+        save(metadata_path, other.dumps())
+        os.utime(metadata_path, (mtime - 10, mtime - 10))
+        self.assertEqual("revision2", layout.load_metadata().recipe.revision)
@@ -1,11 +1,12 @@
 # coding=utf-8
 
+import threading
 import unittest
 from types import MethodType
 
 from six import StringIO
 
-from conans.client.output import ConanOutput
+from conans.client.output import BufferedOutput, ConanOutput, ScopedOutput
 from mock import mock
 
 
@@ -28,3 +29,29 @@ class ConanOutputTest(unittest.TestCase):
             out.write("Hello world")
             sleep.assert_any_call(0.02)
         self.assertEqual("Hello world", stream.getvalue())
+
+    def test_buffered_output(self):
+        stream = StringIO()
+        out = ConanOutput(stream)
+        outputs = [BufferedOutput(out) for _ in range(2)]
+
+        def job(index):
+            outputs[index].writeln("buffered %s" % index)
+            outputs[index].warn("buffered warn %s" % index)
+            ScopedOutput("scope", outputs[index]).writeln("buffered scoped %s" % index)
+
+        threads = [threading.Thread(target=job, args=(index, )) for index in (1, 0)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        out.writeln("direct")
+        self.assertFalse(outputs[0].is_terminal)
+        self.assertEqual("direct\n", stream.getvalue())
+
+        for output in outputs:
+            output.replay()
+        self.assertEqual("direct\n"
+                         "buffered 0\nWARN: buffered warn 0\nscope: buffered scoped 0\n"
+                         "buffered 1\nWARN: buffered warn 1\nscope: buffered scoped 1\n",
+                         stream.getvalue())
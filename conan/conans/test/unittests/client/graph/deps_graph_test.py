@@ -1,5 +1,8 @@
+import random
 import unittest
 
+from mock import patch
+
 from conans.client.graph.graph_builder import DepsGraph, Node
 from conans.model.conan_file import ConanFile
 from conans.model.ref import ConanFileReference
@@ -109,3 +112,75 @@ class DepsGraphTest(unittest.TestCase):
         deps.add_edge(n2, n32)
         deps.add_edge(n32, n5)
         self.assertEqual([[n5, n31], [n32], [n2], [n1]], deps.by_levels())
+
+    def test_levels_cache_invalidation(self):
+        deps = DepsGraph()
+        n1 = Node(ConanFileReference.loads("Hello/1.0@user/stable"), 1)
+        n2 = Node(ConanFileReference.loads("Hello/2.0@user/stable"), 2)
+        deps.add_node(n1)
+        deps.add_node(n2)
+        self.assertEqual([[n1, n2]], deps.by_levels())
+        deps.by_levels().pop()  # The returned levels can be modified by the caller
+        self.assertEqual([[n1, n2]], deps.by_levels())
+        deps.add_edge(n1, n2)
+        self.assertEqual([[n2], [n1]], deps.by_levels())
+        self.assertEqual([[n1], [n2]], deps.inverse_levels())
+        n3 = Node(ConanFileReference.loads("Hello/3.0@user/stable"), 3)
+        deps.add_node(n3)
+        self.assertEqual([[n2, n3], [n1]], deps.by_levels())
+
+
+def _iterative_levels(graph, direct):
+    """ The previous implementation, re-scanning all the open nodes for every level """
+    current_level = []
+    result = [current_level]
+    opened = graph.nodes.copy()
+    while opened:
+        current = opened.copy()
+        for o in opened:
+            o_neighs = o.neighbors() if direct else o.inverse_neighbors()
+            if not any(n in opened for n in o_neighs):
+                current_level.append(o)
+                current.discard(o)
+        current_level.sort()
+        opened = current
+        if opened:
+            current_level = []
+            result.append(current_level)
+    return result
+
+
+class DepsGraphLevelsBenchmarkTest(unittest.TestCase):
+
+    def test_5000_nodes(self):
+        rand = random.Random(42)
+        deps = DepsGraph()
+        nodes = []
+        for i in range(5000):
+            node = Node(ConanFileReference.loads("Pkg%s/1.0@user/stable" % i), i)
+            deps.add_node(node)
+            # Every node depends on a few of the previous ones, long chains and wide levels
+            for dep in set(rand.sample(nodes[-100:], min(len(nodes), 3))):
+                deps.add_edge(node, dep)
+            nodes.append(node)
+
+        expected_levels = _iterative_levels(deps, True)
+        expected_inverse = _iterative_levels(deps, False)
+
+        compute_levels = DepsGraph._compute_levels
+        with patch.object(DepsGraph, "_compute_levels", autospec=True,
+                          side_effect=compute_levels) as compute_mock:
+            self.assertEqual(deps.by_levels(), expected_levels)
+            self.assertEqual(deps.inverse_levels(), expected_inverse)
+            self.assertEqual(2, compute_mock.call_count)
+
+            # Next calls don't compute the levels again
+            for _ in range(10):
+                self.assertEqual(deps.by_levels(), expected_levels)
+                list(deps.ordered_iterate())
+            self.assertEqual(2, compute_mock.call_count)
+
+            # Until the graph changes
+            deps.add_edge(nodes[-1], nodes[0])
+            deps.by_levels()
+            self.assertEqual(3, compute_mock.call_count)
@@ -1,7 +1,16 @@
 import unittest
 
-from conans.client.graph.range_resolver import _parse_versionexpr
+import semver
+from mock import Mock, patch
+from semver import SemVer
+
+from conans.client.cache.remote_registry import Remotes
+from conans.client.graph import range_resolver
+from conans.client.graph.range_resolver import RangeResolver, _parse_versionexpr, satisfying
 from conans.errors import ConanException
+from conans.model.ref import ConanFileReference
+from conans.model.requires import Requirement
+from conans.test.utils.tools import TestClient
 
 
 class ParseVersionExprTest(unittest.TestCase):
@@ -68,3 +77,96 @@ class ParseVersionExprTest(unittest.TestCase):
         self.assertRaises(ConanException, _parse_versionexpr,
                           "2.3, 3.2, 1.4, loose=False, include_prerelease=True", output)
         self.assertRaises(ConanException, _parse_versionexpr, ">=1.2.3 <1.(2+1).0", output)
+
+
+class _CountingSemVer(SemVer):
+    constructed = 0
+
+    def __init__(self, *args, **kwargs):
+        _CountingSemVer.constructed += 1
+        super(_CountingSemVer, self).__init__(*args, **kwargs)
+
+
+class _CountingRange(semver.Range):
+    constructed = 0
+
+    def __init__(self, *args, **kwargs):
+        _CountingRange.constructed += 1
+        super(_CountingRange, self).__init__(*args, **kwargs)
+
+
+class ResolveCacheTest(unittest.TestCase):
+
+    @patch.dict(range_resolver._compiled_ranges, clear=True)
+    @patch.dict(range_resolver._parsed_versions, clear=True)
+    @patch.dict(range_resolver._version_indexes, clear=True)
+    def test_resolve_10k_versions(self):
+        versions = ["%s.%s.%s" % (major, minor, patch)
+                    for major in range(10) for minor in range(10) for patch in range(100)]
+        refs = [ConanFileReference.loads("Say/%s@user/channel" % v) for v in versions]
+        remote_manager = Mock()
+        remote_manager.search_recipes.return_value = refs
+        remotes = Remotes()
+        remotes.add("default", "http://fake.url")
+        cache = TestClient().cache
+        ranges = ["[>1.0 <2]", "[~3.4]", "[^5.1.3]", "[<=7.7.7]", "[9.9.98]", "[*]"]
+        resolver = RangeResolver(cache, remote_manager)
+
+        def resolve():
+            resolved = []
+            for version_range in ranges:
+                require = Requirement(ConanFileReference.loads("Say/%s@user/channel"
+                                                               % version_range))
+                resolver.resolve(require, "Hello/0.1@user/channel", update=False,
+                                 remotes=remotes)
+                resolved.append(require.ref.version)
+            return resolved
+
+        _CountingSemVer.constructed = _CountingRange.constructed = 0
+        with patch.object(semver, "SemVer", _CountingSemVer), \
+                patch.object(semver, "Range", _CountingRange):
+            expected = ["1.9.99", "3.4.99", "5.9.99", "7.7.7", "9.9.98", "9.9.99"]
+            self.assertEqual(expected, resolve())
+            # Every version is parsed once, besides the versions of the range comparators
+            self.assertEqual(len(versions), len(range_resolver._parsed_versions))
+            self.assertLess(_CountingSemVer.constructed, len(versions) + 20)
+            self.assertEqual(len(ranges), _CountingRange.constructed)
+
+            # Resolving them again doesn't parse anything
+            _CountingSemVer.constructed = _CountingRange.constructed = 0
+            for _ in range(4):
+                self.assertEqual(expected, resolve())
+            self.assertEqual(0, _CountingSemVer.constructed)
+            self.assertEqual(0, _CountingRange.constructed)
+        self.assertEqual(1, remote_manager.search_recipes.call_count)
+
+    @patch.dict(range_resolver._version_indexes, clear=True)
+    def test_versions_changed(self):
+        output = []
+        versions = ["1.0", "1.1"]
+        self.assertEqual("1.1", satisfying(versions, "*", output, name="Say"))
+        index = range_resolver._version_indexes["Say", True][1]
+        self.assertEqual("1.1", satisfying(list(versions), "*", output, name="Say"))
+        self.assertIs(index, range_resolver._version_indexes["Say", True][1])
+        # A new version of the same name sorts them again
+        self.assertEqual("1.2", satisfying(versions + ["1.2"], "*", output, name="Say"))
+        self.assertIsNot(index, range_resolver._version_indexes["Say", True][1])
+        self.assertEqual("1.1", satisfying(versions, "*", output, name="Say"))
+        self.assertEqual("1.1", satisfying(versions, "*", output, name="Other"))
+        self.assertEqual(2, len(range_resolver._version_indexes))
+
+    @patch.dict(range_resolver._compiled_ranges, clear=True)
+    @patch.dict(range_resolver._parsed_versions, clear=True)
+    @patch.dict(range_resolver._version_indexes, clear=True)
+    def test_bounded(self):
+        output = []
+        with patch.object(range_resolver, "_MAX_COMPILED_RANGES", 3), \
+                patch.object(range_resolver, "_MAX_PARSED_VERSIONS", 3), \
+                patch.object(range_resolver, "_MAX_VERSION_INDEXES", 3):
+            for i in range(10):
+                versions = ["%d.0" % i, "%d.1" % i]
+                self.assertEqual("%d.1" % i, satisfying(versions, "~%d" % i, output,
+                                                        name="Pkg%d" % i))
+                self.assertLessEqual(len(range_resolver._compiled_ranges), 3)
+                self.assertLessEqual(len(range_resolver._parsed_versions), 3)
+                self.assertLessEqual(len(range_resolver._version_indexes), 3)
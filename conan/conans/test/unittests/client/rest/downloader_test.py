@@ -0,0 +1,151 @@
+import hashlib
+import io
+import os
+import tarfile
+import unittest
+
+import six
+
+from conans.client.rest.uploader_downloader import FileDownloader
+from conans.errors import ConanException
+from conans.test.utils.test_files import temp_folder
+from conans.test.utils.tools import TestBufferConanOutput
+from conans.util.files import load
+
+
+def _tgz_contents(files):
+    tgz = io.BytesIO()
+    with tarfile.open(fileobj=tgz, mode="w:gz") as the_tar:
+        for name, contents in files.items():
+            info = tarfile.TarInfo(name)
+            info.size = len(contents)
+            the_tar.addfile(info, io.BytesIO(contents))
+    return tgz.getvalue()
+
+
+class _MockResponse(object):
+    ok = True
+    status_code = 200
+
+    def __init__(self, content, headers):
+        self._content = content
+        self.headers = headers
+
+    @property
+    def content(self):
+        return self._content
+
+    def iter_content(self, chunk_size):
+        for i in range(0, len(self._content), chunk_size):
+            yield self._content[i:i + chunk_size]
+
+    def close(self):
+        pass
+
+
+class _MockRequester(object):
+    retry = 0
+    retry_wait = 0
+
+    def __init__(self, content, headers):
+        self._response = _MockResponse(content, headers)
+
+    def get(self, *args, **kwargs):
+        return self._response
+
+
+class DownloadExtractTest(unittest.TestCase):
+
+    def setUp(self):
+        self.files = {"include/lib.h": b"header", "lib/lib.a": b"binary" * 100000}
+        self.content = _tgz_contents(self.files)
+
+    def _download_extract(self, headers):
+        folder = temp_folder()
+        downloader = FileDownloader(_MockRequester(self.content, headers),
+                                    TestBufferConanOutput(), verify=False)
+        downloader.download_extract("fake_url", folder)
+        return folder
+
+    def test_download_extract(self):
+        headers = {"content-length": str(len(self.content)),
+                   "X-Checksum-Sha1": hashlib.sha1(self.content).hexdigest()}
+        folder = self._download_extract(headers)
+        for name, contents in self.files.items():
+            self.assertEqual(contents.decode(), load(os.path.join(folder, name)))
+
+    def test_bad_checksum(self):
+        headers = {"content-length": str(len(self.content)), "X-Checksum-Sha1": "123"}
+        with six.assertRaisesRegex(self, ConanException, "Bad checksum of the downloaded file"):
+            self._download_extract(headers)
+
+    def test_interrupted(self):
+        headers = {"content-length": str(len(self.content) + 10)}
+        with six.assertRaisesRegex(self, ConanException, "Transfer interrupted before complete"):
+            self._download_extract(headers)
+
+
+class _ResumeRequester(object):
+    """ Breaks the connection in the middle of the first request, answering the next ones with
+    the requested range
+    """
+    retry = 1
+    retry_wait = 0
+
+    def __init__(self, content, checksum, content_length=True):
+        self._content = content
+        self._checksum = checksum
+        self._content_length = content_length
+        self.ranges = []
+
+    def get(self, url, headers=None, **kwargs):
+        requested = (headers or {}).get("Range")
+        self.ranges.append(requested)
+        headers = {"X-Checksum-Sha1": self._checksum}
+        if requested is None:
+            response = _MockResponse(self._content, headers)
+            broken = response.iter_content
+
+            def iter_content(chunk_size):
+                yield next(broken(len(self._content) // 2))
+                raise Exception("Connection broken")
+            response.iter_content = iter_content
+        else:
+            offset = int(requested[len("bytes="):-1])
+            headers["Content-Range"] = "bytes %d-%d/%d" % (offset, len(self._content) - 1,
+                                                           len(self._content))
+            response = _MockResponse(self._content[offset:], headers)
+            response.status_code = 206
+            if not self._content_length:
+                return response
+        response.headers["content-length"] = str(len(response._content))
+        return response
+
+
+class ResumeDownloadTest(unittest.TestCase):
+
+    def setUp(self):
+        self.content = b"contents" * 1000
+        self.file_path = os.path.join(temp_folder(), "file.txt")
+
+    def test_resume(self):
+        requester = _ResumeRequester(self.content, hashlib.sha1(self.content).hexdigest())
+        FileDownloader(requester, TestBufferConanOutput(), verify=False).download("fake_url",
+                                                                                  self.file_path)
+        self.assertEqual([None, "bytes=%d-" % (len(self.content) // 2)], requester.ranges)
+        self.assertEqual(self.content.decode(), load(self.file_path))
+
+    def test_resume_without_content_length(self):
+        requester = _ResumeRequester(self.content, hashlib.sha1(self.content).hexdigest(),
+                                     content_length=False)
+        FileDownloader(requester, TestBufferConanOutput(), verify=False).download("fake_url",
+                                                                                  self.file_path)
+        self.assertEqual([None, "bytes=%d-" % (len(self.content) // 2)], requester.ranges)
+        self.assertEqual(self.content.decode(), load(self.file_path))
+
+    def test_resume_bad_checksum(self):
+        requester = _ResumeRequester(self.content, "123")
+        output = TestBufferConanOutput()
+        with six.assertRaisesRegex(self, ConanException, "Bad checksum of the downloaded file"):
+            FileDownloader(requester, output, verify=False).download("fake_url", self.file_path)
+        self.assertFalse(os.path.exists(self.file_path))
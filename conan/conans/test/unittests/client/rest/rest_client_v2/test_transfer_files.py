@@ -0,0 +1,151 @@
+# coding=utf-8
+
+import os
+import threading
+import time
+import unittest
+from multiprocessing.pool import ThreadPool
+
+from conans.client.rest.rest_client import RestApiClient
+from conans.client.rest.rest_client_v2 import RestV2Methods
+from conans.errors import ConanException
+from conans.test.utils.test_files import temp_folder
+from conans.test.utils.tools import TestBufferConanOutput
+from conans.util.files import load, save
+
+
+class _Response(object):
+
+    def __init__(self, content=b"", status_code=200):
+        self.content = content
+        self.status_code = status_code
+        self.ok = status_code == 200
+        self.headers = {"content-length": str(len(content))}
+
+    def iter_content(self, chunk_size):
+        for i in range(0, len(self.content), chunk_size):
+            yield self.content[i:i + chunk_size]
+
+    def close(self):
+        pass
+
+    def raise_for_status(self):
+        if not self.ok:
+            raise Exception("Error %s" % self.status_code)
+
+
+class _ConcurrentRequester(object):
+    """ Records the maximum number of requests running at the same time and the order in which
+    they finished. With wait_running, every request waits until that many are running, or
+    a timeout, so they overlap
+    """
+    retry = 0
+    retry_wait = 0
+
+    def __init__(self, latency=0.1, wait_running=None):
+        self._latency = latency
+        self._wait_running = wait_running
+        self._lock = threading.Condition()
+        self._running = 0
+        self.max_running = 0
+        self.finished = []
+
+    def _request(self, url, response):
+        with self._lock:
+            self._running += 1
+            self.max_running = max(self.max_running, self._running)
+            self._lock.notify_all()
+            if self._wait_running:
+                timeout = time.time() + 5
+                while self.max_running < self._wait_running and time.time() < timeout:
+                    self._lock.wait(0.1)
+        time.sleep(self._latency)
+        with self._lock:
+            self._running -= 1
+            self.finished.append(url)
+        return response
+
+    def get(self, url, **kwargs):
+        return self._request(url, _Response(("contents of %s" % url).encode()))
+
+    def put(self, url, data, **kwargs):
+        return self._request(url, _Response(status_code=500 if "fail" in url else 200))
+
+
+class TransferFilesTest(unittest.TestCase):
+
+    def _client(self, requester, parallel_download):
+        output = TestBufferConanOutput()
+        transfer_pool = ThreadPool(parallel_download) if parallel_download else None
+        return RestV2Methods("http://some.url", token=None, custom_headers=None, output=output,
+                             requester=requester, verify_ssl=False,
+                             transfer_pool=transfer_pool), output
+
+    def test_download(self):
+        files = ["conan_package.tgz", "conaninfo.txt", "conanmanifest.txt"]
+        for parallel_download in (None, 4):
+            requester = _ConcurrentRequester(wait_running=3 if parallel_download else None)
+            client, output = self._client(requester, parallel_download)
+            folder = temp_folder()
+            client._download_and_save_files({f: f for f in files}, folder, files)
+
+            if parallel_download:
+                self.assertEqual(requester.max_running, 3)
+            else:
+                self.assertEqual(requester.max_running, 1)
+            for f in files:
+                self.assertEqual("contents of %s" % f, load(os.path.join(folder, f)))
+            # Output in the same order as the sequential download
+            lines = [line for line in str(output).splitlines() if line]
+            self.assertEqual(["Downloading conanmanifest.txt", "Downloading conaninfo.txt",
+                              "Downloading conan_package.tgz"], lines)
+
+    def test_upload_compressed_first(self):
+        folder = temp_folder()
+        files = {}
+        for f in ["conan_export.tgz", "conan_sources.tgz", "conanfile.py", "conanmanifest.txt"]:
+            files[f] = os.path.join(folder, f)
+            save(files[f], "contents")
+        requester = _ConcurrentRequester(wait_running=2)
+        client, output = self._client(requester, parallel_download=4)
+        client._upload_files(files, {f: f for f in files}, retry=0, retry_wait=0)
+
+        # The two tgz files are uploaded at the same time, before the other two
+        self.assertEqual(requester.max_running, 2)
+        self.assertEqual(["conan_export.tgz", "conan_sources.tgz"], sorted(requester.finished[:2]))
+        self.assertEqual(["conanfile.py", "conanmanifest.txt"], sorted(requester.finished[2:]))
+
+    def test_upload_failed(self):
+        folder = temp_folder()
+        files = {}
+        for f in ["conan_package.tgz", "conaninfo_fail.txt", "conanmanifest.txt"]:
+            files[f] = os.path.join(folder, f)
+            save(files[f], "contents")
+        client, output = self._client(_ConcurrentRequester(latency=0), parallel_download=4)
+        with self.assertRaises(ConanException) as exc:
+            client._upload_files(files, {f: f for f in files}, retry=0, retry_wait=0)
+        self.assertIn("the failed files: conaninfo_fail.txt", str(exc.exception))
+        self.assertIn("Error uploading file: conaninfo_fail.txt", str(output))
+
+    def test_transfer_pool(self):
+        # The same pool is used by all the transfers of the client
+        client = RestApiClient(TestBufferConanOutput(), requester=None, revisions_enabled=True,
+                               parallel_download=4)
+        pool = client._get_transfer_pool()
+        self.assertIsNotNone(pool)
+        self.assertIs(pool, client._get_transfer_pool())
+        client = RestApiClient(TestBufferConanOutput(), requester=None, revisions_enabled=True)
+        self.assertIsNone(client._get_transfer_pool())
+
+    def test_close_transfer_pool(self):
+        threads = threading.active_count()
+        client = RestApiClient(TestBufferConanOutput(), requester=None, revisions_enabled=True,
+                               parallel_download=4)
+        pool = client._get_transfer_pool()
+        self.assertGreater(threading.active_count(), threads)
+        client.close()
+        # The threads are finished, a new pool is created if it is needed again
+        self.assertEqual(threads, threading.active_count())
+        self.assertIsNot(pool, client._get_transfer_pool())
+        client.close()
+        client.close()
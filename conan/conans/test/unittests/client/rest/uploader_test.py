@@ -4,10 +4,10 @@ from collections import namedtuple
 
 import six
 
-from conans.client.rest.uploader_downloader import FileUploader
+from conans.client.rest.uploader_downloader import FileUploader, UploadBodyAdapter
 from conans.errors import AuthenticationException, ForbiddenException
 from conans.test.utils.tools import TestBufferConanOutput
-from conans.util.files import save
+from conans.util.files import save, save_append
 
 
 class UploaderUnitTest(unittest.TestCase):
@@ -61,3 +61,61 @@ class UploaderUnitTest(unittest.TestCase):
         save(f, "some contents")
         with six.assertRaisesRegex(self, ForbiddenException, "tururu"):
             uploader.upload("fake_url", f, auth=auth)
+
+    def test_retry_sends_whole_file(self):
+
+        class MockRequester(object):
+            retry = 1
+            retry_wait = 0
+
+            def __init__(self):
+                self.bodies = []
+
+            def put(self, url, data, **kwargs):
+                self.bodies.append(b"".join(block.tobytes() for block in data))
+                if len(self.bodies) == 1:
+                    raise Exception("Connection broken")
+                return namedtuple("response", "status_code raise_for_status")(200, lambda: None)
+
+        requester = MockRequester()
+        uploader = FileUploader(requester, TestBufferConanOutput(), verify=False)
+        f = tempfile.mktemp()
+        save(f, "some contents")
+        uploader.upload("fake_url", f)
+        self.assertEqual([b"some contents", b"some contents"], requester.bodies)
+
+
+class UploadBodyAdapterTest(unittest.TestCase):
+
+    def setUp(self):
+        self.path = tempfile.mktemp()
+        save(self.path, "")
+        for i in range(1000):
+            save_append(self.path, "line %s\n" % i)
+        with open(self.path, "rb") as f:
+            self.content = f.read()
+
+    def test_read_blocks(self):
+        with UploadBodyAdapter(self.path, TestBufferConanOutput(), block_size=1000) as data:
+            self.assertEqual(len(self.content), len(data))
+            blocks = []
+            while True:
+                # The http client size hint doesn't matter, a whole block is read
+                block = data.read(10)
+                if not block:
+                    break
+                self.assertLessEqual(len(block), 1000)
+                blocks.append(block.tobytes())
+        self.assertEqual(self.content, b"".join(blocks))
+        self.assertEqual(len(self.content) // 1000 + 1, len(blocks))
+
+    def test_adaptive_block_size(self):
+        with UploadBodyAdapter(self.path, TestBufferConanOutput()) as data:
+            # Small files are sent in a single block
+            self.assertEqual([self.content], [block.tobytes() for block in data])
+
+    def test_closed_file(self):
+        with UploadBodyAdapter(self.path, TestBufferConanOutput()) as data:
+            pass
+        with self.assertRaises(ValueError):
+            data.read()
@@ -2,10 +2,14 @@ import os
 import time
 import unittest
 
+from mock import patch
+
 from conans.client.cmd.uploader import compress_files
+from conans.client.tools import environment_append
 from conans.paths import PACKAGE_TGZ_NAME
 from conans.test.utils.test_files import temp_folder
-from conans.util.files import md5sum, mkdir, path_exists, save
+from conans.util.files import load, md5sum, mkdir, path_exists, save, tar_extract
+from conans.util.parallel_gzip import ParallelGzipFile
 
 
 class FilesTest(unittest.TestCase):
@@ -39,6 +43,32 @@ class FilesTest(unittest.TestCase):
 
         self.assertEqual(md5_a, md5_b)
 
+    def test_md5_compress_parallel(self):
+        """
+        The parallel compression gives the same tgz with any number of threads
+        """
+        folder = temp_folder()
+        files = {}
+        for i in range(10):
+            files["file%s.txt" % i] = os.path.join(folder, "file%s.txt" % i)
+            save(files["file%s.txt" % i], "contents of the file %s\n" % i * 1000)
+
+        md5s = set()
+        with patch.object(ParallelGzipFile, "block_size", 4096):
+            for threads in ("1", "4"):
+                dest_folder = temp_folder()
+                with environment_append({"CONAN_COMPRESSION_THREADS": threads}):
+                    file_path = compress_files(files, {}, PACKAGE_TGZ_NAME, dest_dir=dest_folder)
+                md5s.add(md5sum(file_path))
+        self.assertEqual(1, len(md5s))
+
+        for stream in (False, True):
+            extract_folder = temp_folder()
+            with open(file_path, "rb") as file_handler:
+                tar_extract(file_handler, extract_folder, stream=stream)
+            for name, path in files.items():
+                self.assertEqual(load(path), load(os.path.join(extract_folder, name)))
+
     def test_path_exists(self):
         """
         Unit test of path_exists
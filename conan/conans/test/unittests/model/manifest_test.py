@@ -1,9 +1,13 @@
 import os
+import time
 import unittest
 
+from mock import patch
+
+from conans.client.tools.env import environment_append
 from conans.model.manifest import FileTreeManifest
 from conans.test.utils.test_files import temp_folder
-from conans.util.files import load, md5, save
+from conans.util.files import load, md5, md5sum, save
 
 
 class ManifestTest(unittest.TestCase):
@@ -45,3 +49,40 @@ class ManifestTest(unittest.TestCase):
         # Not included the pycs or pyo
         self.assertEqual(set(read_manifest.file_sums.keys()),
                           set(["conanfile.py"]))
+
+    def test_threads(self):
+        tmp_dir = temp_folder()
+        for i in range(20):
+            save(os.path.join(tmp_dir, "folder%d" % (i % 3), "file%d.txt" % i), "contents %d" % i)
+        with environment_append({"CONAN_MANIFEST_THREADS": "1"}):
+            manifest = FileTreeManifest.create(tmp_dir)
+        with environment_append({"CONAN_MANIFEST_THREADS": "4"}):
+            self.assertEqual(manifest, FileTreeManifest.create(tmp_dir))
+        self.assertEqual(md5("contents 7"), manifest.file_sums["folder1/file7.txt"])
+
+    def test_stat_cache(self):
+        tmp_dir = temp_folder()
+        old = time.time() - 100
+        for name in ("one.txt", "path/two.txt", "three.txt"):
+            save(os.path.join(tmp_dir, name), name)
+            os.utime(os.path.join(tmp_dir, name), (old, old))
+        save(os.path.join(tmp_dir, "recent.txt"), "recent")
+        stat_cache = os.path.join(temp_folder(), "export.json")
+
+        with environment_append({"CONAN_MANIFEST_STAT_CACHE": "True"}):
+            manifest = FileTreeManifest.create(tmp_dir, stat_cache=stat_cache)
+            self.assertTrue(os.path.exists(stat_cache))
+            # It is not saved in the folder
+            self.assertEqual(["one.txt", "path", "recent.txt", "three.txt"],
+                             sorted(os.listdir(tmp_dir)))
+
+            # Only the modified and the recently modified files are read again
+            save(os.path.join(tmp_dir, "three.txt"), "modified")
+            with patch("conans.model.manifest.md5sum", side_effect=md5sum) as md5sum_mock:
+                new_manifest = FileTreeManifest.create(tmp_dir, stat_cache=stat_cache)
+            self.assertEqual(sorted(["three.txt", "recent.txt"]),
+                             sorted(os.path.basename(call[0][0])
+                                    for call in md5sum_mock.call_args_list))
+            self.assertEqual(manifest.file_sums["path/two.txt"],
+                             new_manifest.file_sums["path/two.txt"])
+            self.assertEqual(md5("modified"), new_manifest.file_sums["three.txt"])
@@ -1,5 +1,6 @@
 import unittest
 
+from conans.model.info import ConanInfo
 from conans.model.package_metadata import PackageMetadata
 
 
@@ -33,3 +34,34 @@ class PackageMetadataTest(unittest.TestCase):
         self.assertEqual(b, a)
         self.assertEqual(b.packages["ID"].revision, {"23": 45})
         self.assertEqual(b.packages["ID"].properties["Someprop"], [23, 2444])
+
+    def test_archives(self):
+        a = PackageMetadata()
+        a.recipe.archives["conan_export.tgz"] = "hash1"
+        a.packages["ID"].archives["conan_package.tgz"] = "hash2"
+
+        b = PackageMetadata.loads(a.dumps())
+        self.assertEqual(b.recipe.archives, {"conan_export.tgz": "hash1"})
+        self.assertEqual(b.packages["ID"].archives, {"conan_package.tgz": "hash2"})
+
+        # Metadata saved by previous versions has no archives
+        b = PackageMetadata.loads('{"recipe": {"revision": "rev", "properties": {}}, '
+                                  '"packages": {"ID": {"revision": "prev", "properties": {}}}}')
+        self.assertEqual(b.recipe.archives, {})
+        self.assertEqual(b.packages["ID"].archives, {})
+
+    def test_info(self):
+        a = PackageMetadata()
+        a.packages["ID"].revision = "prev"
+        a.packages["ID"].set_info(ConanInfo.loads("[settings]\n    os=Linux\n"
+                                                  "[recipe_hash]\n    hash"))
+
+        b = PackageMetadata.loads(a.dumps())
+        self.assertEqual(b.packages["ID"].get_info(),
+                         {"settings": {"os": "Linux"}, "options": {}, "full_requires": [],
+                          "recipe_hash": "hash"})
+
+        # Not valid for other revision
+        b.packages["ID"].revision = "prev2"
+        self.assertIsNone(b.packages["ID"].get_info())
+        self.assertIsNone(PackageMetadata().packages["ID"].get_info())
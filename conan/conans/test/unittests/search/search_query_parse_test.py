@@ -2,7 +2,7 @@ import unittest
 
 import six
 
-from conans.search.query_parse import evaluate_postfix, infix_to_postfix
+from conans.search.query_parse import compile_postfix, evaluate_postfix, infix_to_postfix
 
 
 class QueryParseTest(unittest.TestCase):
@@ -46,3 +46,19 @@ class QueryParseTest(unittest.TestCase):
         self.assertTrue(evaluate("a=2 AND j=45 OR (h=23 AND a=2)"))
         self.assertTrue(evaluate("((((a=2 AND ((((f=23 OR j=45))))))))"))
         self.assertFalse(evaluate("((((a=2 AND ((((f=23 OR j=42))))))))"))
+
+    def test_compile_postfix(self):
+
+        def compiler(expr):
+            name, value = expr.split("=")
+            return lambda values: values.get(name) == value
+
+        predicate = compile_postfix(infix_to_postfix("a=2 AND (f=23 OR j=45)"), compiler)
+        self.assertTrue(predicate({"a": "2", "j": "45"}))
+        self.assertTrue(predicate({"a": "2", "f": "23"}))
+        self.assertFalse(predicate({"a": "2", "j": "435"}))
+        self.assertFalse(predicate({"j": "45"}))
+
+        self.assertTrue(compile_postfix(infix_to_postfix(""), compiler)({}))
+        with six.assertRaisesRegex(self, Exception, "Bad stack: \\['a=2', 'b=3'\\]"):
+            compile_postfix(infix_to_postfix("a=2 b=3"), compiler)
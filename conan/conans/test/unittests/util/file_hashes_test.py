@@ -6,7 +6,7 @@ import six
 from conans.client.tools.files import check_md5, check_sha1, check_sha256
 from conans.errors import ConanException
 from conans.test.utils.test_files import temp_folder
-from conans.util.files import save
+from conans.util.files import file_checksums, save
 
 
 class HashesTest(unittest.TestCase):
@@ -29,3 +29,17 @@ class HashesTest(unittest.TestCase):
 
         with six.assertRaisesRegex(self, ConanException, "sha256 signature failed for 'file.txt' file."):
             check_sha256(filepath, "invalid")
+
+    def checksums_test(self):
+        filepath = os.path.join(temp_folder(), "file.txt")
+        save(filepath, "a file")
+        checksums = {"md5": "d6d0c756fb8abfb33e652a20e85b70bc",
+                     "sha1": "eb599ec83d383f0f25691c184f656d40384f9435"}
+        self.assertEqual(checksums, file_checksums(filepath))
+        self.assertEqual(checksums, file_checksums(filepath))
+
+        # Not reused once the file changes
+        save(filepath, "other file")
+        self.assertEqual({"md5": "d9c7ed1c8fabdd3069e584c6ea4cea82",
+                          "sha1": "b0f86a9851cb0f7a10f26c044ebff54763718015"},
+                         file_checksums(filepath))
@@ -8,7 +8,7 @@ import unittest
 from conans.client.tools.files import chdir
 from conans.model.manifest import gather_files
 from conans.test.utils.test_files import temp_folder
-from conans.util.files import tar_extract, gzopen_without_timestamps, save
+from conans.util.files import gzopen_without_timestamps, load, save, tar_extract
 
 
 class TarExtractTest(unittest.TestCase):
@@ -61,3 +61,19 @@ class TarExtractTest(unittest.TestCase):
             with open(self.tgz_file, 'rb') as file_handler:
                 tar_extract(file_handler, destination_dir)
             check_files(destination_dir)
+
+    @unittest.skipIf(platform.system() == "Windows", "Hardlinks are not always supported")
+    def test_link_source(self):
+        existing = os.path.join(temp_folder(), "existing")
+        save(existing, "contents")
+
+        def link_source(member):
+            return existing if member.name == "folder/file2" else None
+
+        destination_dir = os.path.join(self.tmp_folder, "dest")
+        with open(self.tgz_file, 'rb') as file_handler:
+            tar_extract(file_handler, destination_dir, link_source=link_source)
+        self.assertEqual("", load(os.path.join(destination_dir, "file1")))
+        self.assertEqual("contents", load(os.path.join(destination_dir, "folder", "file2")))
+        self.assertTrue(os.path.samefile(existing,
+                                         os.path.join(destination_dir, "folder", "file2")))
@@ -0,0 +1,37 @@
+import os
+import threading
+import time
+import unittest
+
+from mock import patch
+
+from conans.util.fork import acquire_fork_locks, release_fork_locks
+
+
+@unittest.skipUnless(hasattr(os, "fork"), "Requires fork")
+class ForkLocksTest(unittest.TestCase):
+
+    def test_lock_held_by_other_thread(self):
+        locks = [threading.Lock(), threading.RLock()]
+        held = threading.Event()
+
+        def hold():
+            with locks[0], locks[1]:
+                held.set()
+                time.sleep(0.2)
+
+        with patch("conans.util.fork._fork_locks", locks):
+            thread = threading.Thread(target=hold)
+            thread.start()
+            held.wait()
+            acquire_fork_locks()  # Waits for the thread to release them
+            pid = os.fork()
+            if pid == 0:
+                release_fork_locks()
+                # The child can use them, no other thread of the parent holds them
+                os._exit(0 if all(lock.acquire(False) for lock in locks) else 1)
+            release_fork_locks()
+            thread.join()
+            _, status = os.waitpid(pid, 0)
+        self.assertEqual(0, status)
+        self.assertTrue(all(lock.acquire(False) for lock in locks))
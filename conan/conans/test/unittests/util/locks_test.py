@@ -0,0 +1,138 @@
+import multiprocessing
+import os
+import platform
+import threading
+import time
+import unittest
+
+import six
+
+from conans.errors import ConanException
+from conans.model.ref import ConanFileReference
+from conans.test.utils.conanfile import TestConanFile
+from conans.test.utils.test_files import temp_folder
+from conans.test.utils.tools import TestBufferConanOutput, TestClient
+from conans.util.files import load, save
+from conans.util.locks import OSReadLock, OSWriteLock
+
+PROCESSES = 32
+ITERATIONS = 10
+
+
+def _worker(folder, index, readers, max_readers, errors):
+    """ Writers increment a counter without any atomic operation, readers check that no writer
+    is modifying it. Each process reads and writes
+    """
+    output = TestBufferConanOutput()
+    counter = os.path.join(folder, "counter.txt")
+    writing = os.path.join(folder, "writing")
+    for i in range(ITERATIONS):
+        if (index + i) % 3:
+            with OSReadLock(folder, "Pkg/0.1@user/channel", output):
+                with readers.get_lock():
+                    readers.value += 1
+                    max_readers.value = max(max_readers.value, readers.value)
+                if os.path.exists(writing):
+                    with errors.get_lock():
+                        errors.value += 1
+                time.sleep(0.01)
+                with readers.get_lock():
+                    readers.value -= 1
+        else:
+            with OSWriteLock(folder, "Pkg/0.1@user/channel", output):
+                if readers.value or os.path.exists(writing):
+                    with errors.get_lock():
+                        errors.value += 1
+                save(writing, "")
+                value = int(load(counter))
+                time.sleep(0.005)
+                save(counter, str(value + 1))
+                os.remove(writing)
+
+
+@unittest.skipIf(platform.system() == "Windows", "No OS shared locks in Windows")
+class OSLocksTest(unittest.TestCase):
+
+    def setUp(self):
+        self.folder = os.path.join(temp_folder(), "Pkg", "0.1", "user", "channel")
+        self.output = TestBufferConanOutput()
+
+    def test_stress_processes(self):
+        save(os.path.join(self.folder, "counter.txt"), "0")
+        readers = multiprocessing.Value("i", 0)
+        max_readers = multiprocessing.Value("i", 0)
+        errors = multiprocessing.Value("i", 0)
+        processes = [multiprocessing.Process(target=_worker,
+                                             args=(self.folder, i, readers, max_readers, errors))
+                     for i in range(PROCESSES)]
+        for process in processes:
+            process.start()
+        for process in processes:
+            process.join()
+
+        self.assertEqual([0] * PROCESSES, [process.exitcode for process in processes])
+        self.assertEqual(0, errors.value)
+        writes = sum(1 for index in range(PROCESSES) for i in range(ITERATIONS)
+                     if not (index + i) % 3)
+        self.assertEqual(str(writes), load(os.path.join(self.folder, "counter.txt")))
+        self.assertGreater(max_readers.value, 1)
+        # Same file layout than the counting locks
+        self.assertTrue(os.path.exists(self.folder + ".count.lock"))
+
+    def test_threads(self):
+        events = []
+
+        def write():
+            with OSWriteLock(self.folder, "Pkg/0.1@user/channel", self.output):
+                events.append("write")
+
+        with OSReadLock(self.folder, "Pkg/0.1@user/channel", self.output):
+            with OSReadLock(self.folder, "Pkg/0.1@user/channel", self.output):
+                thread = threading.Thread(target=write)
+                thread.start()
+                time.sleep(0.2)
+                events.append("read")
+        thread.join()
+        self.assertEqual(["read", "write"], events)
+        self.assertIn("Pkg/0.1@user/channel is locked by another concurrent conan process",
+                      self.output)
+
+    def test_timeout(self):
+        with OSWriteLock(self.folder, "Pkg/0.1@user/channel", self.output):
+            lock = OSReadLock(self.folder, "Pkg/0.1@user/channel", self.output, timeout=0.1)
+            with six.assertRaisesRegex(self, ConanException,
+                                       "Timeout waiting 0.1 seconds for the lock of "
+                                       "Pkg/0.1@user/channel"):
+                with lock:
+                    pass
+            lock = OSWriteLock(self.folder, "Pkg/0.1@user/channel", self.output, timeout=0)
+            with self.assertRaises(ConanException):
+                with lock:
+                    pass
+        with OSWriteLock(self.folder, "Pkg/0.1@user/channel", self.output, timeout=0):
+            pass
+
+    def test_cache_os_locks(self):
+        client = TestClient()
+        client.run("config set general.cache_os_locks=True")
+        client.save({"conanfile.py": str(TestConanFile("Pkg", "0.1"))})
+        client.run("create . user/channel")
+        layout = client.cache.package_layout(ConanFileReference.loads("Pkg/0.1@user/channel"))
+        self.assertIsInstance(layout.conanfile_write_lock(client.out), OSWriteLock)
+        count_file, count_lock_file = layout.conanfile_lock_files(client.out)
+        self.assertFalse(os.path.exists(count_file))
+        self.assertTrue(os.path.exists(count_lock_file))
+        client.run("remove Pkg* -f")
+        self.assertFalse(os.path.exists(count_lock_file))
+
+    def test_cache_lock_timeout(self):
+        client = TestClient()
+        client.run("config set general.cache_os_locks=True")
+        client.run("config set general.cache_lock_timeout=0.1")
+        client.save({"conanfile.py": str(TestConanFile("Pkg", "0.1"))})
+        client.run("create . user/channel")
+        layout = client.cache.package_layout(ConanFileReference.loads("Pkg/0.1@user/channel"))
+        with layout.conanfile_write_lock(client.out):
+            client.run("install Pkg/0.1@user/channel", assert_error=True)
+        self.assertIn("Timeout waiting 0.1 seconds for the lock of Pkg/0.1@user/channel",
+                      client.out)
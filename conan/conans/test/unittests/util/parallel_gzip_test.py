@@ -0,0 +1,52 @@
+import gzip
+import io
+import unittest
+import zlib
+
+from mock import patch
+
+from conans.util.parallel_gzip import ParallelGzipFile
+
+
+class ParallelGzipFileTest(unittest.TestCase):
+
+    def setUp(self):
+        self.contents = b"".join(b"line %d\n" % i for i in range(100000))
+
+    def _compress(self, contents, threads, level=9, chunk_size=1000):
+        output = io.BytesIO()
+        gzip_file = ParallelGzipFile("file.tgz", output, level, threads)
+        for i in range(0, len(contents), chunk_size):
+            gzip_file.write(contents[i:i + chunk_size])
+        self.assertEqual(len(contents), gzip_file.tell())
+        gzip_file.close()
+        return output.getvalue()
+
+    def test_decompress(self):
+        with patch.object(ParallelGzipFile, "block_size", 64 * 1024):
+            compressed = self._compress(self.contents, threads=4)
+        self.assertEqual(self.contents, gzip.GzipFile(fileobj=io.BytesIO(compressed)).read())
+        # A single gzip member, the decompression ends after the trailer
+        decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+        self.assertEqual(self.contents, decompressor.decompress(compressed))
+        self.assertEqual(b"", decompressor.unused_data)
+        # Same header than GzipFile without timestamps
+        self.assertEqual(b"\x1f\x8b\x08\x08\x00\x00\x00\x00\x02\xfffile.tgz\x00",
+                         compressed[:len("file.tgz") + 11])
+
+    def test_deterministic(self):
+        with patch.object(ParallelGzipFile, "block_size", 64 * 1024):
+            results = {self._compress(self.contents, threads=threads, chunk_size=chunk_size)
+                       for threads in (1, 2, 8) for chunk_size in (512, 100000)}
+        self.assertEqual(1, len(results))
+
+    def test_compression_level(self):
+        fast = self._compress(self.contents, threads=2, level=1)
+        best = self._compress(self.contents, threads=2, level=9)
+        self.assertLess(len(best), len(fast))
+        for compressed in (fast, best):
+            self.assertEqual(self.contents, gzip.GzipFile(fileobj=io.BytesIO(compressed)).read())
+
+    def test_empty(self):
+        compressed = self._compress(b"", threads=2)
+        self.assertEqual(b"", gzip.GzipFile(fileobj=io.BytesIO(compressed)).read())
@@ -33,7 +33,7 @@ from conans.client.hook_manager import HookManager
 from conans.client.loader import ProcessedProfile
 from conans.client.output import ConanOutput
 from conans.client.rest.conan_requester import ConanRequester
-from conans.client.rest.uploader_downloader import IterableToFileAdapter
+from conans.client.rest.uploader_downloader import UploadBodyAdapter
 from conans.client.runner import ConanRunner
 from conans.client.tools import environment_append
 from conans.client.tools.files import chdir
@@ -113,7 +113,7 @@ class TestingResponse(object):
 
     @property
     def ok(self):
-        return self.test_response.status_code == 200
+        return self.test_response.status_code < 400
 
     def raise_for_status(self):
         """Raises stored :class:`HTTPError`, if one occurred."""
@@ -220,11 +220,8 @@ class TestRequester(object):
             kwargs.pop("cert", None)
             kwargs.pop("timeout", None)
             if "data" in kwargs:
-                if isinstance(kwargs["data"], IterableToFileAdapter):
-                    data_accum = b""
-                    for tmp in kwargs["data"]:
-                        data_accum += tmp
-                    kwargs["data"] = data_accum
+                if isinstance(kwargs["data"], UploadBodyAdapter):
+                    kwargs["data"] = b"".join(block.tobytes() for block in kwargs["data"])
                 kwargs["params"] = kwargs["data"]
                 del kwargs["data"]  # Parameter in test app is called "params"
             if kwargs.get("json"):
@@ -813,7 +810,8 @@ servers["r2"] = TestServer()
         put_headers = self.cache.read_put_headers()
         self.rest_api_client = RestApiClient(self.user_io.out, self.requester,
                                              revisions_enabled=config.revisions_enabled,
-                                             put_headers=put_headers)
+                                             put_headers=put_headers,
+                                             parallel_download=config.parallel_download)
         # To store user and token
         self.localdb = LocalDB.create(self.cache.localdb)
         # Wraps RestApiClient to add authentication support (same interface)
@@ -8,11 +8,13 @@ import stat
 import sys
 import tarfile
 import tempfile
+import threading
 
 from os.path import abspath, join as joinpath, realpath
 
 import six
 
+from conans.util.fork import fork_lock
 from conans.util.log import logger
 
 
@@ -120,6 +122,37 @@ def _generic_algorithm_sum(file_path, algorithm_name):
         return m.hexdigest()
 
 
+_checksums_lock = fork_lock(threading.Lock())
+_checksums = {}
+
+
+def file_checksums(file_path):
+    """ Returns a dict with the md5 and sha1 of the file, computed reading it once. They are
+    kept while the file is not modified, so the different steps of the same command that need
+    them (like the upload checksum headers and the tracer) don't read the file again
+    """
+    st = os.stat(file_path)
+    key = (st.st_size, getattr(st, "st_mtime_ns", st.st_mtime), st.st_ino)
+    file_path = os.path.abspath(file_path)
+    with _checksums_lock:
+        cached = _checksums.get(file_path)
+    if cached and cached[0] == key:
+        return dict(cached[1])
+
+    algorithms = {"md5": hashlib.md5(), "sha1": hashlib.sha1()}
+    with open(file_path, 'rb') as fh:
+        while True:
+            data = fh.read(65536)
+            if not data:
+                break
+            for m in algorithms.values():
+                m.update(data)
+    checksums = {name: m.hexdigest() for name, m in algorithms.items()}
+    with _checksums_lock:
+        _checksums[file_path] = (key, checksums)
+    return dict(checksums)
+
+
 def save_append(path, content):
     try:
         os.makedirs(os.path.dirname(path))
@@ -254,14 +287,18 @@ def path_exists(path, basedir):
     return True
 
 
-def gzopen_without_timestamps(name, mode="r", fileobj=None, compresslevel=None, **kwargs):
+def gzopen_without_timestamps(name, mode="r", fileobj=None, compresslevel=None, threads=None,
+                              **kwargs):
     """ !! Method overrided by laso to pass mtime=0 (!=None) to avoid time.time() was
         setted in Gzip file causing md5 to change. Not possible using the
         previous tarfile open because arguments are not passed to GzipFile constructor
+        With threads (or CONAN_COMPRESSION_THREADS) the file is written compressing blocks in
+        parallel
     """
     from tarfile import CompressionError, ReadError
 
     compresslevel = compresslevel or int(os.getenv("CONAN_COMPRESSION_LEVEL", 9))
+    threads = threads or int(os.getenv("CONAN_COMPRESSION_THREADS") or 0)
 
     if mode not in ("r", "w"):
         raise ValueError("mode must be 'r' or 'w'")
@@ -273,7 +310,11 @@ def gzopen_without_timestamps(name, mode="r", fileobj=None, compresslevel=None,
         raise CompressionError("gzip module is not available")
 
     try:
-        fileobj = gzip.GzipFile(name, mode, compresslevel, fileobj, mtime=0)
+        if mode == "w" and threads:
+            from conans.util.parallel_gzip import ParallelGzipFile
+            fileobj = ParallelGzipFile(name, fileobj, compresslevel, threads)
+        else:
+            fileobj = gzip.GzipFile(name, mode, compresslevel, fileobj, mtime=0)
     except OSError:
         if fileobj is not None and mode == 'r':
             raise ReadError("not a gzip file")
@@ -293,13 +334,27 @@ def gzopen_without_timestamps(name, mode="r", fileobj=None, compresslevel=None,
     return t
 
 
-def tar_extract(fileobj, destination_dir):
+def tar_extract(fileobj, destination_dir, stream=False, link_source=None):
     """Extract tar file controlling not absolute paths and fixing the routes
-    if the tar was zipped in windows"""
+    if the tar was zipped in windows. With stream=True the fileobj is read sequentially,
+    without seeking. link_source(member) can return an existing file with the same contents
+    of a member, that is hardlinked instead of extracted"""
     def badpath(path, base):
         # joinpath will ignore base if path is absolute
         return not realpath(abspath(joinpath(base, path))).startswith(base)
 
+    def linked(finfo):
+        source = link_source(finfo) if finfo.isfile() else None
+        if not source:
+            return False
+        target = joinpath(destination_dir, finfo.name)
+        try:
+            mkdir(os.path.dirname(target))
+            os.link(source, target)
+        except OSError:
+            return False
+        return True
+
     def safemembers(members):
         base = realpath(abspath(destination_dir))
 
@@ -309,9 +364,11 @@ def tar_extract(fileobj, destination_dir):
             else:
                 # Fixes unzip a windows zipped file in linux
                 finfo.name = finfo.name.replace("\\", "/")
+                if link_source and linked(finfo):
+                    continue
                 yield finfo
 
-    the_tar = tarfile.open(fileobj=fileobj)
+    the_tar = tarfile.open(fileobj=fileobj, mode="r|*" if stream else "r")
     # NOTE: The errorlevel=2 has been removed because it was failing in Win10, it didn't allow to
     # "could not change modification time", with time=0
     # the_tar.errorlevel = 2  # raise exception if any error
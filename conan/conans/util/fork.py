@@ -0,0 +1,35 @@
+import time
+
+# The locks that the threads of this process use to protect its shared state. A lock held by
+# another thread while forking would never be released in the child process
+_fork_locks = []
+
+
+def fork_lock(lock):
+    """ Registers a lock to be acquired while forking the process, returning it
+    """
+    _fork_locks.append(lock)
+    return lock
+
+
+def acquire_fork_locks():
+    """ Acquires all the registered locks, so no other thread holds them while forking. They are
+    acquired without blocking, and retried, not to deadlock with a thread acquiring them in a
+    different order. Both the parent and the child have to call release_fork_locks() after forking
+    """
+    while True:
+        acquired = []
+        for lock in _fork_locks:
+            if not lock.acquire(False):
+                break
+            acquired.append(lock)
+        else:
+            return
+        for lock in reversed(acquired):
+            lock.release()
+        time.sleep(0.001)
+
+
+def release_fork_locks():
+    for lock in reversed(_fork_locks):
+        lock.release()
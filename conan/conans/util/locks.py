@@ -1,11 +1,18 @@
+import errno
 import os
 import time
 
 import fasteners
 
-from conans.util.files import load, save
+from conans.errors import ConanException
+from conans.util.files import load, mkdir, save
 from conans.util.log import logger
 
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
 
 class NoLock(object):
 
@@ -102,3 +109,71 @@ class WriteLock(Lock):
     def __exit__(self, exc_type, exc_val, exc_tb):  # @UnusedVariable
         with fasteners.InterProcessLock(self._count_lock_file, logger=logger):
             save(self._count_file, "0")
+
+
+def os_locks_supported():
+    return fcntl is not None
+
+
+class _OSLock(Lock):
+    """ Reader/writer lock using the shared/exclusive advisory locks of the OS (flock) on the
+    count lock file. The waiting is done by the OS instead of polling the count file, the lock is
+    released if the process dies and, as each lock opens its own file descriptor, it also works
+    between threads of the same process. It doesn't use the count file, so all the processes
+    sharing a cache must use the same kind of locks
+    """
+    _operation = None
+
+    def __init__(self, folder, locked_item, output, timeout=None):
+        super(_OSLock, self).__init__(folder, locked_item, output)
+        self._timeout = timeout
+        self._fd = None
+
+    def _try_lock(self, fd):
+        try:
+            fcntl.flock(fd, self._operation | fcntl.LOCK_NB)
+            return True
+        except (IOError, OSError) as e:
+            if e.errno not in (errno.EAGAIN, errno.EACCES):
+                raise
+            return False
+
+    def _lock(self, fd):
+        if self._try_lock(fd):
+            return
+        self._info_locked()
+        if self._timeout is None:
+            fcntl.flock(fd, self._operation)
+            return
+        # flock() cannot be interrupted after a timeout, so in that case it has to be polled
+        deadline = time.time() + self._timeout
+        delay = 0.001
+        while not self._try_lock(fd):
+            remaining = deadline - time.time()
+            if remaining <= 0:
+                raise ConanException("Timeout waiting %s seconds for the lock of %s"
+                                     % (self._timeout, str(self._locked_item)))
+            time.sleep(min(delay, remaining))
+            delay = min(delay * 2, 0.1)
+
+    def __enter__(self):
+        mkdir(os.path.dirname(self._count_lock_file))
+        fd = os.open(self._count_lock_file, os.O_RDWR | os.O_CREAT)
+        try:
+            self._lock(fd)
+        except BaseException:
+            os.close(fd)
+            raise
+        self._fd = fd
+
+    def __exit__(self, exc_type, exc_val, exc_tb):  # @UnusedVariable
+        fd, self._fd = self._fd, None
+        os.close(fd)  # Releases the lock
+
+
+class OSReadLock(_OSLock):
+    _operation = fcntl.LOCK_SH if fcntl else None
+
+
+class OSWriteLock(_OSLock):
+    _operation = fcntl.LOCK_EX if fcntl else None
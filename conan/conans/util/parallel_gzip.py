@@ -0,0 +1,81 @@
+import os
+import struct
+import zlib
+from collections import deque
+from multiprocessing.pool import ThreadPool
+
+
+def _deflate(data, level):
+    """ Raw deflate stream of a block that ends in a byte boundary without marking the end of the
+    stream (Z_SYNC_FLUSH), so the compressed blocks can be concatenated
+    """
+    compressor = zlib.compressobj(level, zlib.DEFLATED, -zlib.MAX_WBITS)
+    return compressor.compress(data) + compressor.flush(zlib.Z_SYNC_FLUSH)
+
+
+class ParallelGzipFile(object):
+    """ Write only gzip file that compresses blocks of the contents in a pool of threads (zlib
+    releases the GIL while compressing), like pigz does. The blocks are deflated independently
+    and concatenated in a single gzip member, so any gzip reader, also a streamed one, can read
+    it. The output only depends on the contents, the compression level and the block size, never
+    on the number of threads. The header has no timestamp, as gzopen_without_timestamps
+    """
+    block_size = 1024 * 1024
+
+    def __init__(self, name, fileobj, compresslevel=9, threads=1):
+        self._fileobj = fileobj
+        self._level = compresslevel
+        self._threads = threads
+        self._pool = ThreadPool(threads)
+        self._pending = deque()
+        self._buffer = bytearray()
+        self._crc = zlib.crc32(b"")
+        self._size = 0
+        self._write_header(name)
+
+    def _write_header(self, name):
+        fname = os.path.basename(name or "")
+        if not isinstance(fname, bytes):
+            fname = fname.encode("latin-1")
+        if fname.endswith(b".gz"):
+            fname = fname[:-3]
+        flags = 0x08 if fname else 0  # FNAME
+        xfl = {9: 2, 1: 4}.get(self._level, 0)
+        header = struct.pack("<BBBBLBB", 0x1f, 0x8b, 8, flags, 0, xfl, 255)
+        self._fileobj.write(header + (fname + b"\0" if fname else b""))
+
+    def write(self, data):
+        self._buffer += data
+        while len(self._buffer) >= self.block_size:
+            self._submit(bytes(self._buffer[:self.block_size]))
+            del self._buffer[:self.block_size]
+
+    def tell(self):
+        return self._size + len(self._buffer)
+
+    def _submit(self, block):
+        # The checksum and the size are of the uncompressed contents, in order
+        self._crc = zlib.crc32(block, self._crc)
+        self._size += len(block)
+        self._pending.append(self._pool.apply_async(_deflate, (block, self._level)))
+        # Bounded amount of blocks in memory, waiting for the oldest ones
+        while len(self._pending) > 2 * self._threads:
+            self._fileobj.write(self._pending.popleft().get())
+
+    def close(self):
+        if self._pool is None:
+            return
+        try:
+            if self._buffer:
+                self._submit(bytes(self._buffer))
+                self._buffer = bytearray()
+            while self._pending:
+                self._fileobj.write(self._pending.popleft().get())
+            # Empty final block to close the deflate stream, and the gzip trailer
+            self._fileobj.write(zlib.compressobj(self._level, zlib.DEFLATED,
+                                                 -zlib.MAX_WBITS).flush())
+            self._fileobj.write(struct.pack("<LL", self._crc & 0xffffffff,
+                                            self._size & 0xffffffff))
+        finally:
+            self._pool.terminate()
+            self._pool = None
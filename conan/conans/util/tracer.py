@@ -8,7 +8,7 @@ import fasteners
 
 from conans.errors import ConanException
 from conans.model.ref import ConanFileReference, PackageReference
-from conans.util.files import md5sum, sha1sum
+from conans.util.files import file_checksums
 from conans.util.log import logger
 
 TRACER_ACTIONS = ["UPLOADED_RECIPE", "UPLOADED_PACKAGE",
@@ -66,12 +66,19 @@ def _append_action(action_name, props):
 # ############## LOG METHODS ######################
 
 def _file_document(name, path):
-    return {"name": name, "path": path, "md5": md5sum(path), "sha1": sha1sum(path)}
+    checksums = file_checksums(path)
+    return {"name": name, "path": path, "md5": checksums["md5"], "sha1": checksums["sha1"]}
+
+
+def _file_documents(files):
+    """ The files are only hashed if the actions are being logged """
+    if not files or not _get_tracer_file():
+        return []
+    return [_file_document(name, path) for name, path in files.items()]
 
 
 def log_recipe_upload(ref, duration, files_uploaded, remote_name):
-    files_uploaded = files_uploaded or {}
-    files_uploaded = [_file_document(name, path) for name, path in files_uploaded.items()]
+    files_uploaded = _file_documents(files_uploaded)
     _append_action("UPLOADED_RECIPE", {"_id": str(ref),
                                        "duration": duration,
                                        "files": files_uploaded,
@@ -80,8 +87,7 @@ def log_recipe_upload(ref, duration, files_uploaded, remote_name):
 
 def log_package_upload(pref, duration, files_uploaded, remote):
     """files_uploaded is a dict with relative path as keys and abs path as values"""
-    files_uploaded = files_uploaded or {}
-    files_uploaded = [_file_document(name, path) for name, path in files_uploaded.items()]
+    files_uploaded = _file_documents(files_uploaded)
     _append_action("UPLOADED_PACKAGE", {"_id": str(pref),
                                         "duration": duration,
                                         "files": files_uploaded,
@@ -90,8 +96,7 @@ def log_package_upload(pref, duration, files_uploaded, remote):
 
 def log_recipe_download(ref, duration, remote_name, files_downloaded):
     assert(isinstance(ref, ConanFileReference))
-    files_downloaded = files_downloaded or {}
-    files_downloaded = [_file_document(name, path) for name, path in files_downloaded.items()]
+    files_downloaded = _file_documents(files_downloaded)
     _append_action("DOWNLOADED_RECIPE", {"_id": str(ref),
                                          "duration": duration,
                                          "remote": remote_name,
@@ -100,8 +105,7 @@ def log_recipe_download(ref, duration, remote_name, files_downloaded):
 
 def log_recipe_sources_download(ref, duration, remote_name, files_downloaded):
     assert(isinstance(ref, ConanFileReference))
-    files_downloaded = files_downloaded or {}
-    files_downloaded = [_file_document(name, path) for name, path in files_downloaded.items()]
+    files_downloaded = _file_documents(files_downloaded)
     _append_action("DOWNLOADED_RECIPE_SOURCES", {"_id": str(ref),
                                                  "duration": duration,
                                                  "remote": remote_name,
@@ -109,8 +113,7 @@ def log_recipe_sources_download(ref, duration, remote_name, files_downloaded):
 
 
 def log_package_download(pref, duration, remote, files_downloaded):
-    files_downloaded = files_downloaded or {}
-    files_downloaded = [_file_document(name, path) for name, path in files_downloaded.items()]
+    files_downloaded = _file_documents(files_downloaded)
     _append_action("DOWNLOADED_PACKAGE", {"_id": str(pref),
                                           "duration": duration,
                                           "remote": remote.name,
@@ -165,6 +168,5 @@ def log_uncompressed_file(src_path, duration, dest_folder):
 
 
 def log_compressed_files(files, duration, tgz_path):
-    files = files or {}
-    files_compressed = [_file_document(name, path) for name, path in files.items()]
+    files_compressed = _file_documents(files)
     _append_action("ZIP", {"src": files_compressed, "dst": tgz_path, "duration": duration})